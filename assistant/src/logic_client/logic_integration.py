@@ -0,0 +1,32 @@
+# logic_client/logic_integration.py
+import os
+import sys
+
+import requests
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.http_client import http_client
+
+LOGIC_URL = "http://localhost:8021/process"
+
+
+def process(action, data=""):
+    """
+    Calls the LOGIC layer directly (same contract as nlu/actions/logic_integration.py).
+
+    :param action: Logic action, e.g. "GET_CURRENT_TIME".
+    :param data: Data associated with the action.
+    :return: {"text": ..., "continue": ...} or None if the logic layer is unreachable.
+    """
+    try:
+        response = http_client.post("logic", LOGIC_URL, json={"action": action, "data": data})
+        response.raise_for_status()
+        response_data = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error sending request to LOGIC layer: {e}")
+        return None
+
+    if not response_data:
+        return None
+    return {"text": response_data.get("text", ""), "continue": response_data.get("continue", False)}
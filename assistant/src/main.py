@@ -1,136 +1,53 @@
-from wake_word.wake_word_detection import listen_for_wake_word
-from stt.voice_recognition import recognize_speech, play_wav_file
-from nlu_client.rasa_integration import process_command
-from tts.text_to_speech import speak_response
-from session.websocket import create_ui_logger, ui_controller
+# Heavy modules (openwakeword, PyAudio, whisper/TTS clients) are imported lazily
+# so the warm-up in main() can start as early as possible.
 import os
-import time
+import signal
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from session.websocket import create_ui_logger, ui_controller
+from utils.flight_recorder import flight_recorder
+from shared.http_client import http_client
 
 # Create UI logger for this module
 ui_logger = create_ui_logger("Main")
 
 def assistant_workflow():
+    """
+    Runs one wake-word session.
 
-    # ============================== PLAY BOOT SOUND AND GREETING =============================
-    # Set UI to boot state
-    # ui_logger.set_state("boot")
-    # ui_logger.log_info("System booting...")
-    # play boot sound before listening the command
-    # ui_logger.log_info("Playing boot sound...")
-    print("starting assistant workflow...")
-    print("Playing boot sound...")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    boot_path = os.path.join(base_dir, "../../shared/audio/permanent/boot.wav").replace("\\", "/")
-    if not play_wav_file(boot_path):
-        print(f"Failed to play boot sound: No audio playback method available")
+    Boot sound, greeting, listen -> transcribe -> Rasa -> TTS are driven by the
+    asyncio state machine in pipeline/orchestrator.py, which also drives the UI state.
+    """
+    from pipeline.orchestrator import AssistantOrchestrator
 
-    # =============================== GREETING =============================
-    # Set UI to processing state for Rasa greeting
-    # ui_logger.set_state("processing")
-    # ui_logger.log_info("starting Greeting Sequence...")
-    print("starting Greeting Sequence...")
-    
-    # Send greeting message to rasa
+    print("starting assistant workflow...")
+    orchestrator = AssistantOrchestrator(ui_logger)
     try:
-        responses, continue_conversation = process_command("wake up elisa")
-        # ui_logger.log_success(f"Received {len(responses)} responses from Rasa")
-        print(f"Received {len(responses)} responses from Rasa")
+        orchestrator.run()
     except Exception as e:
-        # ui_logger.log_error(f"Failed to process greeting: {str(e)}")
-        print(f"Failed to process greeting: {str(e)}")
-        return
-    
-    # Set UI to speaking state
-    # ui_logger.set_state("speaking")
-    print("Speaking greeting responses...")
-    # Speak all responses that rasa sent
-    for i, response in enumerate(responses):
-        # ui_logger.log_info(f"Speaking response {i+1}: {response[:50]}{'...' if len(response) > 50 else ''}")
-        print(f"Speaking response {i+1}: {response[:50]}{'...' if len(response) > 50 else ''}")
-        try:
-            speak_response(response)  # Speak each response
-        except Exception as e:
-            # ui_logger.log_error(f"Failed to speak response: {str(e)}")
-            print(f"Failed to speak response: {str(e)}")
+        # ui_logger.log_error(f"Assistant workflow failed: {str(e)}")
+        print(f"Assistant workflow failed: {str(e)}")
 
-    # ui_logger.log_success("Greeting sequence completed")
-    print("Greeting sequence completed")
 
-    # ================================ LISTEN FOR COMMAND =============================
-    # Keep listening while the conversation is ongoing
-    while True:
+def register_latency_summary():
+    """
+    Per-stage p50/p95 of recent turns, per-endpoint HTTP metrics, fast-path hit
+    rate and parse cache stats are printed to the console on `kill -USR1 <pid>`.
+    """
+    def print_summary(last_n=50):
+        # Imported here so loading the NLU clients doesn't delay the warm-up
+        from nlu_client.fast_path import fast_path_router
+        from nlu_client.rasa_integration import rasa_client
+        flight_recorder.print_summary(last_n)
+        http_client.print_metrics()
+        fast_path_router.print_summary()
+        if rasa_client.parse_cache is not None:
+            rasa_client.parse_cache.print_summary()
 
-        # Set UI to listening state
-        # Recognize speech after the wake word is detected
-        # Give three chances to recognize the command
-        command = None
-        for attempt in range(3):
-            # ui_logger.log_info("Setting up Voice Recognition...")
-            print("Setting up Voice Recognition...")
-            # ui_logger.log_info(f"Attempt {attempt + 1} to recognize command...")
-            
-            try:
-                command = recognize_speech()
-                if command is not None:
-                    # ui_logger.log_success(f"Command recognized: '{command}'")
-                    print(f"Command recognized: '{command}'")
-                    break
-                else:
-                    # ui_logger.log_warning(f"No speech detected on attempt {attempt + 1}")
-                    print(f"No speech detected on attempt {attempt + 1}")
-                    if attempt < 2:  # Don't speak on last attempt
-                        # ui_logger.set_state("speaking")
-                        # ui_logger.log_info("Speaking retry message...")
-                        print("Speaking retry message...")
-                        speak_response("I couldn't hear you. Please try again.")
-            except Exception as e:
-                # ui_logger.log_error(f"Error during speech recognition: {str(e)}")
-                print(f"Error during speech recognition: {str(e)}")
-        
-        if command is None:
-            # ui_logger.log_error("Failed to recognize command after 3 attempts")
-            # ui_logger.set_state("speaking")
-            speak_response("I'm sorry, I couldn't understand you. Please try again later.")
-            continue
-        
-        # Set UI to processing state
-        # ui_logger.set_state("processing")
-        # ui_logger.log_info(f"Processing command with Rasa: '{command}'")
-        print(f"Processing command with Rasa: '{command}'")
-        
-        # Process the recognized command with Rasa
-        try:
-            responses, continue_conversation = process_command(command)
-            # ui_logger.log_success(f"Rasa processed command, got {len(responses)} responses")
-            # ui_logger.log_info(f"Continue conversation: {continue_conversation}")
-            print(f"Rasa processed command, got {len(responses)} responses")
-        except Exception as e:
-            # ui_logger.log_error(f"Failed to process command with Rasa: {str(e)}")
-            print(f"Failed to process command with Rasa: {str(e)}")
-            continue
-        
-        # Set UI to speaking state
-        # ui_logger.set_state("speaking")
-        print("Speaking command responses...")
-        
-        # Speak all responses
-        for i, response in enumerate(responses):
-            # ui_logger.log_info(f"Speaking response {i+1}: {response[:50]}{'...' if len(response) > 50 else ''}")
-            print(f"Speaking response {i+1}: {response[:50]}{'...' if len(response) > 50 else ''}")
-            try:
-                speak_response(response)  # Speak each response
-            except Exception as e:
-                # ui_logger.log_error(f"Failed to speak response: {str(e)}")
-                print(f"Failed to speak response: {str(e)}")
-        
-        if not continue_conversation:
-            # ui_logger.log_info("No further conversation needed - ending session")
-            # ui_logger.set_state("idle")
-            print("No further conversation needed - ending session")
-            break  # Exit loop if no further conversation is needed
-        else:
-            # ui_logger.log_info("Conversation continuing...")
-            print("Conversation continuing...")
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: print_summary())
 
 
 def main():
@@ -140,18 +57,36 @@ def main():
     # ui_logger.log_info("Starting Elisa Assistant...")
     # ui_logger.log_info("Initializing WebSocket server...")
     print("Starting Elisa Assistant...")
+    register_latency_summary()
     
     try:
         # server_thread = ui_controller.start_server(host="localhost", port=8765)
         # ui_logger.log_success("WebSocket server started on ws://localhost:8765")
         # ui_logger.log_info("Open the UI in your browser and refresh to connect")
-        
-        # Give server time to start
-        time.sleep(2)
-        
+
+        # Warm up Rasa, Duckling, Coqui, the logic service, whisper and the wake word
+        # model concurrently; wake word listening only starts once the critical path is warm
+        from pipeline.warmup import warm_up
+        ui_logger.set_state("boot")
+        report = warm_up()
+        report.print()
+        if not report.critical_ready:
+            degraded = ", ".join(d.name for d in report.degraded if d.critical)
+            ui_logger.log_warning(f"Starting in degraded mode: {degraded}")
+
+        # Pre-render the greeting and retry prompts in the background so wake and
+        # retries don't need Rasa + TTS
+        from pipeline.greeting_cache import greeting_cache
+        from pipeline.orchestrator import RETRY_PROMPT, GIVE_UP_PROMPT
+        from tts.prompt_cache import prompt_cache
+        greeting_cache.start()
+        prompt_cache.prerender([RETRY_PROMPT, GIVE_UP_PROMPT])
+
         # Start listening for the wake word with our workflow
         # ui_logger.log_info("Starting wake word detection...")
+        from wake_word.wake_word_detection import listen_for_wake_word
         print("Starting wake word detection...")
+        ui_logger.set_state("idle")
         listen_for_wake_word(assistant_workflow)
         
     except Exception as e:
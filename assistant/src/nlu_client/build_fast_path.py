@@ -0,0 +1,125 @@
+# nlu_client/build_fast_path.py
+#
+# Compiles the fast-path rules (nlu_client/fast_path_rules.json) from the Rasa
+# training data. Re-run after editing nlu/data/nlu.yml or nlu/data/rules.yml:
+#
+#   cd assistant/src
+#   python -m nlu_client.build_fast_path
+#
+# Needs PyYAML (installed with Rasa); the assistant itself only reads the JSON.
+import json
+import os
+import re
+import sys
+
+import yaml
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nlu_client.fast_path import RULES_PATH, SEPARATOR, TRAILER, file_digest, tokens
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+NLU_DATA = os.path.join(PROJECT_ROOT, "nlu", "data", "nlu.yml")
+RULES_DATA = os.path.join(PROJECT_ROOT, "nlu", "data", "rules.yml")
+
+# Rasa custom actions that are a single stateless logic call, mirroring
+# nlu/actions/actions.py: action name -> (logic action, entity passed as data).
+# Intents whose answer can start a follow-up (meaning_of, list_reminders) or
+# need Duckling (reminders) always go through Rasa.
+FAST_PATH_ACTIONS = {
+    "action_current_date_time": ("GET_CURRENT_TIME", None),
+    "action_open_app": ("OPEN_APP", "app_name"),
+    "action_search_firefox": ("SEARCH_BROWSER", "query"),
+    "action_type_what_i_say": ("TYPE_TEXT", "text"),
+    "action_weather_update": ("GET_WEATHER", None),
+}
+
+# [value](entity), tolerating the "[value] (entity)" typo in the training data
+ENTITY_PATTERN = re.compile(r"\[([^\]]+)\]\s*\((\w+)\)")
+
+
+def intent_actions(rules):
+    """intent -> action for single-step rules."""
+    mapping = {}
+    for rule in rules.get("rules", []):
+        steps = rule.get("steps", [])
+        if len(steps) == 2 and "intent" in steps[0] and "action" in steps[1]:
+            mapping[steps[0]["intent"]] = steps[1]["action"]
+    return mapping
+
+
+def parse_examples(block):
+    return [line[2:].strip() for line in block.splitlines() if line.strip().startswith("- ")]
+
+
+def template_for(example, entity):
+    """
+    Turn an annotated example into a regex with one named group, or None if
+    it doesn't annotate exactly `entity` once or has no literal words.
+    """
+    matches = list(ENTITY_PATTERN.finditer(example))
+    if len(matches) != 1 or matches[0].group(2) != entity:
+        return None
+    match = matches[0]
+    before = tokens(example[:match.start()])
+    after = tokens(example[match.end():])
+    if not before and not after:
+        return None
+    parts = [re.escape(t) for t in before] + [f"(?P<{entity}>.+?)"] + [re.escape(t) for t in after]
+    return "^" + SEPARATOR.join(parts) + TRAILER + "$"
+
+
+def build(nlu_path=NLU_DATA, rules_path=RULES_DATA):
+    with open(nlu_path) as f:
+        nlu = yaml.safe_load(f)
+    with open(rules_path) as f:
+        rules = yaml.safe_load(f)
+    actions = intent_actions(rules)
+
+    exact = {}      # token string -> intent (None if claimed by several intents)
+    templates = {}  # regex -> intent (None if claimed by several intents)
+    intents = {}
+
+    for item in nlu.get("nlu", []):
+        intent = item.get("intent")
+        if not intent:
+            continue
+        fast = FAST_PATH_ACTIONS.get(actions.get(intent))
+        for example in parse_examples(item.get("examples", "")):
+            # Every intent registers its phrasings so collisions can be detected,
+            # but only fast-path intents are ever routed
+            if ENTITY_PATTERN.search(example):
+                entity = fast[1] if fast else ENTITY_PATTERN.search(example).group(2)
+                pattern = template_for(example, entity)
+                if pattern:
+                    templates[pattern] = intent if templates.get(pattern, intent) == intent else None
+            else:
+                text = " ".join(tokens(example))
+                exact[text] = intent if exact.get(text, intent) == intent else None
+        if fast:
+            intents[intent] = {"action": fast[0], "entity": fast[1]}
+
+    return {
+        "source": os.path.relpath(nlu_path, PROJECT_ROOT),
+        "source_sha256": file_digest(nlu_path),
+        "intents": intents,
+        "exact": {text: intent for text, intent in sorted(exact.items()) if intent in intents},
+        "templates": [{"pattern": pattern, "intent": intent}
+                      for pattern, intent in sorted(templates.items()) if intent in intents],
+        # Phrasings of other intents: a command matching one of these is left to Rasa
+        "blocking_exact": sorted(t for t, i in exact.items() if i not in intents),
+        "blocking_templates": sorted(p for p, i in templates.items() if i not in intents),
+    }
+
+
+def main():
+    rules = build()
+    with open(RULES_PATH, "w") as f:
+        json.dump(rules, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote {RULES_PATH}: {len(rules['intents'])} intents, "
+          f"{len(rules['exact'])} exact phrases, {len(rules['templates'])} templates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# nlu_client/fast_path.py
+import collections
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logic_client.logic_integration import process as process_logic
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fast_path_rules.json")
+
+# Templates allow punctuation between words ("Type this: ...") and at the end
+SEPARATOR = r"[\s,:;.!?-]+"
+TRAILER = r"[\s.!?]*"
+
+# Longer captures are more likely to be a different request that happens to
+# start like a template ("open the garage door"), so leave them to Rasa
+MAX_ENTITY_WORDS = {"app_name": 2, "query": 12}
+
+# App names and search queries containing these words are probably two requests
+# ("open firefox and search cats") or carry filler ("open settings please")
+REJECT_WORDS = {"and", "then", "also", "after", "before", "please", "thanks", "kindly"}
+REJECT_ENTITIES = {"app_name", "query"}
+
+# Dictated text keeps its trailing punctuation ("type: Hello, World!")
+VERBATIM_ENTITIES = {"text"}
+
+LATENCY_WINDOW = 200
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def tokens(text):
+    """Lower-case word tokens, ignoring punctuation ("What's the time?" -> what's, the, time)."""
+    return re.findall(r"[\w']+", text.replace("’", "'").lower())
+
+
+class FastPathMatch:
+    def __init__(self, intent, action, data=""):
+        self.intent = intent
+        self.action = action
+        self.data = data
+
+    def __repr__(self):
+        return f"FastPathMatch({self.intent} -> {self.action}, {self.data!r})"
+
+
+class FastPathRouter:
+    """
+    Deterministic intent matcher compiled from the Rasa training data
+    (see build_fast_path.py). Unambiguous commands for stateless intents are sent
+    straight to the logic layer; everything else falls back to Rasa.
+    """
+
+    def __init__(self, rules_path=RULES_PATH, logic=process_logic):
+        self.rules_path = rules_path
+        self.logic = logic
+        self.enabled = False
+        self._loaded = False
+        self.intents = {}
+        self.exact = {}
+        self.templates = []
+        self.blocking_exact = set()
+        self.blocking_templates = []
+        self.stats = collections.Counter()
+        self.latencies = {"fast_path": collections.deque(maxlen=LATENCY_WINDOW),
+                          "rasa": collections.deque(maxlen=LATENCY_WINDOW)}
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the compiled rules (done lazily on the first lookup)."""
+        self._loaded = True
+        try:
+            with open(self.rules_path) as f:
+                rules = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[FastPath] disabled, could not load {self.rules_path}: {e}")
+            return
+
+        self.intents = rules["intents"]
+        self.exact = rules["exact"]
+        self.templates = [(re.compile(t["pattern"], re.IGNORECASE), t["intent"]) for t in rules["templates"]]
+        self.blocking_exact = set(rules.get("blocking_exact", []))
+        self.blocking_templates = [re.compile(p, re.IGNORECASE) for p in rules.get("blocking_templates", [])]
+        self.enabled = True
+
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        source = os.path.join(project_root, rules.get("source", ""))
+        if os.path.exists(source) and file_digest(source) != rules.get("source_sha256"):
+            print(f"[FastPath] {source} changed since the rules were built; "
+                  f"run `python -m nlu_client.build_fast_path`")
+
+    def match(self, text):
+        """Return a FastPathMatch for an unambiguous fast-path command, else None."""
+        if not self._loaded:
+            self.load()
+        if not self.enabled or not text:
+            return None
+        key = " ".join(tokens(text))
+        if key in self.blocking_exact:
+            return None
+        intent = self.exact.get(key)
+        if intent:
+            return FastPathMatch(intent, self.intents[intent]["action"])
+
+        text = text.replace("’", "'").strip()
+        if any(pattern.match(text) for pattern in self.blocking_templates):
+            return None
+        candidates = {}  # intent -> most specific match (longest literal part)
+        for pattern, intent in self.templates:
+            m = pattern.match(text)
+            if m and (intent not in candidates or len(m.group(1)) < len(candidates[intent].group(1))):
+                candidates[intent] = m
+        if len(candidates) != 1:
+            return None
+
+        intent, m = candidates.popitem()
+        entity = self.intents[intent]["entity"]
+        value = m.group(entity).strip()
+        if entity in VERBATIM_ENTITIES and re.fullmatch(TRAILER, text[m.end(entity):]):
+            value = text[m.start(entity):].strip()
+        max_words = MAX_ENTITY_WORDS.get(entity)
+        if not value or (max_words and len(value.split()) > max_words):
+            return None
+        if entity in REJECT_ENTITIES and REJECT_WORDS.intersection(tokens(value)):
+            return None
+        return FastPathMatch(intent, self.intents[intent]["action"], value)
+
+    def route(self, text):
+        """
+        Resolve text without Rasa. Returns (responses, continue) like
+        rasa_integration.process_command, or None to fall back to Rasa.
+        """
+        start = time.monotonic()
+        match = self.match(text)
+        if match is None:
+            self._count("misses")
+            return None
+
+        response = self.logic(match.action, match.data)
+        if response is None:
+            self._count("logic_errors")
+            return None
+
+        self._count("hits")
+        self._count(f"hit:{match.intent}")
+        self._record("fast_path", time.monotonic() - start)
+        print(f"[FastPath] {match}")
+        text = response.get("text")
+        return ([text] if text else []), bool(response.get("continue"))
+
+    def record_fallback(self, elapsed):
+        """Latency of a command that went through Rasa, for comparison."""
+        self._record("rasa", elapsed)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _record(self, path, elapsed):
+        with self._lock:
+            self.latencies[path].append(elapsed)
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+            latencies = {path: sorted(values) for path, values in self.latencies.items()}
+        lookups = stats.get("hits", 0) + stats.get("misses", 0) + stats.get("logic_errors", 0)
+        result = {"lookups": lookups, "hit_rate": stats.get("hits", 0) / lookups if lookups else 0.0,
+                  "counters": stats}
+        for path, values in latencies.items():
+            result[f"{path}_p50_ms"] = round(values[len(values) // 2] * 1000) if values else None
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        print("=== Fast path ===")
+        print(f"lookups={summary['lookups']} hit rate={summary['hit_rate']:.0%} "
+              f"p50 fast path={summary['fast_path_p50_ms']}ms p50 rasa={summary['rasa_p50_ms']}ms")
+        for key, count in sorted(summary["counters"].items()):
+            print(f"  {key:<28} {count}")
+        return summary
+
+
+# Shared router
+fast_path_router = FastPathRouter()
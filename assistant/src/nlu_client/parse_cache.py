@@ -0,0 +1,114 @@
+# nlu_client/parse_cache.py
+import collections
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nlu_client.fast_path import tokens
+
+PARSE_CACHE_SIZE = int(os.environ.get("ELISA_PARSE_CACHE_SIZE", "256"))
+PARSE_CACHE_TTL = float(os.environ.get("ELISA_PARSE_CACHE_TTL", "3600"))
+# Parses below this intent confidence are not worth repeating
+MIN_CONFIDENCE = float(os.environ.get("ELISA_PARSE_CACHE_MIN_CONFIDENCE", "0.8"))
+
+# Duckling resolves "tomorrow at 5" against the current time, so its values go stale
+UNCACHEABLE_EXTRACTORS = {"DucklingEntityExtractor", "CachedDucklingEntityExtractor"}
+# Free text is taken verbatim from the transcript, but the cache key ignores case
+# and punctuation: "type hello world" must not reuse "type Hello, World!"
+UNCACHEABLE_ENTITIES = {"text", "query"}
+
+
+def cache_key(text):
+    """Normalized transcript: "What time is it?" and "what time is it" share an entry."""
+    return " ".join(tokens(text))
+
+
+def is_cacheable(parse):
+    intent = parse.get("intent") or {}
+    if not intent.get("name") or (intent.get("confidence") or 0) < MIN_CONFIDENCE:
+        return False
+    return not any(e.get("extractor") in UNCACHEABLE_EXTRACTORS or e.get("entity") in UNCACHEABLE_ENTITIES
+                   for e in parse.get("entities", []))
+
+
+class ParseCache:
+    """
+    LRU + TTL cache of Rasa NLU parse results (intent and entities) keyed by the
+    normalized transcript. Entries belong to one model fingerprint; a new model
+    empties the cache.
+    """
+
+    def __init__(self, max_entries=PARSE_CACHE_SIZE, ttl=PARSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.fingerprint = None
+        self.stats = collections.Counter()
+        self._entries = collections.OrderedDict()  # key -> (parse, stored_at)
+        self._lock = threading.Lock()
+
+    def set_fingerprint(self, fingerprint):
+        """Record the current model fingerprint, dropping every entry if it changed."""
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            if self._entries:
+                self.stats["invalidations"] += 1
+                print(f"[ParseCache] model changed ({self.fingerprint} -> {fingerprint}), "
+                      f"dropping {len(self._entries)} entries")
+            self._entries.clear()
+            self.fingerprint = fingerprint
+
+    def get(self, text):
+        key = cache_key(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            parse, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return parse
+
+    def put(self, text, parse):
+        if not is_cacheable(parse):
+            self.stats["uncacheable"] += 1
+            return False
+        with self._lock:
+            self._entries[cache_key(text)] = (parse, time.monotonic())
+            self._entries.move_to_end(cache_key(text))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._entries)
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        return {"size": size, "fingerprint": self.fingerprint,
+                "hit_rate": stats.get("hits", 0) / lookups if lookups else 0.0, "counters": stats}
+
+    def print_summary(self):
+        summary = self.summary()
+        print("=== NLU parse cache ===")
+        print(f"entries={summary['size']} hit rate={summary['hit_rate']:.0%} model={summary['fingerprint']}")
+        for key, count in sorted(summary["counters"].items()):
+            print(f"  {key:<28} {count}")
+        return summary
@@ -0,0 +1,154 @@
+# nlu_client/rasa_agent.py
+#
+# In-process Rasa for single-host deployments (ELISA_NLU_MODE=embedded).
+#
+# The trained model from nlu/models is loaded as a Rasa Agent inside the
+# assistant, and custom actions from nlu/actions run in the same process through
+# rasa_sdk's ActionExecutor instead of the action server on :5055. Requires
+# `rasa` (and therefore rasa_sdk) in the assistant's Python environment.
+import asyncio
+import concurrent.futures
+import glob
+import json
+import logging
+import os
+import sys
+import threading
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+NLU_DIR = os.path.join(PROJECT_ROOT, "nlu")
+MODELS_DIR = os.path.join(NLU_DIR, "models")
+
+NLU_MODE = os.environ.get("ELISA_NLU_MODE", "rest").lower()  # rest | embedded
+EMBEDDED_MODEL = os.environ.get("ELISA_RASA_MODEL")            # default: newest in nlu/models
+
+logger = logging.getLogger("elisa.nlu")
+
+
+def latest_model(models_dir=MODELS_DIR):
+    models = glob.glob(os.path.join(models_dir, "*.tar.gz"))
+    return max(models, key=os.path.getmtime) if models else None
+
+
+def create_action_endpoint(actions_package="actions"):
+    """
+    An EndpointConfig whose request() runs the action in-process instead of
+    POSTing to the action server. Rasa's RemoteAction keeps working unchanged.
+    """
+    from rasa.utils.endpoints import ClientResponseError, EndpointConfig
+    from rasa_sdk.executor import ActionExecutor
+    from rasa_sdk.interfaces import ActionExecutionRejection, ActionNotFoundException
+
+    # nlu/actions is imported as the top-level package "actions", as `rasa run actions` does
+    # (custom pipeline components in nlu/components are found the same way)
+    if NLU_DIR not in sys.path:
+        sys.path.insert(0, NLU_DIR)
+
+    executor = ActionExecutor()
+    executor.register_package(actions_package)
+
+    class InProcessActionEndpoint(EndpointConfig):
+        def __init__(self):
+            super().__init__(url="in-process://actions")
+
+        async def request(self, method="post", subpath=None, content_type="application/json",
+                          compress=False, **kwargs):
+            action_call = kwargs.get("json") or {}
+            try:
+                return await executor.run(action_call)
+            except ActionNotFoundException as e:
+                raise ClientResponseError(404, "Not Found", json.dumps({"action_name": e.action_name,
+                                                                        "error": e.message}))
+            except ActionExecutionRejection as e:
+                raise ClientResponseError(400, "Bad Request", json.dumps({"action_name": e.action_name,
+                                                                          "error": e.message}))
+
+    return InProcessActionEndpoint()
+
+
+class EmbeddedRasa:
+    """
+    A Rasa Agent running on its own event loop thread, so it can be called from
+    any thread (the orchestrator's per-session loop, the satellite server, ...).
+    """
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path
+        self.agent = None
+        self.error = None
+        self._loop = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self.agent is not None
+
+    def start(self):
+        """Load the model in the background (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="rasa-embedded", daemon=True)
+            self._thread.start()
+
+    def wait_ready(self, timeout=None):
+        self.start()
+        self._ready.wait(timeout)
+        return self.ready
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._load())
+        except Exception as e:
+            self.error = e
+            logger.error("nlu_embedded_unavailable error=%s", e)
+            self._ready.set()
+            return
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _load(self):
+        try:
+            from rasa.core.agent import Agent
+        except ImportError as e:
+            raise RuntimeError("rasa is not installed in the assistant's environment") from e
+
+        model_path = self.model_path or EMBEDDED_MODEL or latest_model()
+        if not model_path:
+            raise FileNotFoundError(f"no trained model in {MODELS_DIR} (run `rasa train`)")
+        self.agent = Agent.load(model_path, action_endpoint=create_action_endpoint())
+        logger.info("nlu_embedded_loaded model=%s", os.path.basename(model_path))
+
+    def handle_text(self, text, sender, timeout):
+        """Run one user message through the agent. Returns the bot messages."""
+        if not self.ready:
+            raise RuntimeError("embedded Rasa agent is not loaded")
+        future = asyncio.run_coroutine_threadsafe(
+            self.agent.handle_text(text, sender_id=sender), self._loop)
+        try:
+            return future.result(timeout) or []
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def response_texts(self, utter_name):
+        """Text variations of a domain response, like GET /domain."""
+        if not self.ready:
+            return []
+        variations = self.agent.domain.responses.get(utter_name, [])
+        return [v["text"] for v in variations if isinstance(v, dict) and v.get("text")]
+
+    def parse(self, text, timeout):
+        """NLU only (intent + entities), like POST /model/parse."""
+        if not self.ready:
+            raise RuntimeError("embedded Rasa agent is not loaded")
+        future = asyncio.run_coroutine_threadsafe(self.agent.parse_message(text), self._loop)
+        return future.result(timeout)
+
+
+# Shared agent, only created in embedded mode
+embedded_rasa = EmbeddedRasa() if NLU_MODE == "embedded" else None
@@ -1,6 +1,44 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from urllib.parse import quote
+
 import requests
 
+# Add parent directory and project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.http_client import http_client
+from utils.circuit_breaker import CircuitBreaker
+from nlu_client.parse_cache import ParseCache
+from nlu_client.rasa_agent import embedded_rasa
+
 RASA_URL = "http://localhost:5005/webhooks/rest/webhook"
+RASA_DOMAIN_URL = "http://localhost:5005/domain"
+RASA_STATUS_URL = "http://localhost:5005/status"
+RASA_PARSE_URL = "http://localhost:5005/model/parse"
+RASA_TRIGGER_URL = "http://localhost:5005/conversations/{sender}/trigger_intent"
+
+# === NLU CLIENT SETTINGS ===
+NLU_DEADLINE = float(os.environ.get("ELISA_NLU_DEADLINE", "10"))
+NLU_RECOVERY_TIMEOUT = float(os.environ.get("ELISA_NLU_RECOVERY_TIMEOUT", "30"))
+NLU_PROBE_INTERVAL = float(os.environ.get("ELISA_NLU_PROBE_INTERVAL", "5"))
+CONNECT_TIMEOUT = 2.0
+# Opt-in: cache NLU parses and run the dialogue with /model/parse + trigger_intent
+# instead of the REST webhook (needs `rasa run --enable-api`)
+PARSE_CACHE_ENABLED = os.environ.get("ELISA_PARSE_CACHE", "false").lower() == "true"
+FINGERPRINT_CHECK_INTERVAL = 30.0
+
+NOT_UNDERSTOOD_RESPONSE = "Sorry, I didn't understand that."
+UNAVAILABLE_RESPONSE = "I'm having trouble connecting to the server."
+# Spoken while the breaker is open, without waiting on Rasa
+DEGRADED_RESPONSE = "My language service is not responding right now. Please try again in a moment."
+
+logger = logging.getLogger("elisa.nlu")
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
 
 def extract_text_from_response(data):
     """
@@ -29,52 +67,254 @@ def extract_text_from_response(data):
     return None
 
 
-def process_command(command, sender="user1"):
+def parse_rasa_messages(response_data):
+    """Turn a Rasa REST webhook reply into (texts, continue_conversation)."""
+    messages = []
+    continue_conversation = False
+    for message in response_data:
+        # Case 1: Response has a direct "text" key
+        if "text" in message:
+            text = extract_text_from_response(message["text"])
+            if text:
+                messages.append(text)
+
+        # Case 2: Response is inside "custom"
+        elif "custom" in message:
+            custom_data = message["custom"]
+            if "text" in custom_data:
+                text = extract_text_from_response(custom_data["text"])
+                if text:
+                    messages.append(text)
+            if custom_data.get("continue"):  # Check "continue" flag
+                continue_conversation = True
+    return messages, continue_conversation
+
+
+class NLUClient:
     """
-    Sends the command to Rasa and gets the response.
+    Rasa client with per-call deadlines and a circuit breaker.
+
+    While the breaker is open, calls return a spoken fallback at once instead of
+    waiting on a retraining or stuck Rasa. A background probe polls /status and
+    closes the breaker as soon as Rasa answers again.
 
-    :param command: User's voice command.
-    :param sender: Unique sender ID to identify the conversation.
-    :return: List of response texts and a flag indicating whether to continue the conversation.
+    In embedded mode (see rasa_agent.py) commands are handled by the in-process
+    agent; the REST path below is only used while it is loading or if it fails.
+
+    With a parse cache, a command is parsed with /model/parse (or taken from the
+    cache) and the dialogue is run with trigger_intent, so repeated commands skip
+    the spaCy/DIET pipeline. Without one, the REST webhook does both in one call.
     """
-    payload = {"sender": sender, "message": command}
 
+    def __init__(self, url=RASA_URL, status_url=RASA_STATUS_URL, deadline=NLU_DEADLINE,
+                 recovery_timeout=NLU_RECOVERY_TIMEOUT, probe_interval=NLU_PROBE_INTERVAL,
+                 parse_cache=None, parse_url=RASA_PARSE_URL, trigger_url=RASA_TRIGGER_URL, embedded=None):
+        self.url = url
+        self.embedded = embedded
+        self.status_url = status_url
+        self.parse_url = parse_url
+        self.trigger_url = trigger_url
+        self.parse_cache = parse_cache
+        self._fingerprint_checked_at = 0.0
+        self.deadline = deadline
+        self.probe_interval = probe_interval
+        self.breaker = CircuitBreaker("rasa", failure_threshold=2, recovery_timeout=recovery_timeout)
+        self._probe_thread = None
+        self._probe_lock = threading.Lock()
+
+    @property
+    def healthy(self):
+        return self.breaker.state == CircuitBreaker.CLOSED
+
+    def process(self, command, sender="user1", deadline=None):
+        """
+        Sends the command to Rasa and gets the response.
+
+        :param command: User's voice command.
+        :param sender: Unique sender ID to identify the conversation.
+        :param deadline: Seconds the whole call may take (default ELISA_NLU_DEADLINE).
+        :return: List of response texts and a flag indicating whether to continue the conversation.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+        expires = start + deadline
+
+        if self.embedded is not None and self.embedded.ready:
+            try:
+                response_data = self.embedded.handle_text(command, sender, deadline)
+                return self._reply(sender, "embedded", response_data, start)
+            except Exception as e:
+                logger.warning("nlu_embedded_failed sender=%s error=%r fallback=rest", sender, e)
+
+        if not self.breaker.allow_request():
+            logger.warning("nlu_skipped sender=%s reason=breaker_open", sender)
+            return [DEGRADED_RESPONSE], False
+
+        try:
+            if self.parse_cache is not None:
+                response_data, source = self._process_with_cache(command, sender, expires)
+            else:
+                response_data, source = self._post_webhook(command, sender, expires), "webhook"
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self._record_failure()
+            logger.error("nlu_failed sender=%s elapsed_ms=%.0f error=%s",
+                         sender, (time.monotonic() - start) * 1000, e)
+            return [UNAVAILABLE_RESPONSE], False
+
+        self.breaker.record_success()
+        return self._reply(sender, source, response_data, start)
+
+    def _reply(self, sender, source, response_data, start):
+        elapsed_ms = (time.monotonic() - start) * 1000
+        logger.debug("nlu_payload sender=%s payload=%s", sender, response_data)
+        if not response_data:
+            logger.info("nlu_reply sender=%s source=%s elapsed_ms=%.0f messages=0", sender, source, elapsed_ms)
+            return [NOT_UNDERSTOOD_RESPONSE], False
+
+        messages, continue_conversation = parse_rasa_messages(response_data)
+        logger.info("nlu_reply sender=%s source=%s elapsed_ms=%.0f messages=%d continue=%s",
+                    sender, source, elapsed_ms, len(messages), continue_conversation)
+        return messages, continue_conversation
+
+    @staticmethod
+    def _timeout(expires):
+        remaining = max(0.1, expires - time.monotonic())
+        return (min(CONNECT_TIMEOUT, remaining), remaining)
+
+    def _post_webhook(self, command, sender, expires):
+        response = http_client.post("rasa_webhook", self.url, json={"sender": sender, "message": command},
+                                    timeout=self._timeout(expires))
+        response.raise_for_status()
+        return response.json()
+
+    def _process_with_cache(self, command, sender, expires):
+        """Parse (cached) + trigger_intent. Returns (bot messages, "cache" | "parse" | "webhook")."""
+        if not self._check_fingerprint(expires):
+            return self._post_webhook(command, sender, expires), "webhook"
+        parse = self.parse_cache.get(command)
+        source = "cache"
+        if parse is None:
+            response = http_client.post("rasa_api", self.parse_url, json={"text": command},
+                                        timeout=self._timeout(expires))
+            if response.status_code in (403, 404):
+                logger.warning("parse_cache_disabled reason=http_api_unavailable status=%d", response.status_code)
+                self.parse_cache = None
+                return self._post_webhook(command, sender, expires), "webhook"
+            response.raise_for_status()
+            parse = response.json()
+            self.parse_cache.put(command, parse)
+            source = "parse"
+
+        intent = (parse.get("intent") or {}).get("name")
+        if not intent:
+            return [], source
+        logger.debug("nlu_parse sender=%s source=%s intent=%s entities=%s",
+                     sender, source, intent, parse.get("entities"))
+        # Not idempotent (it advances the conversation), hence the webhook endpoint policy
+        response = http_client.post("rasa_webhook", self.trigger_url.format(sender=quote(sender, safe="")),
+                                    params={"include_events": "NONE"},
+                                    json={"name": intent, "entities": parse.get("entities", [])},
+                                    timeout=self._timeout(expires))
+        response.raise_for_status()
+        return response.json().get("messages", []), source
+
+    def _check_fingerprint(self, expires):
+        """
+        Empty the parse cache when Rasa has loaded a different model. Returns
+        False if the model could not be checked: the cache is then skipped for
+        this command, but a failed /status alone does not count against the breaker.
+        """
+        if time.monotonic() - self._fingerprint_checked_at < FINGERPRINT_CHECK_INTERVAL:
+            return True
+        try:
+            self._status(timeout=self._timeout(min(expires, time.monotonic() + CONNECT_TIMEOUT)))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("parse_cache_skipped reason=status_failed error=%s", e)
+            return False
+        self._fingerprint_checked_at = time.monotonic()
+        return True
+
+    def _status(self, timeout):
+        """GET /status; records the model fingerprint. Returns the status dict."""
+        response = http_client.get("rasa_api", self.status_url, timeout=timeout)
+        response.raise_for_status()
+        status = response.json()
+        if self.parse_cache is not None:
+            self.parse_cache.set_fingerprint(status.get("model_id") or status.get("model_file"))
+        return status
+
+    async def process_async(self, command, sender="user1", deadline=None):
+        """Awaitable `process`; never takes (much) longer than the deadline."""
+        deadline = self.deadline if deadline is None else deadline
+        try:
+            # The HTTP timeout already enforces the deadline; this is a backstop
+            return await asyncio.wait_for(asyncio.to_thread(self.process, command, sender, deadline),
+                                          deadline + CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._record_failure()
+            logger.error("nlu_failed sender=%s error=deadline_exceeded deadline_s=%.1f", sender, deadline)
+            return [UNAVAILABLE_RESPONSE], False
+
+    def _record_failure(self):
+        self.breaker.record_failure()
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            self._start_probe()
+
+    # === HEALTH PROBE ===
+    def _start_probe(self):
+        with self._probe_lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="nlu-health", daemon=True)
+            self._probe_thread.start()
+
+    def probe(self):
+        """Return True if Rasa is up with a model loaded."""
+        try:
+            return bool(self._status(timeout=(CONNECT_TIMEOUT, CONNECT_TIMEOUT)).get("model_file"))
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+
+    def _probe_loop(self):
+        logger.warning("nlu_unhealthy probing_every_s=%.1f", self.probe_interval)
+        while self.breaker.state != CircuitBreaker.CLOSED:
+            if self.probe():
+                self.breaker.record_success()
+                logger.info("nlu_recovered")
+                return
+            time.sleep(self.probe_interval)
+
+
+# Shared client
+rasa_client = NLUClient(parse_cache=ParseCache() if PARSE_CACHE_ENABLED else None, embedded=embedded_rasa)
+
+
+def process_command(command, sender="user1", deadline=None):
+    """See NLUClient.process."""
+    return rasa_client.process(command, sender, deadline)
+
+
+async def process_command_async(command, sender="user1", deadline=None):
+    """See NLUClient.process_async."""
+    return await rasa_client.process_async(command, sender, deadline)
+
+
+def fetch_response_texts(utter_name):
+    """
+    Fetches every text variation of a domain response (e.g. "utter_wake_up_elisa")
+    from the Rasa HTTP API (requires `rasa run --enable-api`).
+
+    :return: List of response texts, empty if Rasa is unreachable.
+    """
+    if embedded_rasa is not None and embedded_rasa.ready:
+        return embedded_rasa.response_texts(utter_name)
+    if not rasa_client.healthy:
+        return []
     try:
-        response = requests.post(RASA_URL, json=payload)
-        response_data = response.json()
-        messages = []
-        continue_conversation = False
-
-        if response_data:
-            print("======================= response data =======================")
-            print(response_data)
-
-            for message in response_data:
-                # Case 1: Response has a direct "text" key
-                if "text" in message:
-                    text = extract_text_from_response(message["text"])
-                    if text:
-                        messages.append(text)
-
-                # Case 2: Response is inside "custom"
-                elif "custom" in message:
-                    custom_data = message["custom"]
-                    if "text" in custom_data:
-                        text = extract_text_from_response(custom_data["text"])
-                        if text:
-                            messages.append(text)
-                    if custom_data.get("continue"):  # Check "continue" flag
-                        continue_conversation = True
-
-            print("======================= response =======================")
-            for msg in messages:
-                print(msg)
-            print(f"Continue conversation: {continue_conversation}")
-
-            return messages, continue_conversation
-        else:
-            return ["Sorry, I didn't understand that."], False
-
-    except requests.exceptions.RequestException as e:
-        print(f"Error sending request to Rasa: {e}")
-        return ["I'm having trouble connecting to the server."], False
+        response = http_client.get("rasa_api", RASA_DOMAIN_URL, headers={"Accept": "application/json"})
+        response.raise_for_status()
+        variations = response.json().get("responses", {}).get(utter_name, [])
+        return [v["text"] for v in variations if isinstance(v, dict) and v.get("text")]
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning("nlu_domain_failed response=%s error=%s", utter_name, e)
+        return []
@@ -0,0 +1,89 @@
+# pipeline/greeting_cache.py
+import os
+import random
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nlu_client.rasa_integration import fetch_response_texts
+from tts.text_to_speech import synthesize_speech
+
+GREETING_UTTERANCE = "utter_wake_up_elisa"
+GREETING_REFRESH_SECONDS = float(os.environ.get("ELISA_GREETING_REFRESH", "1800"))
+# Skip the boot sound and greeting entirely and go straight to the beep
+FAST_WAKE = os.environ.get("ELISA_FAST_WAKE", "false").lower() in ("1", "true", "yes")
+
+
+class GreetingCache:
+    """
+    Pre-rendered greeting audio.
+
+    The greeting variations are fetched from the Rasa domain once and rendered
+    through TTS in a background thread, then refreshed every
+    GREETING_REFRESH_SECONDS. On wake the orchestrator plays a random cached
+    entry instead of sending "wake up elisa" to Rasa and synthesizing the reply.
+    """
+
+    def __init__(self, utter_name=GREETING_UTTERANCE, refresh_interval=GREETING_REFRESH_SECONDS):
+        self.utter_name = utter_name
+        self.refresh_interval = refresh_interval
+        self._entries = []  # list of (text, wav_bytes)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """Fetch and render the greeting set. Keeps the old set if anything fails."""
+        texts = fetch_response_texts(self.utter_name)
+        if not texts:
+            return False
+
+        entries = []
+        for text in texts:
+            audio = synthesize_speech(text)
+            if audio:
+                entries.append((text, audio))
+        if not entries:
+            return False
+
+        with self._lock:
+            self._entries = entries
+        print(f"[GreetingCache] {len(entries)} greetings pre-rendered")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[GreetingCache] refresh failed: {e}")
+            # Retry sooner while the cache is still empty (e.g. Rasa still starting)
+            self._stop.wait(self.refresh_interval if self.ready else 30)
+
+    def start(self):
+        """Start refreshing in a background daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="greeting-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def ready(self):
+        with self._lock:
+            return bool(self._entries)
+
+    def pick(self):
+        """Return a random (text, wav_bytes) greeting, or None if nothing is cached."""
+        with self._lock:
+            if not self._entries:
+                return None
+            return random.choice(self._entries)
+
+
+# Shared cache instance
+greeting_cache = GreetingCache()
@@ -0,0 +1,371 @@
+# pipeline/orchestrator.py
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from enum import Enum
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stt.voice_recognition import (
+    AUDIO_PERM_DIR, RecognitionSession, recognize_with_whisper_cpp, play_beep, play_wav_file,
+    new_temp_audio_path, remove_temp_audio
+)
+from nlu_client.rasa_integration import process_command_async
+from nlu_client.fast_path import fast_path_router
+from tts.text_to_speech import synthesize_speech, play_wav_bytes
+from tts.prompt_cache import prompt_cache
+from session.websocket import create_ui_logger
+from utils.flight_recorder import flight_recorder
+from pipeline.greeting_cache import greeting_cache as default_greeting_cache, FAST_WAKE
+
+BOOT_PATH = os.path.join(AUDIO_PERM_DIR, 'boot.wav')
+
+GREETING_COMMAND = "wake up elisa"
+RETRY_PROMPT = "I couldn't hear you. Please try again."
+GIVE_UP_PROMPT = "I'm sorry, I couldn't understand you. Please try again later."
+MAX_ATTEMPTS = 3
+
+# === STAGE TIMEOUTS (seconds) ===
+STAGE_TIMEOUTS = {
+    "boot": 10,
+    "beep": 5,
+    "capture": 20,   # no speech within this window counts as a failed attempt
+    "stt": 30,
+    "fast_path": 5,  # falls back to Rasa, which gets its own "nlu" budget
+    "nlu": 15,
+    "tts": 20,
+    "playback": 60,
+}
+
+
+class PipelineState(Enum):
+    IDLE = "idle"
+    BOOT = "boot"
+    LISTENING = "listening"
+    TRANSCRIBING = "transcribing"
+    PROCESSING = "processing"
+    SPEAKING = "speaking"
+
+
+# UI state (see ui/src/js/brain.js) shown for each pipeline state
+UI_STATES = {
+    PipelineState.IDLE: "idle",
+    PipelineState.BOOT: "boot",
+    PipelineState.LISTENING: "listening",
+    PipelineState.TRANSCRIBING: "processing_audio",
+    PipelineState.PROCESSING: "processing",
+    PipelineState.SPEAKING: "speaking",
+}
+
+
+class StageTimeout(Exception):
+    def __init__(self, stage, timeout):
+        super().__init__(f"stage '{stage}' timed out after {timeout}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class AssistantOrchestrator:
+    """
+    Event-driven state machine for one wake-word session.
+
+    Every blocking stage (audio, whisper, Rasa, TTS) runs in a worker thread with
+    its own timeout, so independent work can overlap:
+      * the greeting comes pre-rendered from the greeting cache (or, until the
+        cache is warm, is fetched from Rasa while the boot sound plays)
+      * the capture stream opens while the beep is still playing
+      * TTS for response N+1 is synthesized while response N plays
+    The UI state is driven only from `transition`.
+    """
+
+    def __init__(self, ui_logger=None, greeting_cache=None):
+        self.ui_logger = ui_logger or create_ui_logger("Orchestrator")
+        self.greeting_cache = greeting_cache or default_greeting_cache
+        self.state = PipelineState.IDLE
+        self._tasks = set()
+
+    # ------------------------------------------------------------------ state
+    def transition(self, state):
+        if state is self.state:
+            return
+        print(f"[Pipeline] {self.state.value} -> {state.value}")
+        self.state = state
+        self.ui_logger.set_state(UI_STATES[state])
+
+    # ----------------------------------------------------------------- stages
+    def _spawn(self, coro, name):
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run_stage(self, stage, func, *args, cancel_event=None):
+        """
+        Run a blocking stage in a worker thread with the stage's timeout.
+
+        Threads cannot be killed, so on timeout/cancellation `cancel_event` (if
+        given) is set to ask the worker to stop on its own.
+        """
+        timeout = STAGE_TIMEOUTS[stage]
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(func, *args), timeout)
+        except asyncio.TimeoutError:
+            if cancel_event is not None:
+                cancel_event.set()
+            raise StageTimeout(stage, timeout) from None
+        except asyncio.CancelledError:
+            if cancel_event is not None:
+                cancel_event.set()
+            raise
+
+    async def cancel_all(self):
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def ask_nlu(self, text):
+        """
+        Send text to Rasa within the NLU stage deadline. Returns (responses, continue),
+        a spoken fallback if Rasa is unhealthy, or None on unexpected failure.
+        """
+        try:
+            return await process_command_async(text, deadline=STAGE_TIMEOUTS["nlu"])
+        except Exception as e:
+            print(f"Failed to process command with Rasa: {e}")
+            return None
+
+    async def handle_command(self, text, in_conversation=False):
+        """
+        Resolve a command, trying the local fast path before Rasa. Follow-ups in
+        a conversation always go to Rasa, which holds the dialogue state.
+        Returns (responses, continue) or None on failure.
+        """
+        if not in_conversation:
+            try:
+                result = await self.run_stage("fast_path", fast_path_router.route, text)
+            except Exception as e:
+                print(f"Fast path failed, falling back to Rasa: {e}")
+                result = None
+            if result is not None:
+                return result
+
+        start = time.monotonic()
+        result = await self.ask_nlu(text)
+        fast_path_router.record_fallback(time.monotonic() - start)
+        return result
+
+    async def listen(self, session):
+        """
+        Beep, record one utterance and transcribe it. Returns text or None.
+
+        :param session: RecognitionSession kept open across the retry attempts.
+        """
+        audio_path = new_temp_audio_path()
+        start_event = threading.Event()
+        cancel_event = threading.Event()
+
+        self.transition(PipelineState.LISTENING)
+        # Open the capture stream straight away; frames are discarded until the beep is done
+        capture = self._spawn(
+            self.run_stage("capture", session.record, audio_path, start_event, cancel_event,
+                           cancel_event=cancel_event),
+            "capture"
+        )
+        try:
+            try:
+                await self.run_stage("beep", play_beep)
+            except StageTimeout as e:
+                print(f"⚠️ {e}")
+            finally:
+                start_event.set()
+                flight_recorder.mark("beep_done")
+
+            if not await capture:
+                return None
+
+            self.transition(PipelineState.TRANSCRIBING)
+            transcribe = functools.partial(recognize_with_whisper_cpp, audio_path,
+                                           timeout=STAGE_TIMEOUTS["stt"])
+            text = await self.run_stage("stt", transcribe)
+            flight_recorder.mark("stt_done")
+            return text
+        except StageTimeout as e:
+            print(f"⚠️ {e}")
+            return None
+        except Exception as e:
+            # Microphone (PortAudio) or whisper-cli errors: count as a failed attempt and retry
+            print(f"❌ Listening failed: {e}")
+            return None
+        finally:
+            if not capture.done():
+                capture.cancel()
+                await asyncio.gather(capture, return_exceptions=True)
+            remove_temp_audio(audio_path)
+
+    async def speak(self, responses, record=False):
+        """
+        Speak responses in order, synthesizing N+1 while N plays.
+
+        :param record: Mark tts_done/first_audio_out on the flight recorder.
+        """
+        if not responses:
+            return
+        self.transition(PipelineState.SPEAKING)
+
+        pending = self._spawn(self.run_stage("tts", synthesize_speech, responses[0]), "tts-0")
+        if record:
+            pending.add_done_callback(lambda _task: flight_recorder.mark("tts_done"))
+        for i, response in enumerate(responses):
+            print(f"Speaking response {i+1}: {response[:50]}{'...' if len(response) > 50 else ''}")
+            try:
+                audio = await pending
+            except Exception as e:
+                print(f"Failed to synthesize response: {e}")
+                audio = None
+
+            if i + 1 < len(responses):
+                pending = self._spawn(
+                    self.run_stage("tts", synthesize_speech, responses[i + 1]), f"tts-{i + 1}"
+                )
+
+            if audio is None:
+                print("Failed to speak response: no audio")
+                continue
+            if record:
+                flight_recorder.mark("first_audio_out")
+            try:
+                await self.run_stage("playback", play_wav_bytes, audio)
+            except StageTimeout as e:
+                print(f"⚠️ {e}")
+
+    async def speak_prompt(self, text):
+        """Speak a fixed prompt from the pre-rendered prompt cache."""
+        self.transition(PipelineState.SPEAKING)
+        print(f"Speaking prompt: {text}")
+        try:
+            audio = await self.run_stage("tts", prompt_cache.get, text)
+            if audio is None:
+                print("Failed to speak prompt: no audio")
+                return
+            await self.run_stage("playback", play_wav_bytes, audio)
+        except StageTimeout as e:
+            print(f"⚠️ {e}")
+
+    async def recognize_command(self):
+        """
+        Give the user MAX_ATTEMPTS chances to say a command.
+
+        The capture stream stays open across the attempts, so a retry only costs
+        the (cached) prompt playback.
+        """
+        session = RecognitionSession()
+        try:
+            for attempt in range(MAX_ATTEMPTS):
+                command = await self.listen(session)
+                if command:
+                    print(f"Command recognized: '{command}'")
+                    return command
+                print(f"No speech detected on attempt {attempt + 1}")
+                if attempt < MAX_ATTEMPTS - 1:  # Don't speak on last attempt
+                    await self.speak_prompt(RETRY_PROMPT)
+            return None
+        finally:
+            # Release the device so the wake word detector can reopen it
+            await asyncio.to_thread(session.close)
+
+    # ---------------------------------------------------------------- session
+    async def play_boot_sound(self):
+        try:
+            if not await self.run_stage("boot", play_wav_file, BOOT_PATH):
+                print("Failed to play boot sound: No audio playback method available")
+        except StageTimeout as e:
+            print(f"⚠️ {e}")
+
+    async def greet(self):
+        """
+        Boot sound + greeting.
+
+        Fast wake skips both. Otherwise a pre-rendered greeting from the cache is
+        played; only while the cache is still empty is the greeting fetched from
+        Rasa (in parallel with the boot sound) and synthesized.
+        """
+        if FAST_WAKE:
+            flight_recorder.mark("greeting_done")
+            return True
+
+        self.transition(PipelineState.BOOT)
+        cached = self.greeting_cache.pick()
+        if cached is not None:
+            await self.play_boot_sound()
+            text, audio = cached
+            self.transition(PipelineState.SPEAKING)
+            print(f"Speaking cached greeting: {text}")
+            try:
+                await self.run_stage("playback", play_wav_bytes, audio)
+            except StageTimeout as e:
+                print(f"⚠️ {e}")
+            flight_recorder.mark("greeting_done")
+            return True
+
+        greeting = self._spawn(self.ask_nlu(GREETING_COMMAND), "greeting-nlu")
+        await self.play_boot_sound()
+
+        result = await greeting
+        if result is None:
+            return False
+        responses, _continue = result
+        print(f"Received {len(responses)} responses from Rasa")
+        await self.speak(responses)
+        flight_recorder.mark("greeting_done")
+        print("Greeting sequence completed")
+        return True
+
+    async def run_session(self):
+        """Run one wake-word session until the conversation ends."""
+        try:
+            if not await self.greet():
+                return
+
+            in_conversation = False
+            while True:
+                # Follow-up commands in the same conversation start a new turn here
+                flight_recorder.ensure_turn("listen_start")
+                command = await self.recognize_command()
+                if not command:
+                    # Capture now times out, so give up and go back to the wake word
+                    await self.speak_prompt(GIVE_UP_PROMPT)
+                    flight_recorder.end_turn()
+                    break
+
+                # The Rasa call starts as soon as the transcript is final
+                self.transition(PipelineState.PROCESSING)
+                print(f"Processing command: '{command}'")
+                result = await self.handle_command(command, in_conversation)
+                flight_recorder.mark("nlu_done")
+                if result is None:
+                    flight_recorder.end_turn()
+                    continue
+
+                responses, continue_conversation = result
+                print(f"Command processed, got {len(responses)} responses")
+                await self.speak(responses, record=True)
+                flight_recorder.end_turn()
+
+                if not continue_conversation:
+                    print("No further conversation needed - ending session")
+                    break
+                print("Conversation continuing...")
+                in_conversation = True
+        finally:
+            await self.cancel_all()
+            flight_recorder.end_turn()
+            self.transition(PipelineState.IDLE)
+
+    def run(self):
+        """Blocking entry point (used as the wake word callback)."""
+        asyncio.run(self.run_session())
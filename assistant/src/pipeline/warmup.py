@@ -0,0 +1,208 @@
+# pipeline/warmup.py
+import os
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory and project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.http_client import http_client
+
+# === SERVICE ENDPOINTS ===
+RASA_BASE_URL = "http://localhost:5005"
+ACTIONS_HEALTH_URL = "http://localhost:5055/health"
+DUCKLING_URL = f"http://localhost:{os.environ.get('DUCKLING_PORT', '8000')}/parse"
+LOGIC_BASE_URL = "http://localhost:8021"
+
+STARTUP_TIMEOUT = float(os.environ.get("ELISA_STARTUP_TIMEOUT", "90"))
+RETRY_INTERVAL = 2.0
+PROBE_TIMEOUT = 10
+
+
+# === PROBES ===
+# Each probe raises on failure and returns a short detail string on success.
+# Where possible it sends a dummy request so the first real command doesn't pay
+# for model loading. Probes go through the shared HTTP client, which also leaves
+# a warm keep-alive connection in its pool for the first real call.
+
+def probe_rasa():
+    status = http_client.get("rasa_api", f"{RASA_BASE_URL}/status", timeout=PROBE_TIMEOUT)
+    status.raise_for_status()
+    model_file = os.path.basename(status.json().get("model_file", "") or "")
+    # Dummy parse loads spaCy/DIET into memory
+    parse = http_client.post("rasa_api", f"{RASA_BASE_URL}/model/parse", json={"text": "hello"},
+                             timeout=PROBE_TIMEOUT)
+    parse.raise_for_status()
+    return f"model {model_file or 'loaded'}"
+
+
+def probe_rasa_embedded():
+    from nlu_client.rasa_agent import embedded_rasa
+    if not embedded_rasa.wait_ready(timeout=STARTUP_TIMEOUT):
+        if embedded_rasa.error is None:
+            raise RuntimeError("model still loading")
+        # The agent can't load here (e.g. rasa not installed): the REST server takes over
+        return f"REST fallback ({embedded_rasa.error}): {probe_rasa()}"
+    # Dummy parse loads spaCy/DIET into memory
+    embedded_rasa.parse("hello", timeout=PROBE_TIMEOUT)
+    return "in-process agent loaded"
+
+
+def probe_actions():
+    res = http_client.get("rasa_actions", ACTIONS_HEALTH_URL, timeout=PROBE_TIMEOUT)
+    res.raise_for_status()
+    return "healthy"
+
+
+def probe_duckling():
+    res = http_client.post("duckling", DUCKLING_URL, data={"locale": "en_US", "text": "tomorrow at 5 pm"},
+                           timeout=PROBE_TIMEOUT)
+    res.raise_for_status()
+    return f"{len(res.json())} entities from dummy parse"
+
+
+def probe_coqui():
+    from tts.text_to_speech import TTS_API_URL
+    # Talk to Coqui directly so a slow cold start doesn't trip the TTS router's breaker
+    res = http_client.post("coqui_tts", TTS_API_URL, data={"text": "Ready."}, timeout=60)
+    res.raise_for_status()
+    return f"{len(res.content)} bytes synthesized"
+
+
+def probe_logic():
+    res = http_client.get("logic", f"{LOGIC_BASE_URL}/", timeout=PROBE_TIMEOUT)
+    res.raise_for_status()
+    return res.json().get("status", "running")
+
+
+def probe_whisper():
+    from stt.voice_recognition import (WHISPER_CLI, MODEL_PATH, RATE, new_temp_audio_path,
+                                       remove_temp_audio, recognize_with_whisper_cpp)
+    if not os.path.exists(WHISPER_CLI):
+        raise FileNotFoundError(f"whisper-cli not found at {WHISPER_CLI}")
+    if not os.path.exists(MODEL_PATH):
+        raise FileNotFoundError(f"whisper model not found at {MODEL_PATH}")
+
+    # Transcribe half a second of silence to page the model into the OS cache
+    audio_path = new_temp_audio_path()
+    try:
+        with wave.open(audio_path, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(RATE)
+            wf.writeframes(b"\x00\x00" * (RATE // 2))
+        # None means whisper-cli failed or timed out; silence gives an empty transcript
+        if recognize_with_whisper_cpp(audio_path, timeout=120) is None:
+            raise RuntimeError("whisper-cli failed on a test clip (see the output above)")
+    finally:
+        remove_temp_audio(audio_path)
+    return os.path.basename(MODEL_PATH)
+
+
+def probe_wake_word():
+    from wake_word.wake_word_detection import load_model, WAKE_WORD
+    load_model()
+    return f"'{WAKE_WORD}' model loaded"
+
+
+def tts_is_critical():
+    """Coqui is only on the critical path when there is no local fallback engine."""
+    from tts.text_to_speech import find_local_engine
+    return find_local_engine() is None
+
+
+class Dependency:
+    def __init__(self, name, probe, critical):
+        self.name = name
+        self.probe = probe
+        self.critical = critical
+        self.status = "pending"   # pending | ready | degraded
+        self.detail = ""
+        self.elapsed = 0.0
+        self.attempts = 0
+
+
+def default_dependencies():
+    from nlu_client.rasa_agent import NLU_MODE
+    if NLU_MODE == "embedded":
+        # The REST server and the action server are only the fallback path
+        nlu = [Dependency("rasa_embedded", probe_rasa_embedded, critical=True)]
+    else:
+        nlu = [
+            Dependency("rasa", probe_rasa, critical=True),
+            Dependency("actions", probe_actions, critical=False),
+        ]
+    return [
+        Dependency("wake_word", probe_wake_word, critical=True),
+        Dependency("whisper", probe_whisper, critical=True),
+        *nlu,
+        Dependency("duckling", probe_duckling, critical=False),
+        Dependency("logic", probe_logic, critical=False),
+        Dependency("coqui_tts", probe_coqui, critical=tts_is_critical()),
+    ]
+
+
+class ReadinessReport:
+    def __init__(self, dependencies, elapsed):
+        self.dependencies = dependencies
+        self.elapsed = elapsed
+
+    @property
+    def critical_ready(self):
+        return all(d.status == "ready" for d in self.dependencies if d.critical)
+
+    @property
+    def degraded(self):
+        return [d for d in self.dependencies if d.status != "ready"]
+
+    def print(self):
+        print(f"=== Startup readiness ({self.elapsed:.1f}s) ===")
+        for d in self.dependencies:
+            icon = "✅" if d.status == "ready" else ("❌" if d.critical else "⚠️")
+            role = "critical" if d.critical else "optional"
+            print(f"{icon} {d.name:<10} {role:<9} {d.status:<9} {d.elapsed * 1000:8.0f} ms  "
+                  f"{d.attempts} attempt(s)  {d.detail}")
+        if not self.critical_ready:
+            names = ", ".join(d.name for d in self.dependencies if d.critical and d.status != "ready")
+            print(f"⚠️ Critical path degraded: {names}")
+
+
+def warm_up(dependencies=None, timeout=STARTUP_TIMEOUT):
+    """
+    Probe and warm every dependency concurrently.
+
+    Critical dependencies are retried until they are ready or `timeout` expires.
+    Optional ones are retried only while the critical path is still warming up,
+    so they never delay startup on their own.
+    """
+    dependencies = dependencies or default_dependencies()
+    started = time.monotonic()
+    deadline = started + timeout
+    critical_done = threading.Event()
+
+    def run(dep):
+        while True:
+            dep.attempts += 1
+            try:
+                dep.detail = dep.probe() or ""
+                dep.status = "ready"
+                break
+            except Exception as e:
+                dep.status = "degraded"
+                dep.detail = str(e)
+            if time.monotonic() >= deadline or (not dep.critical and critical_done.is_set()):
+                break
+            time.sleep(RETRY_INTERVAL)
+        dep.elapsed = time.monotonic() - started
+
+    critical = [d for d in dependencies if d.critical]
+    with ThreadPoolExecutor(max_workers=len(dependencies), thread_name_prefix="warmup") as pool:
+        futures = {dep.name: pool.submit(run, dep) for dep in dependencies}
+        for dep in critical:
+            futures[dep.name].result()
+        critical_done.set()
+
+    return ReadinessReport(dependencies, time.monotonic() - started)
@@ -0,0 +1,134 @@
+# satellite/client.py
+#
+# Lightweight satellite: microphone + speaker + VAD, no models. Every speech
+# segment is streamed to the central node (satellite/server.py), which verifies
+# the wake word, transcribes and answers.
+#
+#   cd assistant/src
+#   python -m satellite.client --server ws://central-node:8770 --device-id kitchen
+import argparse
+import asyncio
+import collections
+import json
+import os
+import socket
+import sys
+
+import webrtcvad
+import websockets
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sim.audio_backend import create_pyaudio
+from stt.voice_recognition import (CHANNELS, CHUNK, FORMAT, FRAME_DURATION, RATE, VAD_AGGRESSIVENESS,
+                                   find_working_input_device, play_beep)
+from tts.text_to_speech import play_wav_bytes
+
+PRE_ROLL_FRAMES = int(300 / FRAME_DURATION)      # keep the start of the wake word
+END_SILENCE_FRAMES = int(800 / FRAME_DURATION)   # segment ends after 0.8 s of silence
+MAX_SEGMENT_FRAMES = int(15000 / FRAME_DURATION)
+SEND_FRAMES = 4                                  # frames per binary message
+
+
+def capture_segment(stream, vad):
+    """Block until one speech segment has been captured; return its PCM frames."""
+    pre_roll = collections.deque(maxlen=PRE_ROLL_FRAMES)
+    frames = []
+    silence = 0
+    while True:
+        frame = stream.read(CHUNK, exception_on_overflow=False)
+        is_speech = vad.is_speech(frame, RATE)
+        if not frames:
+            pre_roll.append(frame)
+            if is_speech:
+                frames = list(pre_roll)
+            continue
+        frames.append(frame)
+        silence = 0 if is_speech else silence + 1
+        if silence >= END_SILENCE_FRAMES or len(frames) >= MAX_SEGMENT_FRAMES:
+            return frames
+
+
+class SatelliteClient:
+    def __init__(self, server_url, device_id):
+        self.server_url = server_url
+        self.device_id = device_id
+        self.vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+
+    async def send_segment(self, websocket, frames):
+        await websocket.send(json.dumps({"type": "segment_start"}))
+        for i in range(0, len(frames), SEND_FRAMES):
+            await websocket.send(b"".join(frames[i:i + SEND_FRAMES]))
+        await websocket.send(json.dumps({"type": "segment_end"}))
+
+    async def await_reply(self, websocket):
+        """Handle server messages for one segment until the server is done with it."""
+        while True:
+            msg = json.loads(await websocket.recv())
+            kind = msg.get("type")
+            if kind == "wake":
+                await asyncio.to_thread(play_beep)
+                return
+            if kind == "rejected":
+                return
+            if kind == "audio":
+                audio = await websocket.recv()
+                print(f"🗣️ {msg.get('text')}")
+                await asyncio.to_thread(play_wav_bytes, audio)
+            elif kind == "turn_end":
+                if msg.get("continue"):
+                    await asyncio.to_thread(play_beep)
+                return
+            elif kind == "error":
+                print(f"❌ Server error: {msg.get('message')}")
+                return
+
+    async def run_connection(self, stream):
+        async with websockets.connect(self.server_url, max_size=None) as websocket:
+            await websocket.send(json.dumps({"type": "hello", "device_id": self.device_id}))
+            welcome = json.loads(await websocket.recv())
+            if welcome.get("type") != "welcome":
+                raise ConnectionError(welcome.get("message", "handshake failed"))
+            print(f"Connected to {self.server_url} as {welcome['sender_id']}")
+
+            while True:
+                stream.start_stream()
+                try:
+                    frames = await asyncio.to_thread(capture_segment, stream, self.vad)
+                finally:
+                    # Half duplex: stop capturing while the server thinks and we speak
+                    stream.stop_stream()
+                await self.send_segment(websocket, frames)
+                await self.await_reply(websocket)
+
+    async def run(self):
+        p = create_pyaudio()
+        device_index = find_working_input_device(p)
+        stream = p.open(format=FORMAT, channels=CHANNELS, rate=RATE, input=True,
+                        input_device_index=device_index, frames_per_buffer=CHUNK, start=False)
+        try:
+            while True:
+                try:
+                    await self.run_connection(stream)
+                except (OSError, ConnectionError, websockets.exceptions.WebSocketException) as e:
+                    print(f"⚠️ Connection to {self.server_url} lost: {e}. Retrying in 3s...")
+                    await asyncio.sleep(3)
+        finally:
+            stream.close()
+            p.terminate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a room's microphone to the central node.")
+    parser.add_argument("--server", default=os.environ.get("ELISA_SATELLITE_SERVER", "ws://localhost:8770"))
+    parser.add_argument("--device-id", default=socket.gethostname())
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(SatelliteClient(args.server, args.device_id).run())
+    except KeyboardInterrupt:
+        print("\nStopped by user.")
+
+
+if __name__ == "__main__":
+    main()
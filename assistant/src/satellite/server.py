@@ -0,0 +1,170 @@
+# satellite/server.py
+#
+# Central node for multi-room use. Satellites stream speech segments over a
+# WebSocket; this node verifies the wake word, transcribes, asks Rasa (one
+# conversation per satellite) and streams the spoken replies back.
+#
+#   cd assistant/src
+#   python -m satellite.server --host 0.0.0.0 --port 8770
+#
+# Protocol (text frames are JSON, binary frames are audio):
+#   satellite -> server  {"type": "hello", "device_id": "kitchen"}
+#                        {"type": "segment_start"}, PCM16 mono 16 kHz chunks, {"type": "segment_end"}
+#                        {"type": "status"}
+#   server -> satellite  {"type": "welcome", "sender_id": ..., "state": ...}
+#                        {"type": "wake", "score": ...} / {"type": "rejected", "score": ...}
+#                        {"type": "audio", "index": i, "text": ..., "engine": ...} followed by a WAV frame
+#                        {"type": "turn_end", "transcript": ..., "continue": bool}
+#                        {"type": "status", "sessions": [...], "pending": {...}}
+#                        {"type": "error", "message": ...} for frames that are not a JSON object
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import websockets
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nlu_client.rasa_integration import process_command_async
+from satellite.session import SessionRegistry
+from satellite.worker_pool import SpeechWorkerPool
+from stt.voice_recognition import RATE
+
+SATELLITE_PORT = int(os.environ.get("ELISA_SATELLITE_PORT", "8770"))
+MAX_SEGMENT_SECONDS = 15
+MAX_SEGMENT_BYTES = MAX_SEGMENT_SECONDS * RATE * 2
+
+
+class SatelliteServer:
+    def __init__(self, pool=None, registry=None):
+        self.pool = pool or SpeechWorkerPool()
+        self.registry = registry or SessionRegistry()
+
+    async def send_json(self, websocket, message):
+        await websocket.send(json.dumps(message))
+
+    @staticmethod
+    def parse_message(message):
+        """The JSON object in a text frame, or None if it is not one."""
+        try:
+            msg = json.loads(message)
+        except ValueError:
+            return None
+        return msg if isinstance(msg, dict) else None
+
+    async def handle_connection(self, websocket):
+        try:
+            hello = self.parse_message(await websocket.recv())
+        except websockets.exceptions.ConnectionClosed:
+            return
+        if hello is None or hello.get("type") != "hello" or not hello.get("device_id"):
+            await self.send_json(websocket, {"type": "error", "message": "expected hello with device_id"})
+            return
+
+        device_id = str(hello["device_id"])
+        session = self.registry.attach(device_id, websocket)
+        print(f"[Satellite] {device_id} connected (sender id {session.sender_id})")
+        await self.send_json(websocket, {"type": "welcome", "sender_id": session.sender_id,
+                                         "state": session.state})
+
+        segment = bytearray()
+        receiving = False
+        try:
+            async for message in websocket:
+                session.touch()
+                if isinstance(message, bytes):
+                    if receiving and len(segment) < MAX_SEGMENT_BYTES:
+                        segment.extend(message[:MAX_SEGMENT_BYTES - len(segment)])
+                    continue
+
+                msg = self.parse_message(message)
+                if msg is None:
+                    await self.send_json(websocket, {"type": "error", "message": "expected a JSON object"})
+                    continue
+                kind = msg.get("type")
+                if kind == "segment_start":
+                    segment.clear()
+                    receiving = True
+                elif kind == "segment_end" and receiving:
+                    receiving = False
+                    await self.handle_segment(session, websocket, bytes(segment))
+                elif kind == "status":
+                    await self.send_json(websocket, {
+                        "type": "status",
+                        "sessions": [s.to_dict() for s in self.registry.all()],
+                        "pending": self.pool.pending(),
+                    })
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.registry.detach(device_id, websocket)
+            print(f"[Satellite] {device_id} disconnected")
+
+    async def handle_segment(self, session, websocket, pcm):
+        if not pcm:
+            return
+        if session.is_awaiting_command():
+            await self.run_turn(session, websocket, pcm)
+            return
+
+        verified, score = await self.pool.verify_wake(pcm)
+        if verified:
+            print(f"[Satellite] {session.device_id}: wake word verified (score {score:.2f})")
+            session.expect_command()
+            await self.send_json(websocket, {"type": "wake", "score": score})
+        else:
+            await self.send_json(websocket, {"type": "rejected", "score": score})
+
+    async def run_turn(self, session, websocket, pcm):
+        session.begin_turn()
+        continue_conversation = False
+        transcript = None
+        try:
+            transcript = await self.pool.transcribe(pcm)
+            if not transcript:
+                print(f"[Satellite] {session.device_id}: no recognizable speech")
+                return
+
+            print(f"[Satellite] {session.device_id}: {transcript}")
+            responses, continue_conversation = await process_command_async(transcript, session.sender_id)
+
+            # Synthesize every response concurrently, stream them back in order
+            jobs = [asyncio.ensure_future(self.pool.synthesize(text)) for text in responses]
+            for index, (text, job) in enumerate(zip(responses, jobs)):
+                audio, engine = await job
+                if audio is None:
+                    continue
+                await self.send_json(websocket, {"type": "audio", "index": index,
+                                                 "text": text, "engine": engine})
+                await websocket.send(audio)
+        finally:
+            session.end_turn(continue_conversation)
+            await self.send_json(websocket, {"type": "turn_end", "transcript": transcript,
+                                             "continue": continue_conversation})
+
+    async def serve(self, host, port):
+        print(f"[Satellite] Server listening on ws://{host}:{port} "
+              f"({self.pool.stt_workers} STT worker(s) x {self.pool.stt_threads} thread(s))")
+        async with websockets.serve(self.handle_connection, host, port, max_size=None):
+            await asyncio.Future()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve wake verification, STT, NLU and TTS to satellites.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=SATELLITE_PORT)
+    args = parser.parse_args(argv)
+
+    server = SatelliteServer()
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nStopped by user.")
+    finally:
+        server.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
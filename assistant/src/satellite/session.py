@@ -0,0 +1,94 @@
+# satellite/session.py
+import threading
+import time
+
+# How long a satellite may take to start its command after a verified wake word
+COMMAND_WINDOW = 8.0
+
+
+class SatelliteSession:
+    """
+    Conversation state for one satellite (room device).
+
+    Each satellite gets its own Rasa sender id, so slots, forms and follow-up
+    questions in one room never leak into another.
+    """
+
+    IDLE = "idle"                  # waiting for a wake word
+    AWAITING_COMMAND = "awaiting"  # wake word verified (or follow-up requested)
+    BUSY = "busy"                  # transcribing / thinking / speaking
+
+    def __init__(self, device_id, command_window=COMMAND_WINDOW):
+        self.device_id = device_id
+        self.sender_id = f"satellite:{device_id}"
+        self.command_window = command_window
+        self.state = self.IDLE
+        self.awaiting_until = 0.0
+        self.turns = 0
+        self.connected = False
+        self.connection = None  # websocket of the current connection
+        self.last_seen = time.monotonic()
+
+    def touch(self):
+        self.last_seen = time.monotonic()
+
+    def expect_command(self):
+        """Open the command window (after a verified wake word or a follow-up question)."""
+        self.state = self.AWAITING_COMMAND
+        self.awaiting_until = time.monotonic() + self.command_window
+
+    def is_awaiting_command(self):
+        if self.state == self.AWAITING_COMMAND and time.monotonic() > self.awaiting_until:
+            self.state = self.IDLE
+        return self.state == self.AWAITING_COMMAND
+
+    def begin_turn(self):
+        self.state = self.BUSY
+        self.turns += 1
+
+    def end_turn(self, continue_conversation):
+        if continue_conversation:
+            self.expect_command()
+        else:
+            self.state = self.IDLE
+
+    def to_dict(self):
+        return {
+            "device_id": self.device_id,
+            "sender_id": self.sender_id,
+            "state": self.state,
+            "turns": self.turns,
+            "connected": self.connected,
+        }
+
+
+class SessionRegistry:
+    """Sessions by device id. A reconnecting satellite resumes its conversation."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def attach(self, device_id, connection=None):
+        with self._lock:
+            session = self._sessions.get(device_id)
+            if session is None:
+                session = SatelliteSession(device_id)
+                self._sessions[device_id] = session
+            session.connected = True
+            session.connection = connection
+            session.touch()
+            return session
+
+    def detach(self, device_id, connection=None):
+        """Mark a satellite disconnected, unless it has already reconnected on another connection."""
+        with self._lock:
+            session = self._sessions.get(device_id)
+            if session is not None and (connection is None or session.connection is connection):
+                session.connected = False
+                session.connection = None
+                session.state = SatelliteSession.IDLE
+
+    def all(self):
+        with self._lock:
+            return list(self._sessions.values())
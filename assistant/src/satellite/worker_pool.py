@@ -0,0 +1,112 @@
+# satellite/worker_pool.py
+import asyncio
+import os
+import sys
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stt.voice_recognition import (RATE, new_temp_audio_path, remove_temp_audio,
+                                   recognize_with_whisper_cpp)
+from tts.text_to_speech import tts_router
+
+# === WORKER SETTINGS ===
+# whisper.cpp and the TTS engines do their heavy lifting in native code or in
+# other processes, so threads are enough to keep every core busy. STT jobs split
+# the cores between them; TTS jobs are mostly waiting on Coqui or espeak-ng.
+CPU_COUNT = os.cpu_count() or 1
+STT_WORKERS = int(os.environ.get("ELISA_STT_WORKERS", str(max(1, CPU_COUNT // 4))))
+TTS_WORKERS = int(os.environ.get("ELISA_TTS_WORKERS", "4"))
+WAKE_WORKERS = int(os.environ.get("ELISA_WAKE_WORKERS", "1"))
+STT_TIMEOUT = 30
+
+WAKE_VERIFY_THRESHOLD = float(os.environ.get("ELISA_WAKE_VERIFY_THRESHOLD", "0.5"))
+WAKE_FRAME = 1280  # 80 ms, the frame size openwakeword is trained on
+
+
+class SpeechWorkerPool:
+    """
+    Schedules wake verification, STT and TTS jobs from every satellite onto
+    bounded worker pools, so one node with heavy models can serve many rooms.
+    """
+
+    def __init__(self, stt_workers=STT_WORKERS, tts_workers=TTS_WORKERS, wake_workers=WAKE_WORKERS):
+        self.stt_workers = max(1, stt_workers)
+        self.stt_threads = max(1, CPU_COUNT // self.stt_workers)
+        self._stt = ThreadPoolExecutor(max_workers=self.stt_workers, thread_name_prefix="stt")
+        self._tts = ThreadPoolExecutor(max_workers=max(1, tts_workers), thread_name_prefix="tts")
+        self._wake = ThreadPoolExecutor(max_workers=max(1, wake_workers), thread_name_prefix="wake")
+        # openwakeword models keep streaming state, so every wake worker owns one
+        self._local = threading.local()
+        self._pending = {"wake": 0, "stt": 0, "tts": 0}
+        self._lock = threading.Lock()
+
+    async def _submit(self, kind, executor, fn, *args):
+        with self._lock:
+            self._pending[kind] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending[kind] -= 1
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    # === WAKE VERIFICATION ===
+    def _wake_model(self):
+        model = getattr(self._local, "model", None)
+        if model is None:
+            from openwakeword.model import Model
+            from wake_word.wake_word_detection import WAKE_WORD, load_model
+            load_model()  # downloads the models on first run
+            model = Model(wakeword_models=[WAKE_WORD])
+            self._local.model = model
+        return model
+
+    def _verify_wake(self, pcm):
+        from wake_word.wake_word_detection import WAKE_WORD
+        model = self._wake_model()
+        model.reset()
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        best = 0.0
+        for start in range(0, len(samples) - WAKE_FRAME + 1, WAKE_FRAME):
+            score = model.predict(samples[start:start + WAKE_FRAME]).get(WAKE_WORD, 0)
+            best = max(best, score)
+        model.reset()
+        return best
+
+    async def verify_wake(self, pcm):
+        """Return (verified, best score) for a PCM16 mono 16 kHz segment."""
+        score = await self._submit("wake", self._wake, self._verify_wake, pcm)
+        return score >= WAKE_VERIFY_THRESHOLD, score
+
+    # === STT ===
+    def _transcribe(self, pcm):
+        audio_path = new_temp_audio_path()
+        try:
+            with wave.open(audio_path, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(RATE)
+                wf.writeframes(pcm)
+            return recognize_with_whisper_cpp(audio_path, timeout=STT_TIMEOUT, threads=self.stt_threads)
+        finally:
+            remove_temp_audio(audio_path)
+
+    async def transcribe(self, pcm):
+        return await self._submit("stt", self._stt, self._transcribe, pcm)
+
+    # === TTS ===
+    async def synthesize(self, text):
+        """Return (wav_bytes, engine); wav_bytes is None if every engine failed."""
+        return await self._submit("tts", self._tts, tts_router.synthesize, text)
+
+    def shutdown(self):
+        for executor in (self._wake, self._stt, self._tts):
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,35 @@
+# sim/audio_backend.py
+# Audio backend selection. Capture code asks `create_pyaudio()` for its PyAudio
+# instance and playback code checks `get_simulator()` first, so a simulator
+# installed with `install_simulator()` replaces the microphone and speaker
+# without the rest of the pipeline noticing.
+
+_simulator = None
+
+
+def install_simulator(simulator):
+    global _simulator
+    _simulator = simulator
+
+
+def get_simulator():
+    """Return the installed AudioSimulator, or None when using real devices."""
+    return _simulator
+
+
+def create_pyaudio():
+    if _simulator is not None:
+        return _simulator.pyaudio()
+    import pyaudio
+    return pyaudio.PyAudio()
+
+
+def audio_clock():
+    """
+    Seconds on the capture clock: wall time with real devices, audio consumed so
+    far in a simulation (which runs faster than real time).
+    """
+    if _simulator is not None:
+        return _simulator.source.seconds_consumed
+    import time
+    return time.time()
@@ -0,0 +1,79 @@
+# sim/run_simulation.py
+#
+# Headless run of the full wake -> STT -> NLU -> TTS pipeline from WAV files.
+#
+#   cd assistant/src
+#   python -m sim.run_simulation wake.wav what_time.wav wake.wav open_firefox.wav
+#
+# The clips are played into a simulated microphone in order (each surrounded by
+# --gap seconds of silence); everything the assistant says is recorded in memory.
+# Whisper, Rasa, the logic service and TTS are the real services.
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sim.audio_backend import install_simulator
+from sim.simulator import AudioSimulator, SimulationFinished
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the assistant pipeline from WAV files.")
+    parser.add_argument("wavs", nargs="+", help="Input clips in order (wake word, command, ...)")
+    parser.add_argument("--gap", type=float, default=3.0,
+                        help="Seconds of silence around each clip (default: 3.0)")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Pace the simulated microphone at real time instead of as fast as possible")
+    parser.add_argument("--warm-up", action="store_true",
+                        help="Run the startup warm-up before the simulation")
+    parser.add_argument("--output-dir",
+                        help="Write every clip the assistant played to this directory")
+    return parser.parse_args(argv)
+
+
+def save_clips(playback, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    for i, (_label, audio, _duration) in enumerate(playback.clips):
+        with open(os.path.join(output_dir, f"{i:03d}.wav"), "wb") as f:
+            f.write(audio)
+
+
+def run(args):
+    simulator = AudioSimulator.from_wavs(args.wavs, gap=args.gap, realtime=args.realtime)
+    install_simulator(simulator)
+
+    from main import assistant_workflow
+    from utils.flight_recorder import flight_recorder
+    from wake_word.wake_word_detection import listen_for_wake_word
+
+    if args.warm_up:
+        from pipeline.warmup import warm_up
+        warm_up().print()
+
+    started = time.monotonic()
+    try:
+        listen_for_wake_word(assistant_workflow)
+    except SimulationFinished:
+        pass
+    wall = time.monotonic() - started
+
+    source = simulator.source
+    playback = simulator.playback
+    print("=== Simulation finished ===")
+    print(f"Input audio consumed : {source.seconds_consumed:.1f}s of {source.seconds_total:.1f}s")
+    print(f"Output clips played  : {len(playback.clips)} ({playback.seconds_played:.1f}s of audio)")
+    print(f"Wall time            : {wall:.1f}s")
+    if wall > 0:
+        print(f"Speed                : {source.seconds_consumed / wall:.1f}x real time (input)")
+    flight_recorder.print_summary(last_n=len(flight_recorder.turns) or 1)
+
+    if args.output_dir:
+        save_clips(playback, args.output_dir)
+        print(f"Output clips written to {args.output_dir}")
+    return simulator
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,182 @@
+# sim/simulator.py
+import io
+import threading
+import time
+import wave
+
+import numpy as np
+
+RATE = 16000  # matches wake word detection and voice recognition
+SAMPLE_WIDTH = 2
+
+
+class SimulationFinished(BaseException):
+    """
+    Raised by the simulated microphone once the script is exhausted.
+
+    Derives from BaseException (like KeyboardInterrupt) so the pipeline's broad
+    `except Exception` retry loops don't swallow it.
+    """
+
+
+def load_wav_as_pcm16(path, rate=RATE):
+    """Load a WAV file as mono 16-bit PCM at `rate`, resampling if needed."""
+    with wave.open(path, "rb") as wf:
+        n_channels = wf.getnchannels()
+        sample_width = wf.getsampwidth()
+        src_rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if sample_width != 2:
+        raise ValueError(f"{path}: only 16-bit WAV files are supported")
+    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    if n_channels > 1:
+        samples = samples.reshape(-1, n_channels).mean(axis=1)
+    if src_rate != rate and len(samples):
+        duration = len(samples) / src_rate
+        target = np.linspace(0, len(samples) - 1, int(duration * rate))
+        samples = np.interp(target, np.arange(len(samples)), samples)
+    return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+
+class ScriptedAudioSource:
+    """
+    One continuous timeline of scripted microphone audio.
+
+    Every simulated stream reads from the same cursor, just like every real
+    stream reads from the same microphone. Time only advances when audio is read,
+    so a run is deterministic and, unless `realtime` is set, faster than real time.
+    """
+
+    def __init__(self, pcm, realtime=False):
+        self.pcm = pcm
+        self.realtime = realtime
+        self.cursor = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_wavs(cls, paths, gap=3.0, realtime=False):
+        """Concatenate WAV clips, each surrounded by `gap` seconds of silence."""
+        silence = b"\x00\x00" * int(gap * RATE)
+        parts = [silence]
+        for path in paths:
+            parts.append(load_wav_as_pcm16(path))
+            parts.append(silence)
+        return cls(b"".join(parts), realtime=realtime)
+
+    @property
+    def seconds_consumed(self):
+        return self.cursor / (RATE * SAMPLE_WIDTH)
+
+    @property
+    def seconds_total(self):
+        return len(self.pcm) / (RATE * SAMPLE_WIDTH)
+
+    def read(self, n_frames):
+        n_bytes = n_frames * SAMPLE_WIDTH
+        with self._lock:
+            if self.cursor >= len(self.pcm):
+                raise SimulationFinished()
+            chunk = self.pcm[self.cursor:self.cursor + n_bytes]
+            self.cursor += n_bytes
+        if self.realtime:
+            time.sleep(n_frames / RATE)
+        # Pad the final chunk so callers always get a full buffer
+        return chunk.ljust(n_bytes, b"\x00")
+
+
+class SimulatedInputStream:
+    """The subset of pyaudio.Stream used by the capture code."""
+
+    def __init__(self, source, start=True):
+        self.source = source
+        self._active = start
+
+    def read(self, num_frames, exception_on_overflow=True):
+        return self.source.read(num_frames)
+
+    def start_stream(self):
+        self._active = True
+
+    def stop_stream(self):
+        self._active = False
+
+    def is_active(self):
+        return self._active
+
+    def close(self):
+        self._active = False
+
+
+class SimulatedPyAudio:
+    """The subset of pyaudio.PyAudio used by the capture code (one fake input device)."""
+
+    DEVICE_INFO = {"index": 0, "name": "simulated microphone", "maxInputChannels": 1}
+
+    def __init__(self, source):
+        self.source = source
+
+    def get_device_count(self):
+        return 1
+
+    def get_device_info_by_index(self, index):
+        return dict(self.DEVICE_INFO)
+
+    def is_format_supported(self, **kwargs):
+        return True
+
+    def open(self, start=True, **kwargs):
+        return SimulatedInputStream(self.source, start=start)
+
+    def terminate(self):
+        pass
+
+
+class RecordedPlayback:
+    """Keeps everything the assistant "plays" in memory instead of on a speaker."""
+
+    def __init__(self):
+        self.clips = []  # list of (label, wav_bytes, duration_seconds)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _duration(audio):
+        try:
+            with wave.open(io.BytesIO(audio), "rb") as wf:
+                return wf.getnframes() / float(wf.getframerate())
+        except (wave.Error, EOFError):
+            return 0.0
+
+    def play_bytes(self, audio, label="response"):
+        with self._lock:
+            self.clips.append((label, audio, self._duration(audio)))
+        return True
+
+    def play_file(self, filepath):
+        with open(filepath, "rb") as f:
+            return self.play_bytes(f.read(), label=filepath)
+
+    @property
+    def seconds_played(self):
+        return sum(duration for _label, _audio, duration in self.clips)
+
+
+class AudioSimulator:
+    """Scripted microphone + recording speaker, installed via sim.audio_backend."""
+
+    def __init__(self, source, playback=None):
+        self.source = source
+        self.playback = playback or RecordedPlayback()
+
+    @classmethod
+    def from_wavs(cls, paths, gap=3.0, realtime=False):
+        return cls(ScriptedAudioSource.from_wavs(paths, gap=gap, realtime=realtime))
+
+    def pyaudio(self):
+        return SimulatedPyAudio(self.source)
+
+    def play_file(self, filepath):
+        return self.playback.play_file(filepath)
+
+    def play_bytes(self, audio):
+        return self.playback.play_bytes(audio)
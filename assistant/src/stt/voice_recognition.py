@@ -3,6 +3,7 @@ import wave
 import webrtcvad
 import collections
 import subprocess
+import threading
 import uuid
 import os
 import sys
@@ -26,6 +27,8 @@ except ImportError:
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from session.websocket import create_ui_logger
+from utils.flight_recorder import flight_recorder
+from sim.audio_backend import create_pyaudio, get_simulator
 
 # Create UI logger for this module
 ui_logger = create_ui_logger("VoiceRecognition")
@@ -99,6 +102,11 @@ def find_working_input_device(p):
 # === PLAY WAV FILE (PipeWire/PulseAudio compatible) ===
 def play_wav_file(filepath):
     """Play a WAV file using the best available method for the system."""
+
+    # Headless simulation: record instead of playing
+    simulator = get_simulator()
+    if simulator is not None:
+        return simulator.play_file(filepath)
     
     # Method 1: Try paplay (PulseAudio/PipeWire command line) - MOST RELIABLE on modern Linux
     try:
@@ -162,68 +170,155 @@ def play_beep(path=BEEP_PATH):
     if not play_wav_file(path):
         print(f"⚠️ Beep sound failed: No audio playback method available")
 
-# === RECORD AUDIO USING VAD ===
-def vad_record(audio_temp_path):
-    debug("Setting up VAD and PyAudio")
-    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
-    p = pyaudio.PyAudio()
+# === CAPTURE SESSION (keeps the audio stack open across attempts) ===
+class RecognitionSession:
+    """
+    Holds one PyAudio instance and input stream open across recognition attempts.
 
-    # Find a working input device
-    device_index = find_working_input_device(p)
-    
-    if device_index is not None:
-        device_info = p.get_device_info_by_index(device_index)
-        debug(f"Using audio device [{device_index}]: {device_info['name']}")
-    else:
-        debug("Using default audio device")
+    Creating PyAudio, probing devices and opening the stream is the expensive part
+    of a recording; between attempts the stream is only stopped, so a retry costs a
+    `start_stream()` instead of a full audio stack setup. Use as a context manager.
+    """
 
-    stream = p.open(format=FORMAT,
-                    channels=CHANNELS,
-                    rate=RATE,
-                    input=True,
-                    input_device_index=device_index,
-                    frames_per_buffer=CHUNK)
-
-    frames = []
-    ring_buffer = collections.deque(maxlen=MAX_SILENCE_FRAMES)
-    triggered = False
-    debug("Listening started. Waiting for speech...")
-
-    while True:
-        data = stream.read(CHUNK, exception_on_overflow=False)
-        is_speech = vad.is_speech(data, RATE)
-
-        if not triggered:
-            ring_buffer.append((data, is_speech))
-            num_voiced = len([f for f, speech in ring_buffer if speech])
-            if num_voiced > 0.8 * ring_buffer.maxlen:
-                debug("Speech detected! Starting to record...")
-                triggered = True
-                frames.extend([f for f, s in ring_buffer])
-                ring_buffer.clear()
+    def __init__(self):
+        self.vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+        self.p = None
+        self.stream = None
+        # A cancelled attempt may still be finishing its last read in a worker thread
+        self._lock = threading.Lock()
+
+    def open(self):
+        if self.stream is not None:
+            return
+        debug("Setting up VAD and PyAudio")
+        self.p = create_pyaudio()
+
+        # Find a working input device
+        device_index = find_working_input_device(self.p)
+
+        if device_index is not None:
+            device_info = self.p.get_device_info_by_index(device_index)
+            debug(f"Using audio device [{device_index}]: {device_info['name']}")
         else:
-            frames.append(data)
-            ring_buffer.append((data, is_speech))
-            num_unvoiced = len([f for f, speech in ring_buffer if not speech])
-            if num_unvoiced > 0.9 * ring_buffer.maxlen:
-                debug("Silence detected. Ending recording...")
-                break
-
-    stream.stop_stream()
-    stream.close()
-    p.terminate()
-    debug(f"Saving audio to {audio_temp_path}")
-
-    wf = wave.open(audio_temp_path, 'wb')
-    wf.setnchannels(CHANNELS)
-    wf.setsampwidth(p.get_sample_size(FORMAT))
-    wf.setframerate(RATE)
-    wf.writeframes(b''.join(frames))
-    wf.close()
-    debug("Audio saved successfully")
+            debug("Using default audio device")
+
+        self.stream = self.p.open(format=FORMAT,
+                                  channels=CHANNELS,
+                                  rate=RATE,
+                                  input=True,
+                                  input_device_index=device_index,
+                                  frames_per_buffer=CHUNK,
+                                  start=False)
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self.stream is not None:
+            try:
+                if self.stream.is_active():
+                    self.stream.stop_stream()
+                self.stream.close()
+            except OSError:
+                pass
+            self.stream = None
+        if self.p is not None:
+            self.p.terminate()
+            self.p = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def record(self, audio_temp_path, start_event=None, cancel_event=None):
+        """
+        Record a single utterance to audio_temp_path.
+
+        :param start_event: Optional threading.Event. The stream is started straight
+            away, but frames read before the event is set are discarded (e.g. while
+            the beep is still playing).
+        :param cancel_event: Optional threading.Event. When set, recording stops and
+            False is returned without writing the file.
+        :return: True if an utterance was saved, False if cancelled.
+        """
+        with self._lock:
+            return self._record(audio_temp_path, start_event, cancel_event)
+
+    def _record(self, audio_temp_path, start_event, cancel_event):
+        self.open()
+        # Stopped between attempts so prompts played in the meantime aren't buffered
+        self.stream.start_stream()
+
+        frames = []
+        ring_buffer = collections.deque(maxlen=MAX_SILENCE_FRAMES)
+        triggered = False
+        debug("Listening started. Waiting for speech...")
+
+        if start_event is not None and get_simulator() is not None:
+            # A simulated microphone runs faster than real time and would race
+            # through the script while the beep plays, so wait instead of discarding
+            while not start_event.wait(0.05):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+
+        cancelled = False
+        try:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    debug("Recording cancelled")
+                    cancelled = True
+                    break
+
+                data = self.stream.read(CHUNK, exception_on_overflow=False)
+                if start_event is not None and not start_event.is_set():
+                    continue  # Stream is warm, but we're not listening yet
+                is_speech = self.vad.is_speech(data, RATE)
+
+                if not triggered:
+                    ring_buffer.append((data, is_speech))
+                    num_voiced = len([f for f, speech in ring_buffer if speech])
+                    if num_voiced > 0.8 * ring_buffer.maxlen:
+                        debug("Speech detected! Starting to record...")
+                        flight_recorder.mark("speech_start")
+                        triggered = True
+                        frames.extend([f for f, s in ring_buffer])
+                        ring_buffer.clear()
+                else:
+                    frames.append(data)
+                    ring_buffer.append((data, is_speech))
+                    num_unvoiced = len([f for f, speech in ring_buffer if not speech])
+                    if num_unvoiced > 0.9 * ring_buffer.maxlen:
+                        debug("Silence detected. Ending recording...")
+                        flight_recorder.mark("speech_end")
+                        break
+        finally:
+            if self.stream is not None and self.stream.is_active():
+                self.stream.stop_stream()
+
+        if cancelled:
+            return False
+        debug(f"Saving audio to {audio_temp_path}")
+
+        wf = wave.open(audio_temp_path, 'wb')
+        wf.setnchannels(CHANNELS)
+        wf.setsampwidth(pyaudio.get_sample_size(FORMAT))
+        wf.setframerate(RATE)
+        wf.writeframes(b''.join(frames))
+        wf.close()
+        debug("Audio saved successfully")
+        return True
+
+# === RECORD AUDIO USING VAD ===
+def vad_record(audio_temp_path, start_event=None, cancel_event=None):
+    """One-shot recording (opens and closes the audio stack). See RecognitionSession.record."""
+    with RecognitionSession() as session:
+        return session.record(audio_temp_path, start_event, cancel_event)
 
 # === RECOGNIZE USING WHISPER.CLI ===
-def recognize_with_whisper_cpp(audio_path, model_path=MODEL_PATH):
+def recognize_with_whisper_cpp(audio_path, model_path=MODEL_PATH, timeout=None, threads=None):
     debug(f"Running whisper-cli with model {model_path} on file {audio_path}")
     
     output_txt_path = audio_path + ".txt"
@@ -236,9 +331,11 @@ def recognize_with_whisper_cpp(audio_path, model_path=MODEL_PATH):
         "-l", "en", # Language
         "-nt"      # No timestamps
     ]
+    if threads:
+        command += ["-t", str(threads)]  # CPU threads for this transcription
 
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = subprocess.run(command, capture_output=True, text=True, check=True, timeout=timeout)
         debug("Transcription completed by whisper-cli")
 
         if os.path.exists(output_txt_path):
@@ -255,11 +352,24 @@ def recognize_with_whisper_cpp(audio_path, model_path=MODEL_PATH):
         print(e.stdout)
         print(e.stderr)
         return None
+    except subprocess.TimeoutExpired:
+        print(f"❌ whisper-cli timed out after {timeout}s")
+        if os.path.exists(output_txt_path):
+            os.remove(output_txt_path)
+        return None
+
+# === TEMP FILE HELPERS ===
+def new_temp_audio_path():
+    return os.path.join(AUDIO_TEMP_DIR, f"temp_{uuid.uuid4().hex}.wav")
+
+def remove_temp_audio(audio_temp_path):
+    if os.path.exists(audio_temp_path):
+        os.remove(audio_temp_path)
+        debug("Temporary audio file removed")
 
 # === MAIN FUNCTION TO RECORD AND RECOGNIZE ===
 def recognize_speech():
-    audio_temp_filename = f"temp_{uuid.uuid4().hex}.wav"
-    audio_temp_path = os.path.join(AUDIO_TEMP_DIR, audio_temp_filename)
+    audio_temp_path = new_temp_audio_path()
     debug("=== Speech recognition started ===")
 
     try:
@@ -279,9 +389,7 @@ def recognize_speech():
         print(f"⚠️ Error during recognition: {e}")
         return None
     finally:
-        if os.path.exists(audio_temp_path):
-            os.remove(audio_temp_path)
-            debug("Temporary audio file removed")
+        remove_temp_audio(audio_temp_path)
 
 # # === TEST MAIN FUNCTION ===
 # def main():
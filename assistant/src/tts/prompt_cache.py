@@ -0,0 +1,57 @@
+# tts/prompt_cache.py
+import os
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tts.text_to_speech import tts_router
+
+
+class PromptCache:
+    """
+    In-memory WAV cache for fixed prompts ("I couldn't hear you...").
+
+    Prompts rendered by the local fallback engine are kept only until the router
+    would send them to Coqui again (breaker closed and latency back in budget,
+    or a probe is due), then re-rendered in the background on next use.
+    """
+
+    def __init__(self, router=tts_router):
+        self.router = router
+        self._entries = {}  # text -> (wav_bytes, engine)
+        self._lock = threading.Lock()
+
+    def _render(self, text):
+        audio, engine = self.router.synthesize(text)
+        if audio is not None:
+            with self._lock:
+                self._entries[text] = (audio, engine)
+        return audio
+
+    def prerender(self, texts):
+        """Render prompts in a background thread."""
+        def run():
+            for text in texts:
+                try:
+                    self._render(text)
+                except Exception as e:
+                    print(f"[PromptCache] failed to render '{text}': {e}")
+
+        threading.Thread(target=run, name="prompt-cache", daemon=True).start()
+
+    def get(self, text):
+        """Return WAV bytes for text, rendering (and caching) it on a miss."""
+        with self._lock:
+            entry = self._entries.get(text)
+        if entry is None:
+            return self._render(text)
+
+        audio, engine = entry
+        if engine == "local" and self.router.would_use_coqui(text):
+            self.prerender([text])
+        return audio
+
+
+# Shared prompt cache
+prompt_cache = PromptCache()
@@ -1,7 +1,11 @@
 import sys
 import os
 import requests
+import shutil
 import subprocess
+import threading
+import time
+import uuid
 import wave
 import numpy as np
 
@@ -19,9 +23,32 @@ try:
 except ImportError:
     SIMPLEAUDIO_AVAILABLE = False
 
+# Add parent directory and project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from utils.circuit_breaker import CircuitBreaker
+from sim.audio_backend import get_simulator
+from shared.http_client import EndpointPolicy, http_client
+
 # TTS API server URL
 TTS_API_URL = "http://localhost:5002/api/tts"
 
+# === TTS ROUTING SETTINGS ===
+# Coqui is allowed TTS_LATENCY_BUDGET seconds plus TTS_LATENCY_PER_CHAR per character
+# before a synthesis counts as "slow". Slow or failed calls trip the circuit breaker.
+TTS_LATENCY_BUDGET = float(os.environ.get("ELISA_TTS_LATENCY_BUDGET", "1.5"))
+TTS_LATENCY_PER_CHAR = float(os.environ.get("ELISA_TTS_LATENCY_PER_CHAR", "0.02"))
+TTS_HARD_TIMEOUT = float(os.environ.get("ELISA_TTS_TIMEOUT", "15"))
+TTS_RECOVERY_TIMEOUT = float(os.environ.get("ELISA_TTS_RECOVERY_TIMEOUT", "30"))
+SHORT_PROMPT_CHARS = 60  # retries, confirmations, etc.
+# While short prompts are routed locally, one of them is still sent to Coqui this
+# often (seconds), so the latency average can recover
+TTS_PROBE_INTERVAL = float(os.environ.get("ELISA_TTS_PROBE_INTERVAL", "30"))
+ESPEAK_VOICE = os.environ.get("ELISA_ESPEAK_VOICE", "en-us")
+
+# No retries: the router falls back to the local engine instead
+http_client.register("coqui_tts", EndpointPolicy(connect_timeout=2, read_timeout=TTS_HARD_TIMEOUT))
+
 # Get project root directory
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # assistant/
 PROJECT_ROOT = os.path.dirname(BASE_DIR)  # elisa-assistant/
@@ -29,6 +56,11 @@ PROJECT_ROOT = os.path.dirname(BASE_DIR)  # elisa-assistant/
 
 def play_wav_file(filepath):
     """Play a WAV file using the best available method for the system."""
+
+    # Headless simulation: record instead of playing
+    simulator = get_simulator()
+    if simulator is not None:
+        return simulator.play_file(filepath)
     
     # Method 1: Try paplay (PulseAudio/PipeWire command line) - MOST RELIABLE on modern Linux
     try:
@@ -88,6 +120,167 @@ def play_wav_file(filepath):
     return False
 
 
+# === LOCAL FALLBACK ENGINE (espeak-ng) ===
+def find_local_engine():
+    """Return the path of a local espeak binary, or None if not installed."""
+    for binary in ("espeak-ng", "espeak"):
+        path = shutil.which(binary)
+        if path:
+            return path
+    return None
+
+
+def synthesize_local(text):
+    """Synthesize text with espeak-ng and return WAV bytes (or None)."""
+    engine = find_local_engine()
+    if engine is None:
+        return None
+    try:
+        result = subprocess.run(
+            [engine, "-v", ESPEAK_VOICE, "--stdout", text],
+            capture_output=True,
+            timeout=10
+        )
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+        print(f"Local TTS failed: {result.stderr.decode(errors='ignore').strip()}")
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"Local TTS failed: {e}")
+    return None
+
+
+# === LATENCY-AWARE ROUTER ===
+class TTSRouter:
+    """
+    Routes synthesis between Coqui (high quality) and espeak-ng (fast, local).
+
+    Coqui latency is tracked as an exponentially weighted moving average. Calls
+    that fail or blow the latency budget count as breaker failures; while the
+    breaker is open every request goes to the local engine, and after
+    TTS_RECOVERY_TIMEOUT one trial request is sent to Coqui again.
+    Short prompts are routed locally as soon as Coqui is known to be slow, so
+    retries and confirmations stay responsive under TTS load.
+    """
+
+    def __init__(self, api_url=TTS_API_URL):
+        self.api_url = api_url
+        self.breaker = CircuitBreaker("coqui-tts", failure_threshold=2,
+                                      recovery_timeout=TTS_RECOVERY_TIMEOUT)
+        self.latency_ewma = None  # seconds per request, Coqui only
+        self.last_coqui_at = None  # monotonic time of the last Coqui request
+        self.stats = {"coqui": 0, "local": 0, "coqui_errors": 0, "coqui_slow": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def budget_for(text):
+        return TTS_LATENCY_BUDGET + TTS_LATENCY_PER_CHAR * len(text)
+
+    def _record_latency(self, elapsed):
+        with self._lock:
+            if self.latency_ewma is None:
+                self.latency_ewma = elapsed
+            else:
+                self.latency_ewma = 0.7 * self.latency_ewma + 0.3 * elapsed
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _prefer_local(self, text):
+        """
+        Short prompts skip Coqui while its recent latency is over budget, except
+        for one probe every TTS_PROBE_INTERVAL seconds to refresh the average.
+        """
+        with self._lock:
+            probe_due = self.last_coqui_at is None or time.monotonic() - self.last_coqui_at >= TTS_PROBE_INTERVAL
+        return (
+            len(text) <= SHORT_PROMPT_CHARS
+            and self.latency_ewma is not None
+            and self.latency_ewma > self.budget_for(text)
+            and self.breaker.state == CircuitBreaker.CLOSED
+            and not probe_due
+        )
+
+    def would_use_coqui(self, text):
+        """True if synthesize(text) would try Coqui right now."""
+        return self.breaker.state == CircuitBreaker.CLOSED and not self._prefer_local(text)
+
+    def _synthesize_coqui(self, text):
+        budget = self.budget_for(text)
+        start = time.monotonic()
+        with self._lock:
+            self.last_coqui_at = start
+        try:
+            res = http_client.post("coqui_tts", self.api_url, data={"text": text})
+            res.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self._record_latency(time.monotonic() - start)
+            self._count("coqui_errors")
+            self.breaker.record_failure()
+            print(f"Error communicating with TTS server: {e}")
+            return None
+
+        elapsed = time.monotonic() - start
+        self._record_latency(elapsed)
+        if elapsed > budget:
+            # The audio is still usable, but Coqui is degrading
+            self._count("coqui_slow")
+            self.breaker.record_failure()
+            print(f"TTS server slow: {elapsed:.2f}s (budget {budget:.2f}s)")
+        else:
+            self.breaker.record_success()
+        return res.content
+
+    def synthesize(self, text):
+        """
+        Synthesize text with the best available engine.
+
+        :return: Tuple of (wav_bytes or None, engine name).
+        """
+        have_local = find_local_engine() is not None
+
+        if not have_local or (not self._prefer_local(text) and self.breaker.allow_request()):
+            audio = self._synthesize_coqui(text)
+            if audio is not None:
+                self._count("coqui")
+                return audio, "coqui"
+            if not have_local:
+                return None, "coqui"
+
+        audio = synthesize_local(text)
+        if audio is not None:
+            self._count("local")
+        return audio, "local"
+
+
+# Shared router instance
+tts_router = TTSRouter()
+
+
+def synthesize_speech(text):
+    """Return WAV bytes for text using the latency-aware router (None on failure)."""
+    audio, _engine = tts_router.synthesize(text)
+    return audio
+
+
+def play_wav_bytes(audio):
+    """Play in-memory WAV bytes through a private temp file (safe to overlap with synthesis)."""
+    simulator = get_simulator()
+    if simulator is not None:
+        return simulator.play_bytes(audio)
+
+    output_dir = os.path.join(PROJECT_ROOT, 'shared', 'audio', 'temporary')
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f"response_{uuid.uuid4().hex}.wav")
+    try:
+        with open(output_file, 'wb') as f:
+            f.write(audio)
+        return play_wav_file(output_file)
+    finally:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+
 def speak_response(response):
     # Create the directory if it doesn't exist
     output_dir = os.path.join(PROJECT_ROOT, 'shared', 'audio', 'temporary')
@@ -96,25 +289,19 @@ def speak_response(response):
     # Set the full path to the output file
     output_file = os.path.join(output_dir, "response.wav")
 
-    # Prepare the request payload
-    data = {
-        "text": response
-    }
-
     try:
-        # Send POST request to the TTS server
-        res = requests.post(TTS_API_URL, data=data)
-        res.raise_for_status()
+        audio, engine = tts_router.synthesize(response)
+        if audio is None:
+            print("⚠️ No TTS engine could synthesize the response")
+            return
 
         # Save the audio content to file
         with open(output_file, 'wb') as f:
-            f.write(res.content)
+            f.write(audio)
 
         # Play the generated speech using best available method
         play_wav_file(output_file)
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error communicating with TTS server: {e}")
     except Exception as e:
         print(f"An error occurred: {e}")
 
@@ -0,0 +1,188 @@
+# utils/flight_recorder.py
+import collections
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+# === CONFIGURABLE SETTINGS ===
+TURN_BUDGET = float(os.environ.get("ELISA_TURN_BUDGET", "6.0"))  # seconds, wake/listen -> turn end, greeting excluded
+GREETING_BUDGET = float(os.environ.get("ELISA_GREETING_BUDGET", "4.0"))  # seconds, wake -> greeting done
+RING_SIZE = int(os.environ.get("ELISA_FLIGHT_RECORDER_SIZE", "200"))
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # assistant/
+PROJECT_ROOT = os.path.dirname(BASE_DIR)  # elisa-assistant/
+DUMP_PATH = os.path.join(PROJECT_ROOT, "logs", "slow_turns.jsonl")
+
+# Stage boundaries, roughly in pipeline order. A turn starts either at
+# wake_detected or, for follow-up commands in the same conversation, at listen_start.
+# tts_done is when the first response is fully synthesized (Coqui returns whole
+# files, so there is no earlier "first byte").
+STAGES = (
+    "wake_detected",
+    "listen_start",
+    "greeting_done",
+    "beep_done",
+    "speech_start",
+    "speech_end",
+    "stt_done",
+    "nlu_done",
+    "tts_done",
+    "first_audio_out",
+    "turn_end",
+)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TurnRecord:
+    def __init__(self, turn_id):
+        self.turn_id = turn_id
+        self.started_at = datetime.now().isoformat()
+        self.marks = {}  # stage -> time.monotonic()
+
+    def stage_durations(self):
+        """Seconds spent reaching each stage from the previous recorded one."""
+        present = sorted(self.marks.items(), key=lambda item: item[1])
+        return {
+            stage: t - prev_t
+            for (_prev, prev_t), (stage, t) in zip(present, present[1:])
+        }
+
+    def greeting(self):
+        """Seconds from the start of the turn to the end of the greeting (0 without one)."""
+        if "greeting_done" not in self.marks:
+            return 0.0
+        return self.marks["greeting_done"] - min(self.marks.values())
+
+    def total(self):
+        """Turn time without the greeting, which is budgeted and reported separately."""
+        if not self.marks:
+            return 0.0
+        return max(self.marks.values()) - min(self.marks.values()) - self.greeting()
+
+    def to_dict(self):
+        return {
+            "turn_id": self.turn_id,
+            "started_at": self.started_at,
+            "total": round(self.total(), 4),
+            "greeting": round(self.greeting(), 4),
+            "stages": {k: round(v, 4) for k, v in self.stage_durations().items()},
+        }
+
+
+class FlightRecorder:
+    """
+    Keeps monotonic stage timestamps for the last RING_SIZE turns in memory.
+
+    Any module may call `mark(stage)`; only the first mark of a stage per turn is
+    kept. Turns slower than the budget (not counting the greeting), or with a
+    greeting slower than its own budget, are dumped to the console and to
+    logs/slow_turns.jsonl automatically.
+    """
+
+    def __init__(self, capacity=RING_SIZE, budget=TURN_BUDGET, dump_path=DUMP_PATH,
+                 greeting_budget=GREETING_BUDGET):
+        self.budget = budget
+        self.greeting_budget = greeting_budget
+        self.dump_path = dump_path
+        self.turns = collections.deque(maxlen=capacity)
+        self.current = None
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start_turn(self, stage="listen_start"):
+        """Begin a new turn (closing any unfinished one) and mark its first stage."""
+        with self._lock:
+            if self.current is not None:
+                self._finish_locked()
+            self.current = TurnRecord(self._next_id)
+            self._next_id += 1
+            self.current.marks[stage] = time.monotonic()
+
+    def ensure_turn(self, stage="listen_start"):
+        """Mark stage on the current turn, or start a new turn with it."""
+        with self._lock:
+            if self.current is not None:
+                self.current.marks.setdefault(stage, time.monotonic())
+                return
+        self.start_turn(stage)
+
+    def mark(self, stage):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown flight recorder stage: {stage}")
+        with self._lock:
+            if self.current is not None and stage not in self.current.marks:
+                self.current.marks[stage] = time.monotonic()
+
+    def end_turn(self):
+        with self._lock:
+            if self.current is None:
+                return None
+            self.current.marks.setdefault("turn_end", time.monotonic())
+            return self._finish_locked()
+
+    def _finish_locked(self):
+        record = self.current
+        self.current = None
+        self.turns.append(record)
+        if record.total() > self.budget or record.greeting() > self.greeting_budget:
+            self._dump(record)
+        return record
+
+    def _dump(self, record):
+        data = record.to_dict()
+        print(f"🐢 Turn {record.turn_id} took {data['total']:.2f}s (budget {self.budget:.2f}s), "
+              f"greeting {data['greeting']:.2f}s (budget {self.greeting_budget:.2f}s)")
+        for stage, seconds in data["stages"].items():
+            print(f"    {stage:<16} +{seconds * 1000:8.1f} ms")
+        try:
+            os.makedirs(os.path.dirname(self.dump_path), exist_ok=True)
+            with open(self.dump_path, "a") as f:
+                f.write(json.dumps(data) + "\n")
+        except OSError as e:
+            print(f"Failed to write flight recorder dump: {e}")
+
+    def summary(self, last_n=50):
+        """Per-stage p50/p95 (seconds) over the last N completed turns."""
+        with self._lock:
+            turns = list(self.turns)[-last_n:]
+        per_stage = collections.defaultdict(list)
+        totals = []
+        for record in turns:
+            for stage, seconds in record.stage_durations().items():
+                per_stage[stage].append(seconds)
+            totals.append(record.total())
+
+        result = {}
+        for stage in STAGES:
+            values = per_stage.get(stage)
+            if values:
+                result[stage] = {"count": len(values), "p50": percentile(values, 50),
+                                 "p95": percentile(values, 95)}
+        if totals:
+            result["total"] = {"count": len(totals), "p50": percentile(totals, 50),
+                               "p95": percentile(totals, 95)}
+        return result
+
+    def print_summary(self, last_n=50):
+        summary = self.summary(last_n)
+        if not summary:
+            print("No turns recorded yet.")
+            return summary
+        print(f"=== Turn latency over last {last_n} turns ===")
+        print(f"{'stage':<16} {'n':>4} {'p50 ms':>10} {'p95 ms':>10}")
+        for stage, stats in summary.items():
+            print(f"{stage:<16} {stats['count']:>4} {stats['p50'] * 1000:>10.1f} {stats['p95'] * 1000:>10.1f}")
+        return summary
+
+
+# Global recorder shared by all pipeline modules
+flight_recorder = FlightRecorder()
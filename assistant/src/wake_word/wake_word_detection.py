@@ -1,11 +1,16 @@
-import openwakeword
-from openwakeword.model import Model
-
 import pyaudio
 import numpy as np
+import os
+import sys
+import threading
 import time
 import warnings
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.flight_recorder import flight_recorder
+from sim.audio_backend import create_pyaudio, audio_clock
+
 # Suppress ALSA warnings
 warnings.filterwarnings("ignore")
 
@@ -15,13 +20,30 @@ CHANNELS = 1
 FORMAT = pyaudio.paInt16
 CHUNK = 3200  # frames per buffer for wake word detection
 
-# One-time download of all pre-trained models (or only select models)
-openwakeword.utils.download_models()
+WAKE_WORD = "alexa"  # Use 'alexa' as the wake word
+
+# The model is loaded lazily (see load_model) so importing this module stays cheap
+# and startup can load it in parallel with the service warm-up.
+model = None
+_model_lock = threading.Lock()
+
+
+def load_model():
+    """Download (first run only) and instantiate the wake word model once."""
+    global model
+    with _model_lock:
+        if model is None:
+            # openwakeword pulls in onnxruntime, so import it here rather than at module load
+            import openwakeword
+            import openwakeword.utils
+            from openwakeword.model import Model
 
-# Instantiate the model with specific wake word
-model = Model(
-    wakeword_models=["alexa"],  # Use 'alexa' as the wake word
-)
+            # One-time download of all pre-trained models (or only select models)
+            openwakeword.utils.download_models()
+            model = Model(
+                wakeword_models=[WAKE_WORD],
+            )
+    return model
 
 
 def find_working_input_device(p):
@@ -67,6 +89,7 @@ def find_working_input_device(p):
 
 def listen_for_wake_word(callback):
     print("Initializing wake word detection with open wake word...")
+    model = load_model()
     last_trigger_time = 0
     cooldown_seconds = 3.0  # Increased cooldown to prevent re-triggering from TTS audio
 
@@ -75,7 +98,7 @@ def listen_for_wake_word(callback):
         stream = None
         
         try:
-            p = pyaudio.PyAudio()
+            p = create_pyaudio()
 
             # Try to find a working device
             device_index = find_working_input_device(p)
@@ -117,16 +140,17 @@ def listen_for_wake_word(callback):
                 frame = np.frombuffer(data, dtype=np.int16)
                 prediction = model.predict(frame)
                 
-                score = prediction.get('alexa', 0)
+                score = prediction.get(WAKE_WORD, 0)
                 
                 # Debug: Show scores above a minimum threshold
                 if score > 0.3:
                     print(f"  [Wake word score: {score:.2f}]", end="\r")
 
-                current_time = time.time()
+                current_time = audio_clock()
                 # Using higher threshold (0.8) to reduce false positives
                 if score > 0.8 and (current_time - last_trigger_time > cooldown_seconds):
                     print(f"\nWake word detected! (score: {score:.2f})")
+                    flight_recorder.start_turn("wake_detected")
                     last_trigger_time = current_time
 
                     # Flush buffer by reading frames before stopping the stream
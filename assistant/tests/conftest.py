@@ -0,0 +1,11 @@
+# assistant/tests/conftest.py
+#
+# Run from assistant/:  python -m pytest tests
+import os
+import sys
+
+# Add assistant/src and the project root to path for imports, like the assistant does
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SRC_DIR))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,166 @@
+# assistant/tests/test_circuit_breaker.py
+import pytest
+import requests
+
+from tts import text_to_speech
+from tts.text_to_speech import TTSRouter
+from utils import circuit_breaker
+from utils.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    monkeypatch.setattr(text_to_speech, "time", clock)
+    return clock
+
+
+# === CIRCUIT BREAKER ===
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.advance(29)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.advance(1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # the trial is still in flight
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_failure()  # one failure is enough in half-open
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    clock.advance(30)
+    assert breaker.allow_request()
+
+
+def test_successful_trial_closes(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request() and breaker.allow_request()
+
+
+def test_reset_closes(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.reset()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+# === TTS ROUTER ===
+class FakeCoqui:
+    """Stands in for http_client: each call takes `latency` seconds on the fake clock, or fails."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.latency = 0.1
+        self.fail = False
+        self.calls = []
+
+    def post(self, endpoint, url, data=None, **kwargs):
+        self.calls.append(data["text"])
+        self.clock.advance(self.latency)
+        if self.fail:
+            raise requests.exceptions.ConnectionError("coqui down")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"coqui"
+        return response
+
+
+@pytest.fixture
+def coqui(monkeypatch, clock):
+    coqui = FakeCoqui(clock)
+    monkeypatch.setattr(text_to_speech, "http_client", coqui)
+    monkeypatch.setattr(text_to_speech, "find_local_engine", lambda: "/usr/bin/espeak-ng")
+    monkeypatch.setattr(text_to_speech, "synthesize_local", lambda text: b"local")
+    monkeypatch.setattr(text_to_speech, "TTS_RECOVERY_TIMEOUT", 30)
+    monkeypatch.setattr(text_to_speech, "TTS_PROBE_INTERVAL", 30)
+    return coqui
+
+
+def test_router_uses_coqui_when_healthy(coqui):
+    router = TTSRouter()
+    assert router.synthesize("Hello there.") == (b"coqui", "coqui")
+    assert router.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_router_falls_back_while_breaker_is_open(coqui, clock):
+    router = TTSRouter()
+    coqui.fail = True
+    assert router.synthesize("first") == (b"local", "local")
+    assert router.synthesize("second") == (b"local", "local")
+    assert router.breaker.state == CircuitBreaker.OPEN
+
+    coqui.fail = False
+    assert router.synthesize("third") == (b"local", "local")
+    assert coqui.calls == ["first", "second"]  # Coqui is not tried while open
+
+    clock.advance(30)
+    assert router.synthesize("fourth") == (b"coqui", "coqui")  # trial request closes the breaker
+    assert router.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_slow_calls_count_as_failures(coqui):
+    router = TTSRouter()
+    coqui.latency = 10
+    long_text = "This answer is long enough that it is never treated as a short prompt. " * 2
+    assert router.synthesize(long_text) == (b"coqui", "coqui")  # still usable audio
+    router.synthesize(long_text)
+    assert router.breaker.state == CircuitBreaker.OPEN
+    assert router.stats["coqui_slow"] == 2
+
+
+def test_short_prompts_go_local_while_slow_and_probe_periodically(coqui, clock):
+    router = TTSRouter()
+    coqui.latency = 3.0  # over the short-prompt budget, one slow call leaves the breaker closed
+    router.synthesize("Sorry?")
+    assert router.breaker.state == CircuitBreaker.CLOSED
+    assert router.synthesize("Sorry?") == (b"local", "local")
+    assert not router.would_use_coqui("Sorry?")
+
+    clock.advance(30)
+    coqui.latency = 0.1
+    assert router.would_use_coqui("Sorry?")
+    assert router.synthesize("Sorry?") == (b"coqui", "coqui")  # probe refreshes the average
+    assert router.latency_ewma < 3.0
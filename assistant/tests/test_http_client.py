@@ -0,0 +1,84 @@
+# assistant/tests/test_http_client.py
+import socket
+import threading
+
+import pytest
+import requests
+
+from shared.http_client import EndpointPolicy, HttpClient, is_connect_error
+
+
+class DroppingServer:
+    """Reads each request completely, then closes the connection without answering."""
+
+    def __init__(self):
+        self.requests = 0
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.url = "http://127.0.0.1:%d/process" % self.sock.getsockname()[1]
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                data = b""
+                while b"\r\n\r\n" not in data:
+                    data += conn.recv(4096)
+                head, _, body = data.partition(b"\r\n\r\n")
+                length = next((int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                               if line.lower().startswith(b"content-length:")), 0)
+                while len(body) < length:
+                    body += conn.recv(4096)
+                self.requests += 1
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def dropping_server():
+    server = DroppingServer()
+    yield server
+    server.close()
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return "http://127.0.0.1:%d/" % sock.getsockname()[1]
+
+
+def client(idempotent):
+    return HttpClient(endpoints={"ep": EndpointPolicy(connect_timeout=1, read_timeout=2, retries=2,
+                                                      idempotent=idempotent, backoff=0.01)})
+
+
+def test_dropped_request_is_not_replayed_for_non_idempotent_endpoint(dropping_server):
+    http = client(idempotent=False)
+    with pytest.raises(requests.exceptions.ConnectionError) as raised:
+        http.post("ep", dropping_server.url, json={"action": "TYPE_TEXT", "data": "hello"})
+    assert not is_connect_error(raised.value)
+    assert dropping_server.requests == 1
+    assert http.metrics()["ep"]["retries"] == 0
+
+
+def test_dropped_request_is_retried_for_idempotent_endpoint(dropping_server):
+    http = client(idempotent=True)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http.get("ep", dropping_server.url)
+    assert dropping_server.requests == 3
+    assert http.metrics()["ep"]["retries"] == 2
+
+
+@pytest.mark.parametrize("idempotent", [False, True])
+def test_refused_connection_is_retried(idempotent):
+    http = client(idempotent)
+    with pytest.raises(requests.exceptions.ConnectionError) as raised:
+        http.post("ep", closed_port_url(), json={})
+    assert is_connect_error(raised.value)
+    assert http.metrics()["ep"] == {**http.metrics()["ep"], "calls": 1, "failures": 1, "retries": 2}
@@ -0,0 +1,117 @@
+# benchmarks/bench_task_match.py
+#
+# Fuzzy reminder lookup: difflib.get_close_matches over every task name (the old
+# remove/update path) against the trigram index in services/task_matcher.py.
+#
+#   cd logic/src
+#   python -m benchmarks.bench_task_match --reminders 10000 --queries 300
+#
+# Task names are generated from a fixed word list (seeded). Queries are existing
+# names with a typo or a dropped word, plus names that match nothing. Reports
+# latency for both and how often the index returns the same match as difflib.
+import argparse
+import difflib
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add logic/src/ to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.task_matcher import TrigramIndex
+
+VERBS = ["call", "pay", "buy", "email", "book", "pick up", "drop off", "water", "clean", "check",
+         "send", "renew", "cancel", "review", "fix", "order", "print", "charge", "return", "visit"]
+OBJECTS = ["mom", "dad", "the rent", "groceries", "the dentist", "plants", "the car", "invoice",
+           "electricity bill", "passport", "the kids", "laptop", "library books", "insurance",
+           "gym membership", "flowers", "medicine", "the plumber", "train tickets", "report"]
+QUALIFIERS = ["", "", "today", "tomorrow", "at office", "for Akash", "for Priya", "before lunch",
+              "after work", "on the way home", "again", "for the party"]
+
+
+def generate_tasks(count, rng):
+    tasks = set()
+    while len(tasks) < count:
+        words = [rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(QUALIFIERS), str(rng.randint(1, 999))]
+        tasks.add(" ".join(word for word in words if word))
+    return sorted(tasks)
+
+
+def misspell(task, rng):
+    chars = list(task)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        op = rng.choice(["drop", "swap", "replace"])
+        if op == "drop" and len(chars) > 3:
+            del chars[i]
+        elif op == "swap" and i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        else:
+            chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def generate_queries(tasks, count, rng):
+    queries = []
+    for i in range(count):
+        task = rng.choice(tasks)
+        if i % 5 == 4:
+            queries.append(rng.choice(["weekly standup notes", "feed the cat", "xyz", "backup photos"]))
+        elif i % 3 == 0:
+            queries.append(" ".join(task.split()[:-1]))  # spoken without the number
+        else:
+            queries.append(misspell(task, rng))
+    return queries
+
+
+def time_queries(fn, queries):
+    timings, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        timings.append(time.perf_counter() - start)
+    return timings, results
+
+
+def report(name, timings):
+    ms = sorted(t * 1000 for t in timings)
+    print(f"{name:<8} mean={statistics.mean(ms):9.3f} ms  p50={ms[len(ms) // 2]:9.3f} ms  "
+          f"p95={ms[int(0.95 * (len(ms) - 1))]:9.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy reminder lookup.")
+    parser.add_argument("--reminders", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--cutoff", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    tasks = generate_tasks(args.reminders, rng)
+    queries = generate_queries(tasks, args.queries, rng)
+
+    start = time.perf_counter()
+    index = TrigramIndex()
+    for task in tasks:
+        index.add(task)
+    build = time.perf_counter() - start
+
+    difflib_timings, expected = time_queries(
+        lambda q: difflib.get_close_matches(q, tasks, n=1, cutoff=args.cutoff), queries)
+    index_timings, actual = time_queries(
+        lambda q: index.get_close_matches(q, n=1, cutoff=args.cutoff), queries)
+
+    same = sum(1 for a, b in zip(expected, actual) if a == b)
+    print(f"=== {len(tasks)} reminders, {len(queries)} queries, cutoff={args.cutoff} ===")
+    print(f"index build: {build * 1000:.1f} ms")
+    report("difflib", difflib_timings)
+    report("trigram", index_timings)
+    print(f"Same result as difflib: {same}/{len(queries)} "
+          f"({sum(1 for r in expected if r)} difflib matches, {sum(1 for r in actual if r)} index matches)")
+    print(f"Speed-up (p50): {statistics.median(difflib_timings) / statistics.median(index_timings):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
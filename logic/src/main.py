@@ -1,9 +1,17 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from routes.logic import process  # Import our logic router
+from scheduler.scheduler_core import startup as scheduler_startup, shutdown as scheduler_shutdown
+from services.job_manager import job_manager
 import logging
+import os
 import sys
 
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from shared.http_client import http_client
+from shared.async_http_client import async_http_client
+
 
 # Configure root logger with stream handler explicitly
 logging.basicConfig(
@@ -31,16 +39,24 @@ class Request(BaseModel):
 @app.on_event("startup")
 def startup_event():
     # logic.initialize_nlp()
-    pass
+    # The logic service owns the reminder scheduler unless another process got there first.
+    # On start it repairs the timers against the stored reminders and catches up on missed ones.
+    scheduler_startup()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    scheduler_shutdown()
+    job_manager.shutdown()
 
 # Define our main API endpoint
 @app.post("/process")
-def parse_text(request: Request):
+async def parse_text(request: Request):
     """
     recieves data from rasa/actions/actions.py and processes it using logic.py
     """
-    # Call the main processing function from our logic module
-    response = process(request.action, request.data)
+    # Call the main processing function from our logic module (blocking handlers
+    # run in the thread pool, network calls are awaited)
+    response = await process(request.action, request.data)
     logger.debug("request data processed successfully")
     logger.debug(f"response: {response}")
     return response
@@ -48,4 +64,28 @@ def parse_text(request: Request):
 # A simple root endpoint to check if the server is running
 @app.get("/")
 def read_root():
-    return {"status": "Logic Service is running."}
\ No newline at end of file
+    return {"status": "Logic Service is running."}
+
+# Latency and error counts of outgoing calls (Coqui TTS, weather APIs, Wikipedia)
+@app.get("/metrics/http")
+def http_metrics():
+    return {**http_client.metrics(), **async_http_client.metrics()}
+
+# Background jobs started by long-running actions (typing, opening apps/browser)
+@app.get("/jobs")
+def list_jobs():
+    return job_manager.list()
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
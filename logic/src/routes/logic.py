@@ -1,5 +1,7 @@
+import asyncio
+import functools
+import threading
 import webbrowser
-import wikipedia
 import os
 import sys
 
@@ -8,44 +10,71 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.app_launcher import open_application
 from services.weather_info import fetch_weather, get_user_location
-from services.reminder_manager import load_reminders, save_reminders, schedule_reminder, remove_reminder
+from services.wikipedia_info import fetch_summary, DisambiguationError, PageNotFound
+from services.reminder_manager import schedule_reminder, remove_reminder as unschedule_reminder
+from services.reminder_store import reminder_store, parse_time, LOCAL_TZ
 from services.response_loader import get_random_response
-from datetime import datetime, timedelta, timezone
+from services.job_manager import job_manager, check_cancelled
+from datetime import datetime, timedelta
 import random
 from typing import Any, Text, Dict, List
 from pynput.keyboard import Controller
 import time
-import difflib
 
 
-def process(action: Text, data: Text):
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking handler in the default thread pool, keeping the event loop free."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+
+async def process(action: Text, data: Text):
     response = None
+    # Long-running side effects run as background jobs (see services/job_manager.py)
     if(action == "OPEN_APP"):
-        response = open_app(data)
+        response = await run_blocking(job_manager.run, action, open_app, data, f"Opening {data}...")
     if(action == "SEARCH_BROWSER"):
-        response = search_browser(data)
+        response = await run_blocking(job_manager.run, action, search_browser, data, f"Searching for '{data}' on Firefox...")
     if(action == "TYPE_TEXT"):
-        response = type_text(data)
+        response = await run_blocking(job_manager.run, action, type_text, data, f"Typing: {data}", lane="keyboard", wait=0)
     if(action == "GET_CURRENT_TIME"):
         response = get_current_time()
+    # Network-bound actions are awaited on the event loop
     if(action == "GET_MEANING"):
-        response = meaning_of(data)
+        response = await meaning_of(data)
     if(action  == "OPEN_BROWSER"):
-        response = open_browser(data)
+        response = await run_blocking(job_manager.run, action, open_browser, data, f"Opening more details about '{data}' in your browser.")
     if(action == "GET_WEATHER"):
-        response = get_weather(data)
+        response = await get_weather(data)
+    # Reminders touch files and the scheduler's SQLite store
     if(action == "SET_REMINDER"):
-        response = set_reminder(data)
+        response = await run_blocking(set_reminder, data)
     if(action == "LIST_REMINDERS"):
-        response = list_reminders()
+        response = await run_blocking(list_reminders)
     if(action == "REMOVE_REMINDER"):
-        response = remove_reminder(data)
+        response = await run_blocking(remove_reminder, data)
     if(action == "UPDATE_REMINDER"):
-        response = update_reminder(data)
+        response = await run_blocking(update_reminder, data)
+    if(action == "QUERY_REMINDERS"):
+        response = await run_blocking(query_reminders, data)
     
     return response
 
 
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def process_blocking(action: Text, data: Text):
+    """process() for synchronous callers; runs it on a private event loop thread."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="logic-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(process(action, data), _loop).result()
+
+
 def open_app(app_name: Text):
     try:
         if app_name:
@@ -67,8 +96,9 @@ def type_text(text: Text):
     if text:
         keyboard = Controller()
 
-        # Simulate real typing effect
+        # Simulate real typing effect (stops early if the job is cancelled)
         for char in text:
+            check_cancelled()
             keyboard.type(char)
             time.sleep(0.05)  # Adjust typing speed if needed
         
@@ -96,11 +126,11 @@ def get_current_time():
     # Choose a random response
     return {"text": random.choice(responses), "continue": False}
 
-def meaning_of(word):
+async def meaning_of(word):
     if word:
         try:
             # Fetch a short summary from Wikipedia
-            meaning = wikipedia.summary(word, sentences=1)
+            meaning = await fetch_summary(word, sentences=1)
 
             # Randomized response for the meaning
             success_response = get_random_response("action_meaning_of", "success", word=word, meaning=meaning)
@@ -109,10 +139,13 @@ def meaning_of(word):
 
             return {"text": f"{success_response}. {know_more_response}", "continue": True}
 
-        except wikipedia.exceptions.DisambiguationError as e:
+        except DisambiguationError:
             return {"text": get_random_response("action_meaning_of", "disambiguation", term=word), "continue": False}
-        except wikipedia.exceptions.PageError:
+        except PageNotFound:
             return {"text": get_random_response("action_meaning_of", "not_found", term=word), "continue": False}
+        except Exception as e:
+            print(f"Error fetching meaning of {word}: {e}")
+            return {"text": "I couldn't reach Wikipedia right now. Please try again later.", "continue": False}
 
     else:
         # Randomized response when the word is missing
@@ -127,14 +160,14 @@ def open_browser(term):
     else:
         return {"text": "I don't remember which word you wanted. Could you say it again?", "continue": False}
 
-def get_weather(location):
+async def get_weather(location):
     if not location:
-        location = get_user_location()
+        location = await get_user_location()
         if not location:
             return {"text": "I couldn't detect your location. Please provide a city name.", "continue": False}
 
     # Fetch weather details
-    weather_data = fetch_weather(location)
+    weather_data = await fetch_weather(location)
 
     if weather_data:
         temp = weather_data["main"]["temp"]
@@ -156,70 +189,92 @@ def set_reminder(data):
         # print(f"[Reminder Parse Error] Couldn't parse time: {time_value}, error: {e}")
         return {"text": "I couldn't understand the time you mentioned. Try something like 'remind me at 5pm'.", "continue": False}
 
-    reminders = load_reminders()
-    reminders[task] = reminder_time.isoformat()
-    save_reminders(reminders)
+    reminder_store.upsert(task, reminder_time.isoformat())
 
-    # Schedule reminders
-    ten_minutes_before = reminder_time - timedelta(minutes=10)
-    schedule_reminder(task, ten_minutes_before.isoformat(), early=True)
-    schedule_reminder(task, reminder_time.isoformat(), early=False)
+    # Schedule reminders (10-minute warning and on time)
+    schedule_reminder(task, reminder_time.isoformat())
 
     return {"text": f"✅ Reminder set for '{task}' at {reminder_time.strftime('%I:%M %p')}.", "continue": False}
 
 def list_reminders():
-    now = datetime.now(timezone.utc)  # make `now` timezone-aware in UTC
-    reminders = load_reminders()
-    active_reminders = {}
-
-    for task, time_str in reminders.items():
-        try:
-            reminder_time = datetime.fromisoformat(time_str)
-
-            # Ensure both are timezone-aware
-            if reminder_time.tzinfo is None:
-                reminder_time = reminder_time.replace(tzinfo=timezone.utc)
-
-            if reminder_time > now:
-                active_reminders[task] = time_str
-        except Exception as e:
-            print(f"[Reminder Check] Failed to parse time for {task}: {e}")
-
-
-    # Overwrite with filtered active ones
-    save_reminders(active_reminders)
+    # Past reminders are dropped in one indexed DELETE; the rest come back soonest first
+    reminder_store.purge_expired()
+    active_reminders = reminder_store.upcoming_entries()
 
     if not active_reminders:
         return {"text": "You don't have any active reminders.", "continue": False}
 
     message = "Here are your current reminders:\n"
     follow_up_question = "Would you like to update the time for a task or remove one?"
-    for task, time in active_reminders.items():
-        formatted_time = datetime.fromisoformat(time).strftime('%I:%M %p')
+    for task, reminder_time, _ in active_reminders:
+        formatted_time = reminder_time.strftime('%I:%M %p')
         message += f"• {task} at {formatted_time}\n"
     
     message = message + ". " + follow_up_question
 
     return {"text": message, "continue": True}
 
-def remove_reminder(task):
-    reminders = load_reminders()
+def _day_bounds(day):
+    """Local midnight of `day` and of the day after."""
+    start = LOCAL_TZ.localize(datetime(day.year, day.month, day.day))
+    next_day = day + timedelta(days=1)
+    return start, LOCAL_TZ.localize(datetime(next_day.year, next_day.month, next_day.day))
+
+def query_reminders(data):
+    """
+    Reminders in a time window, answered from the in-memory index. `data` is one of:
+    "" / "upcoming" (next 5), "next N", "today", "tomorrow", an ISO date/time
+    (that day), or "START||END" (ISO times, END exclusive).
+    """
+    query = (data or "").strip().lower()
+    now = datetime.now(LOCAL_TZ)
+    label = None
+
+    try:
+        if query in ("", "upcoming"):
+            entries, label = reminder_store.upcoming_entries(limit=5), "coming up"
+        elif query.startswith("next") and query[4:].strip().isdigit():
+            entries, label = reminder_store.upcoming_entries(limit=int(query[4:])), "coming up"
+        elif query in ("today", "tomorrow"):
+            day = now.date() + timedelta(days=1 if query == "tomorrow" else 0)
+            start, end = _day_bounds(day)
+            # Today's list starts now: past reminders have already gone off
+            entries, label = reminder_store.between(max(start, now) if query == "today" else start, end), f"for {query}"
+        elif "||" in query:
+            start, end = (parse_time(part.strip()) for part in data.split("||", 1))
+            entries = reminder_store.between(start, end)
+        else:
+            start, end = _day_bounds(parse_time(data.strip()).astimezone(LOCAL_TZ).date())
+            entries, label = reminder_store.between(start, end), f"on {start.strftime('%A, %d %B')}"
+    except ValueError:
+        return {"text": "I couldn't understand which time you meant.", "continue": False}
 
-    if not reminders:
+    if not entries:
+        return {"text": f"You don't have any reminders {label or 'in that time'}.", "continue": False}
+
+    # Show dates only when the reminders are not all on today's date
+    show_date = any(reminder_time.astimezone(LOCAL_TZ).date() != now.date() for _, reminder_time, _ in entries)
+    time_format = '%a %d %b, %I:%M %p' if show_date else '%I:%M %p'
+    message = f"Here are your reminders {label or 'in that time'}:\n"
+    for task, reminder_time, _ in entries:
+        message += f"• {task} at {reminder_time.strftime(time_format)}\n"
+
+    return {"text": message, "continue": False}
+
+def remove_reminder(task):
+    if not reminder_store.count():
         return {"text": "You don't have any reminders set.", "continue": False}
 
-    task_names = list(reminders.keys())
-    best_match = difflib.get_close_matches(task, task_names, n=1, cutoff=0.5)
+    best_match = reminder_store.close_matches(task, n=1, cutoff=0.5)
 
     if best_match:
         matched_task = best_match[0]
 
         # ❌ Remove from reminder list
-        reminders.pop(matched_task)
-        save_reminders(reminders)
+        reminder_store.delete(matched_task)
 
         # ❌ Remove scheduled jobs
-        remove_reminder(matched_task)
+        unschedule_reminder(matched_task)
 
         return {"text": f"✅ Removed the reminder for '{matched_task}'.", "continue": False}
     else:
@@ -232,11 +287,8 @@ def update_reminder(data):
 
     task, new_time = map(str.strip, data.split("||", 1))
 
-    reminders = load_reminders()
-
-    # 🔍 Fuzzy match task
-    task_names = list(reminders.keys())
-    best_match = difflib.get_close_matches(task, task_names, n=1, cutoff=0.5)
+    # 🔍 Fuzzy match task (trigram index, see services/task_matcher.py)
+    best_match = reminder_store.close_matches(task, n=1, cutoff=0.5)
 
     if not best_match:
         return {"text": "I couldn't find a matching reminder to update.", "continue": False}
@@ -249,12 +301,10 @@ def update_reminder(data):
         # updated_time = datetime.now() + timedelta(minutes=30)
         return {"text": "Couldn't understand the new time. Please try again.", "continue": False}
 
-    # 🔁 Update in the reminder JSON
-    reminders[matched_task] = updated_time.isoformat()
-    save_reminders(reminders)
+    # 🔁 Update the stored reminder
+    reminder_store.upsert(matched_task, updated_time.isoformat())
 
     # 📆 Re-schedule the reminder with dual notifications
-    schedule_reminder(matched_task, (updated_time - timedelta(minutes=10)).isoformat(), early=True)
-    schedule_reminder(matched_task, updated_time.isoformat(), early=False)
+    schedule_reminder(matched_task, updated_time.isoformat())
 
     return {"text": f"🕒 Reminder for '{matched_task}' updated to {updated_time.strftime('%I:%M %p')}.", "continue": False}
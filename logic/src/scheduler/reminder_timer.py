@@ -0,0 +1,436 @@
+# scheduler/reminder_timer.py
+#
+# One timer entry per reminder, holding every notification offset ("10 minutes
+# before", "on time") instead of one persisted job per notification. Entries
+# live in memory: lookups, rescheduling and cancelling never touch SQLite on the
+# caller's thread. Changes are written behind in batches, one transaction per
+# flush:
+#
+#   timer = ReminderTimer(callback=lambda task, offset: ...)
+#   timer.start()
+#   timer.schedule("call mom", run_at, offsets=(600, 0))     # fires at -10 min and on time
+#   timer.schedule_many([("pay rent", t1), ("water plants", t2)], offsets=(600, 0))
+#   timer.cancel("call mom")
+#
+# A single thread sleeps until the next fire time, flushes pending writes and
+# polls the table for entries written by other processes.
+#
+# Reminders whose time passed while nothing was running (the service was down,
+# the machine suspended) are not fired one by one when the timer catches up.
+# They are handed to on_missed(...) together, as one batch.
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # logic/src/
+DB_PATH = os.path.join(SRC_DIR, "data", "reminders", "reminder_timers.sqlite")
+
+# Pending changes are written at most this many seconds after the first one
+FLUSH_DELAY = float(os.environ.get("ELISA_TIMER_FLUSH_DELAY", "0.5"))
+# Notifications running at the same time
+EXECUTOR_WORKERS = int(os.environ.get("ELISA_TIMER_WORKERS", "4"))
+# A fire this late (seconds) when it is scheduled counts as missed
+MISFIRE_GRACE = 1.0
+# A fire later than this (seconds) when the timer gets to it is not played on its
+# own; the reminder goes into the catch-up batch instead
+LATE_GRACE = float(os.environ.get("ELISA_REMINDER_LATE_GRACE", "60"))
+# Missed reminders older than this are dropped rather than caught up
+CATCH_UP_WINDOW = float(os.environ.get("ELISA_REMINDER_CATCHUP_HOURS", "12")) * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timers (
+    task       TEXT PRIMARY KEY,
+    run_at     REAL NOT NULL,
+    offsets    TEXT NOT NULL,
+    next_index INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class TimerEntry:
+    def __init__(self, task, run_at, offsets, next_index=0):
+        self.task = task
+        self.run_at = run_at                                   # epoch seconds of the reminder itself
+        self.offsets = tuple(sorted(offsets, reverse=True))    # seconds before run_at, earliest fire first
+        self.next_index = next_index
+        self.version = 0                                       # bumped on reschedule; stale heap items are skipped
+
+    @property
+    def done(self):
+        return self.next_index >= len(self.offsets)
+
+    def next_fire(self):
+        """(fire_at, offset) of the next notification, or None when all have fired."""
+        if self.done:
+            return None
+        offset = self.offsets[self.next_index]
+        return self.run_at - offset, offset
+
+    def to_row(self):
+        return (self.task, self.run_at, ",".join(str(o) for o in self.offsets), self.next_index, time.time())
+
+    @classmethod
+    def from_row(cls, row):
+        task, run_at, offsets, next_index = row[:4]
+        return cls(task, run_at, [float(o) for o in offsets.split(",") if o], next_index)
+
+    def to_dict(self):
+        fire = self.next_fire()
+        return {"task": self.task, "run_at": self.run_at, "offsets": list(self.offsets),
+                "next_fire_at": fire[0] if fire else None}
+
+
+class ReminderTimer:
+    def __init__(self, db_path=DB_PATH, callback=None, poll_interval=15.0, flush_delay=FLUSH_DELAY):
+        self.db_path = db_path
+        self.callback = callback            # callback(task, offset) when a notification is due
+        self.on_missed = None               # on_missed([(task, run_at)]) for each catch-up batch
+        self.on_poll = None                 # on_poll() at start and every poll_interval (executing only)
+        self.poll_interval = poll_interval  # how often to look for other processes' writes
+        self.flush_delay = flush_delay
+        self.executing = False              # False: keep entries and persist, but never fire
+        self._entries = {}                  # task -> TimerEntry
+        self._heap = []                     # [(fire_at, seq, task, version)]
+        self._seq = 0
+        self._dirty = {}                    # task -> row, or None to delete
+        self._dirty_since = None
+        self._missed = []                   # [(task, run_at)] waiting for on_missed
+        self._generation = None             # meta generation written or read last
+        self._cond = threading.Condition(threading.RLock())
+        self._thread = None
+        self._stopping = False
+        self._executor = None
+        self._conn = None                   # used by the timer thread and flush() only
+        self._conn_lock = threading.Lock()
+
+    # === PERSISTENCE ===
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _db_generation(self, conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def flush(self):
+        """Write pending changes in one transaction; returns how many rows changed."""
+        with self._cond:
+            dirty, self._dirty, self._dirty_since = self._dirty, {}, None
+        if not dirty:
+            return 0
+        upserts = [row for row in dirty.values() if row is not None]
+        deletes = [(task,) for task, row in dirty.items() if row is None]
+        with self._conn_lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR REPLACE INTO timers VALUES (?, ?, ?, ?, ?)", upserts)
+                conn.executemany("DELETE FROM timers WHERE task = ?", deletes)
+                generation = self._db_generation(conn) + 1
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(generation),))
+                if self.executing:
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('alive_at', ?)", (str(time.time()),))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                with self._cond:
+                    for task, row in dirty.items():  # keep newer changes made meanwhile
+                        self._dirty.setdefault(task, row)
+                    self._dirty_since = time.time()  # retry after another flush delay
+                raise
+        with self._cond:
+            # Someone else wrote in between: reload on the next poll
+            self._generation = generation if self._generation == generation - 1 else None
+        return len(dirty)
+
+    def load(self):
+        """Replace the in-memory entries with the table (pending changes are flushed first)."""
+        self.flush()
+        with self._conn_lock:
+            conn = self._connect()
+            generation = self._db_generation(conn)
+            rows = conn.execute("SELECT task, run_at, offsets, next_index FROM timers").fetchall()
+        now = time.time()
+        with self._cond:
+            # Changes made since the flush above win over the table
+            pending = dict(self._dirty)
+            rows = [row for row in rows if row[0] not in pending]
+            rows += [row for row in pending.values() if row is not None]
+            self._entries = {}
+            for row in rows:
+                entry = TimerEntry.from_row(row)
+                # Only the process that fires reminders decides what was missed
+                if self.executing and self._skip_missed(entry, now, LATE_GRACE):
+                    self._missed.append((entry.task, entry.run_at))
+                if entry.done:
+                    self._dirty[entry.task] = None
+                else:
+                    self._entries[entry.task] = entry
+            self._generation = generation
+            self._rebuild_heap()
+            self._mark_dirty_time()
+            self._cond.notify()
+        return len(self._entries)
+
+    def _reload_if_changed(self):
+        with self._conn_lock:
+            generation = self._db_generation(self._connect())
+        if generation != self._generation:
+            self.load()
+
+    def alive_at(self):
+        """When the executing timer last persisted or checked in (epoch seconds, None if never)."""
+        value = self.get_meta("alive_at")
+        return float(value) if value else None
+
+    def _touch_alive(self):
+        self.set_meta("alive_at", time.time())
+
+    def get_meta(self, key):
+        with self._conn_lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self._conn_lock:
+            self._connect().execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    # === ENTRIES (memory only; persisted by the next flush) ===
+    def _skip_missed(self, entry, now, grace=MISFIRE_GRACE):
+        """Skip fires more than `grace` seconds late; True if that includes the last one."""
+        skipped = False
+        while not entry.done and entry.next_fire()[0] < now - grace:
+            entry.next_index += 1
+            skipped = True
+        return skipped and entry.done
+
+    def _push(self, entry):
+        fire = entry.next_fire()
+        if fire is not None:
+            self._seq += 1
+            heapq.heappush(self._heap, (fire[0], self._seq, entry.task, entry.version))
+
+    def _rebuild_heap(self):
+        self._heap = []
+        for entry in self._entries.values():
+            self._push(entry)
+
+    def _mark_dirty_time(self):
+        if self._dirty and self._dirty_since is None:
+            self._dirty_since = time.time()
+
+    def _put(self, task, run_at, offsets, now):
+        old = self._entries.get(task)
+        entry = TimerEntry(task, run_at, offsets)
+        entry.version = old.version + 1 if old else 0
+        self._skip_missed(entry, now)
+        if entry.done:
+            self._entries.pop(task, None)
+            self._dirty[task] = None
+            return None
+        self._entries[task] = entry
+        self._dirty[task] = entry.to_row()
+        return entry
+
+    def schedule(self, task, run_at, offsets=(0,)):
+        """Create or replace the entry for `task`; `run_at` is epoch seconds."""
+        with self._cond:
+            entry = self._put(task, run_at, offsets, time.time())
+            if entry is not None:
+                self._push(entry)
+            self._mark_dirty_time()
+            self._cond.notify()
+        return entry
+
+    def schedule_many(self, items, offsets=(0,)):
+        """schedule() for many (task, run_at) pairs: one heap rebuild, one flush."""
+        now = time.time()
+        with self._cond:
+            count = 0
+            for task, run_at in items:
+                count += self._put(task, run_at, offsets, now) is not None
+            self._rebuild_heap()
+            self._mark_dirty_time()
+            self._cond.notify()
+        return count
+
+    def cancel(self, task):
+        """Drop the entry for `task`; True if there was one."""
+        with self._cond:
+            entry = self._entries.pop(task, None)
+            if entry is None:
+                return False
+            self._dirty[task] = None  # its heap item is now stale and skipped
+            self._mark_dirty_time()
+            self._cond.notify()
+            return True
+
+    def cancel_many(self, tasks):
+        with self._cond:
+            removed = [task for task in tasks if self._entries.pop(task, None) is not None]
+            for task in removed:
+                self._dirty[task] = None
+            self._rebuild_heap()
+            self._mark_dirty_time()
+            self._cond.notify()
+        return len(removed)
+
+    def add_missed(self, items):
+        """Queue (task, run_at) pairs for the next catch-up batch."""
+        with self._cond:
+            self._missed.extend(items)
+            self._cond.notify()
+
+    def get(self, task):
+        with self._cond:
+            entry = self._entries.get(task)
+            return entry.to_dict() if entry else None
+
+    def entries(self):
+        with self._cond:
+            return [entry.to_dict() for entry in self._entries.values()]
+
+    def __len__(self):
+        return len(self._entries)
+
+    # === TIMER THREAD ===
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, execute=True, prepare=None):
+        """
+        Start the timer thread; with execute=False entries are kept and persisted
+        but never fire. prepare(), if given, runs after the entries are loaded and
+        before anything fires (e.g. to reconcile them with the reminder store).
+        """
+        with self._cond:
+            if self._thread is not None:
+                return
+            self.executing = execute
+            self._stopping = False
+            if execute:
+                self._executor = ThreadPoolExecutor(EXECUTOR_WORKERS, thread_name_prefix="reminder")
+        self.load()
+        if prepare is not None:
+            prepare()
+        self._thread = threading.Thread(target=self._run, name="reminder-timer", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _pop_due(self, now):
+        """Advance and return [(task, offset)] for notifications due at `now`."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, task, version = heapq.heappop(self._heap)
+            entry = self._entries.get(task)
+            if entry is None or entry.version != version:
+                continue  # cancelled or rescheduled since this item was pushed
+            fire_at, offset = entry.next_fire()
+            entry.next_index += 1
+            if fire_at >= now - LATE_GRACE:
+                due.append((task, offset))
+            elif entry.done:
+                # Woke up long after the reminder (e.g. suspend): catch up instead
+                self._missed.append((task, entry.run_at))
+            if entry.done:
+                del self._entries[task]
+                self._dirty[task] = None
+            else:
+                self._dirty[task] = entry.to_row()
+                self._push(entry)
+        self._mark_dirty_time()
+        return due
+
+    def _run(self):
+        next_poll = time.time() + self.poll_interval
+        if self.executing and self.on_poll is not None:
+            self._executor.submit(self._call_on_poll)
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                now = time.time()
+                due = self._pop_due(now) if self.executing else []
+                missed, self._missed = (self._missed, []) if self.executing else ([], self._missed)
+                flush_due = self._dirty_since is not None and now - self._dirty_since >= self.flush_delay
+                if not due and not missed and not flush_due and now < next_poll:
+                    deadlines = [next_poll]
+                    if self.executing and self._heap:
+                        deadlines.append(self._heap[0][0])
+                    if self._dirty_since is not None:
+                        deadlines.append(self._dirty_since + self.flush_delay)
+                    self._cond.wait(max(0.0, min(deadlines) - now))
+                    continue
+
+            for task, offset in due:
+                self._executor.submit(self._fire, task, offset)
+            if missed:
+                self._executor.submit(self._fire_missed, missed)
+            try:
+                if flush_due:
+                    self.flush()
+                if missed or time.time() >= next_poll:
+                    if self.executing:
+                        self._touch_alive()  # missed reminders before this were handled
+                if time.time() >= next_poll:
+                    next_poll = time.time() + self.poll_interval
+                    self._reload_if_changed()
+                    if self.executing and self.on_poll is not None:
+                        self._executor.submit(self._call_on_poll)
+            except sqlite3.Error as e:
+                print(f"[Scheduler] Could not write reminder timers: {e}")
+
+    def _call_on_poll(self):
+        try:
+            self.on_poll()
+        except Exception as e:
+            print(f"[Scheduler] Poll hook failed: {e}")
+
+    def _fire_missed(self, missed):
+        cutoff = time.time() - CATCH_UP_WINDOW
+        latest = {}  # a reminder can be reported by the timer and by reconciliation
+        for task, run_at in missed:
+            if run_at < cutoff:
+                print(f"[Scheduler] Dropping missed reminder '{task}' (older than the catch-up window)")
+            else:
+                latest[task] = max(run_at, latest.get(task, run_at))
+        missed = sorted((run_at, task) for task, run_at in latest.items())
+        if not missed or self.on_missed is None:
+            return
+        try:
+            self.on_missed([(task, run_at) for run_at, task in missed])
+        except Exception as e:
+            print(f"[Scheduler] Catch-up notification failed: {e}")
+
+    def _fire(self, task, offset):
+        try:
+            self.callback(task, offset)
+        except Exception as e:
+            print(f"[Scheduler] Reminder '{task}' failed: {e}")
@@ -1,16 +1,150 @@
 # scheduler_core.py
 import os
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.executors.pool import ThreadPoolExecutor
+import threading
+import time
+
+from scheduler.reminder_timer import ReminderTimer
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-# Get absolute path to reminder_jobs.sqlite inside data/
 SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # logic/src/
-DB_PATH = os.path.join(SRC_DIR, "data", "reminders", "reminder_jobs.sqlite").replace("\\", "/")
-
-scheduler = BackgroundScheduler(
-    jobstores={"default": SQLAlchemyJobStore(url=f"sqlite:///{DB_PATH}")},
-    executors={"default": ThreadPoolExecutor(10)},
-    timezone="Asia/Kolkata"
-)
-scheduler.start()
+LOCK_PATH = os.path.join(SRC_DIR, "data", "reminders", "scheduler.lock")
+
+# How often the running scheduler re-reads the timer table, so reminders added by
+# another process (e.g. the action server with the in-process logic transport)
+# are picked up
+JOBSTORE_POLL_SECONDS = 15
+
+
+def _fire(task_name, offset):
+    # Imported here: reminder_manager imports this module
+    from services.reminder_manager import remind
+    remind(task_name, early=offset > 0)
+
+
+def _fire_missed(missed):
+    from services.reminder_manager import remind_missed
+    remind_missed(missed)
+
+
+def _prefetch_audio():
+    from services.reminder_manager import prefetch_audio
+    prefetch_audio()
+
+
+# The scheduler is not started on import: importing the logic layer (e.g. from the
+# action server) must not spawn a second scheduler firing the same reminders.
+# Call ensure_started() (or startup() from the logic service) before using it.
+scheduler = ReminderTimer(callback=_fire, poll_interval=JOBSTORE_POLL_SECONDS)
+scheduler.on_missed = _fire_missed
+# Reminders set by other processes, or further out than the pre-render horizon,
+# get their notification audio rendered as they come closer
+scheduler.on_poll = _prefetch_audio
+
+_start_lock = threading.Lock()
+_owner_lock_file = None
+
+
+def _acquire_owner_lock():
+    """Only one process per host executes jobs; True if this process is it."""
+    global _owner_lock_file
+    if fcntl is None or _owner_lock_file is not None:
+        return True
+    os.makedirs(os.path.dirname(LOCK_PATH), exist_ok=True)
+    lock_file = open(LOCK_PATH, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _owner_lock_file = lock_file  # held (and the lock kept) for the life of the process
+    return True
+
+
+def ensure_started():
+    """
+    Start the scheduler once per process.
+
+    The process holding the host-wide lock fires reminders. It reconciles the
+    timer table with the reminder store first (see reconcile()). Any other
+    process starts the timer without executing, so scheduling and cancelling
+    still write to the shared timer table but reminders never fire twice.
+    """
+    with _start_lock:
+        if scheduler.running:
+            return scheduler
+        if _acquire_owner_lock():
+            scheduler.start(execute=True, prepare=_log_reconcile)
+            print("[Scheduler] started (executing reminders)")
+        else:
+            scheduler.start(execute=False)
+            print("[Scheduler] started paused (another process executes reminders)")
+    return scheduler
+
+
+def reconcile(now=None):
+    """
+    Repair the timer table against the reminder store (the source of truth):
+
+    - timers without a stored reminder are cancelled
+    - future reminders without a timer, or with a timer for another time, are (re)scheduled
+    - past reminders that never fired go into one catch-up notification
+
+    A past reminder without a timer counts as never fired if its time is after
+    the executing timer was last seen alive. Returns counts per repair.
+    """
+    # Imported here: reminder_manager imports this module
+    from services.reminder_manager import REMINDER_OFFSETS
+    from services.reminder_store import reminder_store
+    now = time.time() if now is None else now
+    alive_at = scheduler.alive_at()
+    if alive_at is None:
+        alive_at = now  # first start: nothing in the past was ever due on this timer
+
+    stored = {task: reminder_time.timestamp() for task, reminder_time, _ in reminder_store.entries()}
+    timers = {entry["task"]: entry for entry in scheduler.entries()}
+
+    orphans = [task for task in timers if task not in stored]
+    to_schedule, stale, missed = [], [], []
+    for task, run_at in stored.items():
+        timer = timers.get(task)
+        if timer is not None and abs(timer["run_at"] - run_at) < 1:
+            continue  # in sync
+        if run_at > now:
+            to_schedule.append((task, run_at))
+        else:
+            if timer is not None:
+                stale.append(task)
+            if run_at > alive_at:
+                missed.append((task, run_at))
+
+    scheduler.cancel_many(orphans + stale)
+    scheduler.schedule_many(to_schedule, offsets=REMINDER_OFFSETS)
+    scheduler.add_missed(missed)
+    return {"orphans": len(orphans), "scheduled": len(to_schedule), "stale": len(stale), "missed": len(missed)}
+
+
+def _log_reconcile():
+    try:
+        repairs = reconcile()
+    except Exception as e:
+        print(f"[Scheduler] Reconciliation failed: {e}")
+        return
+    if any(repairs.values()):
+        print("[Scheduler] Reconciled with stored reminders: " +
+              ", ".join(f"{count} {name}" for name, count in repairs.items()))
+
+
+def startup():
+    """FastAPI startup hook of the logic service."""
+    return ensure_started()
+
+
+def shutdown():
+    """FastAPI shutdown hook: stop the timer and write pending changes."""
+    with _start_lock:
+        if scheduler.running:
+            scheduler.shutdown()
@@ -0,0 +1,178 @@
+# services/job_manager.py
+#
+# Background execution for long-running actions (typing, launching apps, opening
+# the browser). The action is submitted as a job and the request returns right
+# away, so the voice turn does not wait for the side effect to finish.
+#
+#   GET    /jobs            recent jobs
+#   GET    /jobs/{job_id}   status and result of one job
+#   DELETE /jobs/{job_id}   cancel a queued or running job
+import collections
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Workers per lane. "keyboard" jobs share one keyboard, so they run one at a time.
+LANE_WORKERS = {
+    "default": int(os.environ.get("ELISA_LOGIC_JOB_WORKERS", "4")),
+    "keyboard": 1,
+}
+# How long a request waits for its job before answering with an acknowledgement.
+# Quick failures ("no such app") are still reported directly.
+ACK_WAIT = float(os.environ.get("ELISA_LOGIC_JOB_ACK_WAIT", "0.3"))
+# Finished jobs kept for status queries
+JOB_HISTORY = int(os.environ.get("ELISA_LOGIC_JOB_HISTORY", "100"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_local = threading.local()
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def current_job():
+    """The job the calling thread is running (None outside of jobs)."""
+    return getattr(_local, "job", None)
+
+
+def check_cancelled():
+    """Raise JobCancelled if the current job was cancelled; call it between steps."""
+    job = current_job()
+    if job is not None and job.cancel_event.is_set():
+        raise JobCancelled()
+
+
+class Job:
+    def __init__(self, action, data, lane):
+        self.id = uuid.uuid4().hex[:12]
+        self.action = action
+        self.data = data
+        self.lane = lane
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.future = None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "action": self.action,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "cancel_requested": self.cancel_event.is_set(),
+            "created_at": round(self.created_at, 3),
+            "started_at": round(self.started_at, 3) if self.started_at else None,
+            "finished_at": round(self.finished_at, 3) if self.finished_at else None,
+        }
+
+
+class JobManager:
+    def __init__(self, lane_workers=LANE_WORKERS, history=JOB_HISTORY):
+        self.executors = {
+            lane: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"job-{lane}")
+            for lane, workers in lane_workers.items()
+        }
+        self.history = history
+        self._jobs = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, job, fn):
+        with self._lock:
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        _local.job = job
+        try:
+            result = fn(job.data)
+            status, job.result = DONE, result
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            status, job.error = FAILED, str(e)
+            print(f"[Jobs] {job.action} ({job.id}) failed: {e}")
+        finally:
+            _local.job = None
+
+        with self._lock:
+            self._finish(job, status)
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        job.done_event.set()
+        # Forget the oldest finished jobs
+        finished = [j for j in self._jobs.values() if j.status in FINISHED]
+        for old in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[old.id]
+
+    def submit(self, action, fn, data, lane="default"):
+        job = Job(action, data, lane)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self.executors[lane].submit(self._run, job, fn)
+        return job
+
+    def run(self, action, fn, data, ack_text, lane="default", wait=ACK_WAIT):
+        """
+        Run fn(data) as a background job and return the action response.
+
+        Empty input is answered directly (the handlers reply with a prompt). If the
+        job finishes within `wait` seconds its own response is returned, otherwise
+        `ack_text` is.
+        """
+        if not data:
+            return fn(data)
+
+        job = self.submit(action, fn, data, lane)
+        if wait > 0 and job.done_event.wait(wait) and job.status == DONE and isinstance(job.result, dict):
+            return {**job.result, "job_id": job.id}
+        return {"text": ack_text, "continue": False, "job_id": job.id}
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def list(self):
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id):
+        """
+        Request cancellation. Queued jobs never start; running jobs stop at their
+        next check_cancelled(). Returns the job's state, or None if unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status not in FINISHED:
+                job.cancel_event.set()
+                if job.status == QUEUED and job.future is not None and job.future.cancel():
+                    self._finish(job, CANCELLED)
+            return job.to_dict()
+
+    def shutdown(self):
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_event.set()
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+
+
+# Shared job manager
+job_manager = JobManager()
@@ -0,0 +1,196 @@
+# services/reminder_audio.py
+#
+# Reminder notifications are synthesized when the reminder is scheduled, not
+# when it fires, so a reminder plays as soon as it is due and simultaneous
+# reminders do not queue on the TTS server:
+#
+#   reminder_audio.prepare("call mom", run_at, offsets=(600, 0))   # renders the notifications still to come
+#   reminder_audio.get("Reminder: call mom")     # WAV bytes, or None if not rendered
+#   reminder_audio.invalidate("call mom")        # on update/remove
+#
+# Rendered audio is kept in memory (LRU, ELISA_REMINDER_AUDIO_CACHE_MB) and in
+# data/reminders/audio/, which every process on the host shares: a reminder set
+# from the action server is played by the process running the scheduler. Only
+# reminders due within ELISA_REMINDER_AUDIO_HORIZON_HOURS are rendered; later
+# ones are picked up by prefetch() as they come closer.
+import collections
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # logic/src/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SRC_DIR))  # elisa-assistant/
+AUDIO_DIR = os.path.join(SRC_DIR, "data", "reminders", "audio")
+
+# Add project root to path for imports
+sys.path.insert(0, PROJECT_ROOT)
+from shared.http_client import http_client
+
+# URL of the running Coqui TTS API server
+TTS_API_URL = "http://localhost:5002/api/tts"
+
+HORIZON = float(os.environ.get("ELISA_REMINDER_AUDIO_HORIZON_HOURS", "24")) * 3600
+CACHE_BYTES = int(float(os.environ.get("ELISA_REMINDER_AUDIO_CACHE_MB", "64")) * 1024 * 1024)
+
+
+def notification_texts(task_name):
+    """What is spoken for a reminder: {"early": ..., "on_time": ...}."""
+    return {
+        "early": "Upcoming in 10 mins: " + task_name,
+        "on_time": "Reminder: " + task_name,
+    }
+
+
+def notification_text(task_name, offset):
+    """The text spoken `offset` seconds before the reminder."""
+    return notification_texts(task_name)["early" if offset > 0 else "on_time"]
+
+
+def synthesize(text):
+    """WAV bytes for `text` from Coqui; raises requests.exceptions.RequestException."""
+    res = http_client.post("coqui_tts", TTS_API_URL, data={"text": text})
+    res.raise_for_status()
+    return res.content
+
+
+class ReminderAudio:
+    def __init__(self, audio_dir=AUDIO_DIR, cache_bytes=CACHE_BYTES, horizon=HORIZON):
+        self.audio_dir = audio_dir
+        self.cache_bytes = cache_bytes
+        self.horizon = horizon
+        self._memory = collections.OrderedDict()  # text -> WAV bytes, least recently used first
+        self._memory_size = 0
+        # Bumped by invalidate(): renders queued (or disk reads started) before are stale
+        self._generations = collections.Counter()  # text -> generation
+        self._pending = {}                         # text -> generation of its queued render
+        self._lock = threading.Lock()
+        # One render at a time: pre-rendering must not crowd out live TTS requests
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="reminder-audio")
+
+    def _path(self, text):
+        return os.path.join(self.audio_dir, hashlib.sha1(text.encode("utf-8")).hexdigest() + ".wav")
+
+    # === MEMORY (call with self._lock held) ===
+    def _remember(self, text, audio):
+        old = self._memory.pop(text, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[text] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.cache_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _forget(self, text):
+        audio = self._memory.pop(text, None)
+        if audio is not None:
+            self._memory_size -= len(audio)
+
+    # === RENDERING ===
+    def get(self, text):
+        """Rendered WAV bytes for `text` (memory, then disk), or None."""
+        with self._lock:
+            audio = self._memory.get(text)
+            if audio is not None:
+                self._memory.move_to_end(text)
+                return audio
+            generation = self._generations[text]
+        try:
+            with open(self._path(text), "rb") as f:
+                audio = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            if self._generations[text] == generation:
+                self._remember(text, audio)
+        return audio
+
+    def render(self, text, generation=None):
+        """
+        Synthesize `text` unless it is already rendered; returns the WAV bytes.
+        If the text was invalidated since `generation`, nothing is synthesized
+        or cached (returns None, or the audio if synthesis had already started).
+        """
+        audio = self.get(text)
+        if audio is not None:
+            return audio
+        with self._lock:
+            if generation is None:
+                generation = self._generations[text]
+            elif self._generations[text] != generation:
+                return None
+        audio = synthesize(text)
+        os.makedirs(self.audio_dir, exist_ok=True)
+        path = self._path(text)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        with self._lock:
+            stale = self._generations[text] != generation
+            if not stale:
+                os.replace(tmp_path, path)
+                self._remember(text, audio)
+        if stale:
+            # Invalidated meanwhile: don't cache audio of an updated or removed reminder
+            os.remove(tmp_path)
+        return audio
+
+    def _render_queued(self, text, generation):
+        try:
+            self.render(text, generation)
+        except requests.exceptions.RequestException as e:
+            print(f"[Reminders] Could not pre-render '{text}': {e}")
+        except Exception as e:
+            print(f"[Reminders] Pre-render of '{text}' failed: {e}")
+        finally:
+            with self._lock:
+                if self._pending.get(text) == generation:
+                    del self._pending[text]
+
+    def prepare(self, task_name, run_at=None, offsets=None):
+        """
+        Render the notifications of a reminder in the background if it is due
+        within the horizon. With `run_at` and `offsets` (seconds before the
+        reminder), only the notifications still to come are rendered.
+        """
+        now = time.time()
+        if run_at is not None and run_at - now > self.horizon:
+            return False
+        if run_at is None or offsets is None:
+            texts = notification_texts(task_name).values()
+        else:
+            texts = {notification_text(task_name, offset) for offset in offsets if run_at - offset > now}
+        for text in texts:
+            with self._lock:
+                generation = self._generations[text]
+                if text in self._memory or self._pending.get(text) == generation:
+                    continue
+                self._pending[text] = generation
+            self._executor.submit(self._render_queued, text, generation)
+        return True
+
+    def prefetch(self, reminders, offsets=None):
+        """prepare() for (task_name, run_at) pairs, e.g. everything due within the horizon."""
+        return sum(1 for task_name, run_at in reminders if self.prepare(task_name, run_at, offsets))
+
+    def invalidate(self, task_name):
+        """Drop the rendered notifications of a reminder (it was updated or removed)."""
+        for text in notification_texts(task_name).values():
+            with self._lock:
+                self._generations[text] += 1
+                self._forget(text)
+            try:
+                os.remove(self._path(text))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[Reminders] Could not remove cached audio for '{task_name}': {e}")
+
+
+# Shared cache
+reminder_audio = ReminderAudio()
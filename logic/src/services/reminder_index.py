@@ -0,0 +1,87 @@
+# services/reminder_index.py
+#
+# In-memory, time-ordered view of the reminder store. Times are parsed once when
+# a reminder is added; queries are binary searches over a sorted list, so listing
+# upcoming reminders, ranges ("today", "tomorrow") and purging expired ones need
+# neither a table scan nor datetime parsing.
+import bisect
+import threading
+
+from services.task_matcher import TrigramIndex
+
+# Sorts after every task name, so (t, _LAST) is the last possible key at time t
+_LAST = "\U0010ffff"
+
+
+class ReminderIndex:
+    def __init__(self):
+        self._order = []     # sorted [(fire_at, task)]
+        self._entries = {}   # task -> (fire_at, datetime, iso_time)
+        self.names = TrigramIndex()  # fuzzy lookup of task names
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._order = []
+            self._entries = {}
+            self.names.clear()
+
+    def put(self, task, fire_at, reminder_time, iso_time):
+        with self._lock:
+            self.remove(task)
+            bisect.insort(self._order, (fire_at, task))
+            self._entries[task] = (fire_at, reminder_time, iso_time)
+            self.names.add(task)
+
+    def remove(self, task):
+        with self._lock:
+            entry = self._entries.pop(task, None)
+            if entry is None:
+                return False
+            i = bisect.bisect_left(self._order, (entry[0], task))
+            del self._order[i]
+            self.names.remove(task)
+            return True
+
+    def pop_expired(self, now):
+        """Remove and return the tasks with fire_at <= now."""
+        with self._lock:
+            end = bisect.bisect_right(self._order, (now, _LAST))
+            expired = [task for _, task in self._order[:end]]
+            del self._order[:end]
+            for task in expired:
+                del self._entries[task]
+                self.names.remove(task)
+            return expired
+
+    def upcoming(self, now, limit=None):
+        """[(task, datetime, iso_time)] with fire_at > now, soonest first."""
+        with self._lock:
+            lo = bisect.bisect_right(self._order, (now, _LAST))
+            hi = len(self._order) if limit is None else min(len(self._order), lo + limit)
+            return [(task,) + self._entries[task][1:] for _, task in self._order[lo:hi]]
+
+    def between(self, start, end, limit=None):
+        """[(task, datetime, iso_time)] with start <= fire_at < end, soonest first."""
+        with self._lock:
+            lo = bisect.bisect_left(self._order, (start, ""))
+            hi = bisect.bisect_left(self._order, (end, ""))
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return [(task,) + self._entries[task][1:] for _, task in self._order[lo:hi]]
+
+    def next_fire_at(self):
+        """Earliest fire_at, or None if empty."""
+        with self._lock:
+            return self._order[0][0] if self._order else None
+
+    def get(self, task):
+        entry = self._entries.get(task)
+        return entry[2] if entry else None
+
+    def tasks(self):
+        with self._lock:
+            return [task for _, task in self._order]
@@ -1,52 +1,53 @@
+import io
 import sys
 import os
-import json
 import subprocess
 import platform
 import shutil
+import wave
 import requests
 import simpleaudio as sa
-from datetime import datetime
-from pytz import timezone
-from scheduler.scheduler_core import scheduler  # Updated import path
+from scheduler.scheduler_core import ensure_started
+from datetime import datetime, timedelta
+from services.reminder_store import reminder_store, parse_time, LOCAL_TZ
+from services.reminder_audio import reminder_audio, notification_texts, synthesize
 
 # Base directory structure
 SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # logic/src/
 LOGIC_DIR = os.path.dirname(SRC_DIR)  # logic/
 PROJECT_ROOT = os.path.dirname(LOGIC_DIR)  # elisa-assistant/
 
-REMINDER_FILE = os.path.join(SRC_DIR, "data", "reminders", "reminders.json")
-RESPONSE_WAV = os.path.join(PROJECT_ROOT, "shared", "audio", "temporary", "response.wav")
 NOTIFICATION_WAV = os.path.join(PROJECT_ROOT, "shared", "audio", "permanent", "notification.wav")
 AUDIO_TEMP_DIR = os.path.join(PROJECT_ROOT, "shared", "audio", "temporary")
 
-# URL of the running Coqui TTS API server
-TTS_API_URL = "http://localhost:5002/api/tts"
+_notification_sound = None
 
-def notify(response):
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(RESPONSE_WAV), exist_ok=True)
+def _wave_object(audio):
+    """simpleaudio WaveObject from in-memory WAV bytes."""
+    with wave.open(io.BytesIO(audio), "rb") as wf:
+        return sa.WaveObject(wf.readframes(wf.getnframes()), wf.getnchannels(), wf.getsampwidth(), wf.getframerate())
 
-    # Prepare the payload
-    data = {
-        "text": response
-    }
+def _get_notification_sound():
+    global _notification_sound
+    if _notification_sound is None and os.path.exists(NOTIFICATION_WAV):
+        _notification_sound = sa.WaveObject.from_wave_file(NOTIFICATION_WAV)
+    return _notification_sound
 
+def notify(response):
     try:
-        # Send request to TTS API
-        res = requests.post(TTS_API_URL, data=data)
-        res.raise_for_status()
-
-        # Save the response content as a wav file
-        with open(RESPONSE_WAV, 'wb') as f:
-            f.write(res.content)
+        # Reminder notifications were rendered when the reminder was scheduled
+        # (services/reminder_audio.py); anything else is synthesized now
+        audio = reminder_audio.get(response)
+        if audio is None:
+            audio = synthesize(response)
 
         # Play notification sound first, if exists
-        if os.path.exists(NOTIFICATION_WAV):
-            sa.WaveObject.from_wave_file(NOTIFICATION_WAV).play().wait_done()
+        notification_sound = _get_notification_sound()
+        if notification_sound is not None:
+            notification_sound.play().wait_done()
 
         # Play the response audio
-        sa.WaveObject.from_wave_file(RESPONSE_WAV).play().wait_done()
+        _wave_object(audio).play().wait_done()
 
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with TTS server: {e}")
@@ -54,14 +55,32 @@ def notify(response):
         print(f"An error occurred: {e}")
 
 def remind(task_name, early=False):
+    texts = notification_texts(task_name)
     msg = f"⏰ Reminder: '{task_name}'"
     if early:
         msg = f"⚠️ Upcoming in 10 mins: '{task_name}'"
-        notify("Upcoming in 10 mins: " + task_name)
+        notify(texts["early"])
     else:
-        notify("Reminder: " + task_name)
+        notify(texts["on_time"])
+        reminder_audio.invalidate(task_name)  # last notification of this reminder
     print(msg)
+    desktop_notify(msg)
+
+def remind_missed(missed):
+    """One catch-up notification for reminders that passed while nothing was running."""
+    items = [f"{task_name} at {datetime.fromtimestamp(run_at, LOCAL_TZ).strftime('%I:%M %p')}"
+             for task_name, run_at in missed]
+    if len(items) == 1:
+        notify(f"You missed a reminder: {items[0]}")
+    else:
+        notify(f"You missed {len(items)} reminders: " + ", ".join(items))
+    msg = "⏰ Missed: " + "; ".join(items)
+    print(msg)
+    desktop_notify(msg)
+    for task_name, _ in missed:
+        reminder_audio.invalidate(task_name)
 
+def desktop_notify(msg):
     os_platform = platform.system().lower()
     try:
         if os_platform == "linux":
@@ -80,42 +99,62 @@ def remind(task_name, early=False):
         print(f"Error sending desktop notification: {e}")
 
 def load_reminders():
-    if not os.path.exists(REMINDER_FILE):
-        return {}
-    with open(REMINDER_FILE, "r") as file:
-        return json.load(file)
+    """All reminders as {task: iso_time}, soonest first (see services/reminder_store.py)."""
+    return reminder_store.all()
 
 def save_reminders(reminders):
-    with open(REMINDER_FILE, "w") as file:
-        json.dump(reminders, file, indent=4)
-
-def schedule_reminder(task_name, iso_time_str, early=False):
-    reminder_time = datetime.fromisoformat(iso_time_str)
-
-    if reminder_time.tzinfo is None:
-        reminder_time = reminder_time.replace(tzinfo=timezone("Asia/Kolkata"))
-
-    job_id = f"{task_name}_{'early' if early else 'on_time'}"
-
-    if scheduler.get_job(job_id):
-        scheduler.remove_job(job_id)
-
-    scheduler.add_job(
-        remind,
-        trigger='date',
-        run_date=reminder_time,
-        id=job_id,
-        replace_existing=True,
-        args=[task_name, early]
-    )
+    """Replace all reminders in one transaction. Prefer the per-reminder reminder_store calls."""
+    reminder_store.replace_all(reminders)
+
+# One timer entry per reminder fires at each offset (seconds before the reminder time)
+REMINDER_OFFSETS = (600, 0)  # 10-minute warning, then on time
+
+def _run_at(iso_time_str):
+    # Times without an offset are local (Asia/Kolkata)
+    return parse_time(iso_time_str).timestamp()
+
+def schedule_reminder(task_name, iso_time_str):
+    """(Re)schedule the notifications of one reminder; replaces any earlier schedule."""
+    run_at = _run_at(iso_time_str)
+    scheduler = ensure_started()
+    if scheduler.get(task_name) is not None:
+        reminder_audio.invalidate(task_name)  # an update: render it again
+    scheduler.schedule(task_name, run_at, offsets=REMINDER_OFFSETS)
+    # Synthesize the notifications now, so they play without delay when due
+    reminder_audio.prepare(task_name, run_at, offsets=REMINDER_OFFSETS)
+
+def schedule_reminders(reminders):
+    """
+    Bulk schedule_reminder() for (task_name, iso_time_str) pairs, e.g. an import.
+    The changes are written in one transaction. Returns how many are still due.
+    """
+    scheduler = ensure_started()
+    items = [(task_name, _run_at(iso_time_str)) for task_name, iso_time_str in reminders]
+    for task_name, _ in items:
+        if scheduler.get(task_name) is not None:
+            reminder_audio.invalidate(task_name)
+    count = scheduler.schedule_many(items, offsets=REMINDER_OFFSETS)
+    reminder_audio.prefetch(items, offsets=REMINDER_OFFSETS)
+    return count
 
 def remove_reminder(task_name: str):
-    removed = False
-    for suffix in ["early", "on_time"]:
-        job_id = f"{task_name}_{suffix}"
-        job = scheduler.get_job(job_id)
-        if job:
-            scheduler.remove_job(job_id)
-            print(f"[Scheduler] Removed job: {job_id}")
-            removed = True
+    scheduler = ensure_started()
+    removed = scheduler.cancel(task_name)
+    reminder_audio.invalidate(task_name)
+    if removed:
+        print(f"[Scheduler] Removed reminder: {task_name}")
     return removed
+
+def remove_reminders(task_names):
+    """Bulk remove_reminder(); returns how many were scheduled."""
+    task_names = list(task_names)
+    for task_name in task_names:
+        reminder_audio.invalidate(task_name)
+    return ensure_started().cancel_many(task_names)
+
+def prefetch_audio():
+    """Render the notifications of reminders coming within the pre-render horizon."""
+    now = datetime.now(LOCAL_TZ)
+    entries = reminder_store.between(now, now + timedelta(seconds=reminder_audio.horizon))
+    return reminder_audio.prefetch(((task_name, reminder_time.timestamp()) for task_name, reminder_time, _ in entries),
+                                   offsets=REMINDER_OFFSETS)
@@ -0,0 +1,243 @@
+# services/reminder_store.py
+#
+# Transactional reminder storage (SQLite, WAL mode) replacing whole-file rewrites
+# of reminders.json. Each reminder is one row keyed by task name, with an index
+# on its fire time:
+#
+#   reminder_store.upsert("call mom", "2025-06-01T18:45:00+05:30")
+#   reminder_store.upcoming()      # {task: iso_time} of future reminders, soonest first
+#   reminder_store.delete("call mom")
+#
+# Reads are served from an in-memory time-ordered index (services/reminder_index.py).
+# Every write bumps a generation counter in the same transaction; if the counter
+# moved in a way this process did not cause (e.g. another process wrote), the
+# index is reloaded before the next read.
+#
+# The existing reminders.json is imported once, the first time the store is
+# opened. The JSON file is left in place.
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from pytz import timezone
+
+from services.reminder_index import ReminderIndex
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # logic/src/
+DB_PATH = os.path.join(SRC_DIR, "data", "reminders", "reminders.sqlite")
+LEGACY_JSON = os.path.join(SRC_DIR, "data", "reminders", "reminders.json")
+
+# Reminder times without an offset are local times (same as the scheduler)
+LOCAL_TZ = timezone("Asia/Kolkata")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    task       TEXT PRIMARY KEY,
+    time_iso   TEXT NOT NULL,
+    fire_at    REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_fire_at ON reminders (fire_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def parse_time(iso_time):
+    """Parse an ISO time; naive times are local. Raises ValueError."""
+    reminder_time = datetime.fromisoformat(iso_time)
+    if reminder_time.tzinfo is None:
+        reminder_time = LOCAL_TZ.localize(reminder_time)
+    return reminder_time
+
+
+class ReminderStore:
+    def __init__(self, db_path=DB_PATH, legacy_json=LEGACY_JSON):
+        self.db_path = db_path
+        self.legacy_json = legacy_json
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.index = ReminderIndex()
+        self._index_lock = threading.RLock()
+        self._generation = None  # generation the index reflects (None: not loaded)
+
+    # === CONNECTIONS ===
+    def _connect(self):
+        """One connection per thread; the schema and migration run once per process."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._migrate_json(conn)
+                    self._initialized = True
+        return conn
+
+    def _migrate_json(self, conn):
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        reminders = {}
+        if os.path.exists(self.legacy_json):
+            try:
+                with open(self.legacy_json, "r") as file:
+                    reminders = json.load(file)
+            except (OSError, ValueError) as e:
+                print(f"[Reminders] Could not read {self.legacy_json}: {e}")
+
+        rows = []
+        for task, iso_time in reminders.items():
+            try:
+                rows.append((task, iso_time, parse_time(iso_time).timestamp(), time.time()))
+            except (TypeError, ValueError) as e:
+                print(f"[Reminders] Skipping '{task}' during migration: {e}")
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO reminders VALUES (?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('json_migrated', ?)", (str(time.time()),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if rows:
+            print(f"[Reminders] Migrated {len(rows)} reminder(s) from {os.path.basename(self.legacy_json)}")
+
+    # === INDEX SYNC ===
+    def _db_generation(self, conn):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _write(self, statements, apply):
+        """
+        Run (sql, params) statements and a generation bump in one transaction,
+        then apply(rowcounts) to the index if no other writer got in between.
+        """
+        conn = self._connect()
+        with self._index_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rowcounts = []
+                for sql, params in statements:
+                    if isinstance(params, list):
+                        rowcounts.append(conn.executemany(sql, params).rowcount)
+                    else:
+                        rowcounts.append(conn.execute(sql, params).rowcount)
+                generation = self._db_generation(conn) + 1
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(generation),))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if self._generation is not None and generation == self._generation + 1:
+                apply(rowcounts)
+                self._generation = generation
+            else:
+                self._generation = None  # someone else wrote too: reload on next read
+            return rowcounts
+
+    def _synced_index(self):
+        """The index, reloaded from SQLite if it is missing or stale."""
+        conn = self._connect()
+        with self._index_lock:
+            generation = self._db_generation(conn)
+            if generation != self._generation:
+                self.index.clear()
+                for task, iso_time, fire_at in conn.execute("SELECT task, time_iso, fire_at FROM reminders"):
+                    try:
+                        self.index.put(task, fire_at, parse_time(iso_time), iso_time)
+                    except ValueError as e:
+                        print(f"[Reminders] Bad time for '{task}': {e}")
+                self._generation = generation
+            return self.index
+
+    # === WRITES (one transaction each) ===
+    def upsert(self, task, iso_time):
+        """Insert or replace one reminder; raises ValueError for an invalid time."""
+        reminder_time = parse_time(iso_time)
+        fire_at = reminder_time.timestamp()
+        self._write(
+            [("INSERT INTO reminders (task, time_iso, fire_at, updated_at) VALUES (?, ?, ?, ?) "
+              "ON CONFLICT(task) DO UPDATE SET time_iso = excluded.time_iso, "
+              "fire_at = excluded.fire_at, updated_at = excluded.updated_at",
+              (task, iso_time, fire_at, time.time()))],
+            lambda _: self.index.put(task, fire_at, reminder_time, iso_time),
+        )
+
+    def delete(self, task):
+        """Remove one reminder; True if it existed."""
+        (deleted,) = self._write([("DELETE FROM reminders WHERE task = ?", (task,))],
+                                 lambda _: self.index.remove(task))
+        return deleted > 0
+
+    def purge_expired(self, now=None):
+        """Delete reminders whose time has passed; returns the number removed."""
+        now = time.time() if now is None else now
+        next_fire_at = self._synced_index().next_fire_at()
+        if next_fire_at is None or next_fire_at > now:
+            return 0  # nothing expired: no write at all
+        (deleted,) = self._write([("DELETE FROM reminders WHERE fire_at <= ?", (now,))],
+                                 lambda _: self.index.pop_expired(now))
+        return deleted
+
+    def replace_all(self, reminders):
+        """Replace every reminder with `reminders` ({task: iso_time}) in one transaction."""
+        parsed = {task: parse_time(iso) for task, iso in reminders.items()}
+        rows = [(task, iso, parsed[task].timestamp(), time.time()) for task, iso in reminders.items()]
+
+        def apply(_):
+            self.index.clear()
+            for task, iso, fire_at, _ in rows:
+                self.index.put(task, fire_at, parsed[task], iso)
+
+        self._write([("DELETE FROM reminders", ()), ("INSERT INTO reminders VALUES (?, ?, ?, ?)", rows)], apply)
+
+    # === READS (from the index) ===
+    def get(self, task):
+        return self._synced_index().get(task)
+
+    def all(self):
+        """{task: iso_time} of all reminders, soonest first."""
+        return {task: iso for task, _, iso in self.entries()}
+
+    def entries(self):
+        """[(task, datetime, iso_time)] of all reminders, past ones included, soonest first."""
+        return self._synced_index().upcoming(float("-inf"))
+
+    def upcoming(self, now=None, limit=None):
+        """{task: iso_time} of reminders after `now` (epoch seconds), soonest first."""
+        return {task: iso for task, _, iso in self.upcoming_entries(now, limit)}
+
+    def upcoming_entries(self, now=None, limit=None):
+        """[(task, datetime, iso_time)] after `now`, soonest first."""
+        now = time.time() if now is None else now
+        return self._synced_index().upcoming(now, limit)
+
+    def between(self, start, end, limit=None):
+        """[(task, datetime, iso_time)] with start <= time < end (aware datetimes), soonest first."""
+        return self._synced_index().between(start.timestamp(), end.timestamp(), limit)
+
+    def task_names(self):
+        return self._synced_index().tasks()
+
+    def count(self):
+        return len(self._synced_index())
+
+    def close_matches(self, task, n=1, cutoff=0.5):
+        """Task names similar to `task`, as difflib.get_close_matches over all names would return."""
+        return self._synced_index().names.get_close_matches(task, n=n, cutoff=cutoff)
+
+
+# Shared store (opened on first use)
+reminder_store = ReminderStore()
@@ -0,0 +1,110 @@
+# services/task_matcher.py
+#
+# Fuzzy task-name lookup for "remove/update my reminder to ..." without running
+# difflib over every reminder. Task names are indexed by trigram; a query scores
+# only the names that share the most trigrams with it (and could pass the length
+# bound), using the same SequenceMatcher checks and cutoff as
+# difflib.get_close_matches:
+#
+#   matcher = TrigramIndex()
+#   matcher.add("call mom")
+#   matcher.get_close_matches("cal mum", n=1, cutoff=0.5)   # ["call mom"]
+#
+# This is not an exact drop-in for difflib: names outside the best candidates
+# (e.g. sharing no trigram with the query) are only scored by a full difflib
+# scan, which runs when no candidate passes the cutoff and the index holds
+# EXACT_SCAN_LIMIT names or fewer. For typos and dropped words the results
+# match difflib's.
+import collections
+import difflib
+import heapq
+import os
+import threading
+
+# How many of the best trigram candidates are scored with SequenceMatcher
+MAX_CANDIDATES = int(os.environ.get("ELISA_MATCH_CANDIDATES", "64"))
+EXACT_SCAN_LIMIT = int(os.environ.get("ELISA_MATCH_EXACT_SCAN", "500"))
+
+
+def trigrams(text):
+    """Case-folded trigrams, padded so short names and word starts still count."""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self):
+        self._postings = collections.defaultdict(set)  # trigram -> names
+        self._grams = {}                               # name -> its trigrams
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._grams)
+
+    def __contains__(self, name):
+        return name in self._grams
+
+    def add(self, name):
+        with self._lock:
+            if name in self._grams:
+                return
+            grams = self._grams[name] = trigrams(name)
+            for gram in grams:
+                self._postings[gram].add(name)
+
+    def remove(self, name):
+        with self._lock:
+            for gram in self._grams.pop(name, ()):
+                names = self._postings[gram]
+                names.discard(name)
+                if not names:
+                    del self._postings[gram]
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._grams.clear()
+
+    def candidates(self, query, cutoff=0.5, limit=MAX_CANDIDATES):
+        """Names sharing trigrams with `query`, most similar trigram sets first."""
+        query_grams = trigrams(query)
+        shared = collections.Counter()
+        with self._lock:
+            for gram in query_grams:
+                shared.update(self._postings.get(gram, ()))
+            sizes = {name: len(self._grams[name]) for name in shared}
+
+        scored = []
+        for name, count in shared.items():
+            # Same bound as SequenceMatcher.real_quick_ratio(): a name much longer
+            # or shorter than the query can never reach the cutoff
+            if 2.0 * min(len(name), len(query)) / (len(name) + len(query)) < cutoff:
+                continue
+            scored.append((2.0 * count / (len(query_grams) + sizes[name]), name))
+        return [name for _, name in heapq.nlargest(limit, scored)]
+
+    def get_close_matches(self, query, n=1, cutoff=0.5):
+        """
+        Up to `n` names scoring at least `cutoff` with SequenceMatcher, best first.
+
+        Only the trigram candidates are scored, so a name with a higher ratio but
+        few shared trigrams can lose to a candidate. Only if no candidate passes
+        is every name scanned with difflib.get_close_matches(), and only while
+        there are EXACT_SCAN_LIMIT names or fewer; above that, [] is returned.
+        """
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(query)
+        result = []
+        for name in self.candidates(query, cutoff):
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff and \
+                    matcher.ratio() >= cutoff:
+                result.append((matcher.ratio(), name))
+        if result:
+            return [name for _, name in heapq.nlargest(n, result)]
+
+        with self._lock:
+            if len(self._grams) > EXACT_SCAN_LIMIT:
+                return []
+            names = list(self._grams)
+        return difflib.get_close_matches(query, names, n=n, cutoff=cutoff)
@@ -1,20 +1,33 @@
-import requests
+import os
+import sys
 
-def fetch_weather(location: str) :
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.async_http_client import async_http_client
+
+# Upstream URLs can be pointed at local stand-in servers (e.g. for tests)
+OPENWEATHER_URL = os.environ.get("ELISA_OPENWEATHER_URL", "http://api.openweathermap.org/data/2.5/weather")
+OPENWEATHER_API_KEY = os.environ.get("ELISA_OPENWEATHER_API_KEY", "b80e877092745687574e38e26b612a42")
+IPINFO_URL = os.environ.get("ELISA_IPINFO_URL", "https://ipinfo.io/json")
+
+
+async def fetch_weather(location: str) :
     """Fetches weather data from OpenWeatherMap API"""
-    api_key = "b80e877092745687574e38e26b612a42"  # Replace with your OpenWeatherMap API key
-    base_url = "http://api.openweathermap.org/data/2.5/weather"
-    params = {"q": location, "appid": api_key, "units": "metric"}
+    params = {"q": location, "appid": OPENWEATHER_API_KEY, "units": "metric"}
 
-    response = requests.get(base_url, params=params)
+    try:
+        response = await async_http_client.get("openweathermap", OPENWEATHER_URL, params=params)
+    except Exception as e:
+        print(f"Error fetching weather: {e}")
+        return None
     if response.status_code == 200:
         return response.json()
     return None
 
-def get_user_location() :
+async def get_user_location() :
     """Gets the user's current location based on IP address"""
     try:
-        response = requests.get("https://ipinfo.io/json")
+        response = await async_http_client.get("ipinfo", IPINFO_URL)
         if response.status_code == 200:
             data = response.json()
             return data.get("city", "Unknown")
@@ -0,0 +1,63 @@
+import os
+import re
+import sys
+from urllib.parse import quote
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from shared.async_http_client import async_http_client
+
+# Can be pointed at a local stand-in server (e.g. for tests)
+WIKIPEDIA_URL = os.environ.get("ELISA_WIKIPEDIA_URL", "https://en.wikipedia.org").rstrip("/")
+# Wikimedia asks API clients to identify themselves
+HEADERS = {"User-Agent": "ELISA-Assistant/1.0 (https://github.com/Adikumaw/elisa-assistant)"}
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+
+
+class DisambiguationError(Exception):
+    pass
+
+
+class PageNotFound(Exception):
+    pass
+
+
+async def _page_summary(title):
+    url = f"{WIKIPEDIA_URL}/api/rest_v1/page/summary/{quote(title.replace(' ', '_'), safe='')}"
+    response = await async_http_client.get("wikipedia", url, headers=HEADERS)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+async def _suggest_title(term):
+    """Best matching article title for a search term (like wikipedia's auto_suggest)."""
+    params = {"action": "opensearch", "search": term, "limit": "1", "namespace": "0", "format": "json"}
+    response = await async_http_client.get("wikipedia", f"{WIKIPEDIA_URL}/w/api.php", params=params, headers=HEADERS)
+    response.raise_for_status()
+    titles = response.json()[1]
+    return titles[0] if titles else None
+
+
+async def fetch_summary(term, sentences=1):
+    """
+    First `sentences` sentences of the Wikipedia article for `term`.
+
+    Raises DisambiguationError, PageNotFound, or aiohttp/asyncio errors if
+    Wikipedia is unreachable.
+    """
+    page = await _page_summary(term)
+    if page is None:
+        title = await _suggest_title(term)
+        page = await _page_summary(title) if title else None
+    if page is None:
+        raise PageNotFound(term)
+    if page.get("type") == "disambiguation":
+        raise DisambiguationError(term)
+
+    extract = page.get("extract", "").strip()
+    if not extract:
+        raise PageNotFound(term)
+    return " ".join(SENTENCE_END.split(extract)[:sentences])
@@ -0,0 +1,11 @@
+# logic/tests/conftest.py
+#
+# Run from logic/:  python -m pytest tests
+import os
+import sys
+
+# Add logic/src and the project root to path for imports, like the service does
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SRC_DIR))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, SRC_DIR)
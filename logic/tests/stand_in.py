@@ -0,0 +1,64 @@
+# tests/stand_in.py
+#
+# Local aiohttp servers standing in for upstream services (logic layer,
+# OpenWeatherMap, ipinfo, Wikipedia):
+#
+#   async with stand_in_server({"/process": reply(500)}) as server:
+#       await client.post("logic", server.url + "/process")
+#       server.requests   # ["/process"]
+import asyncio
+import contextlib
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from shared.async_http_client import async_http_client
+
+
+def reply(status=200, body=None, delay=0.0):
+    """Handler answering `status` with `body` as JSON, after `delay` seconds."""
+    async def handler(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.Response(status=status, text=json.dumps(body if body is not None else {}),
+                            content_type="application/json")
+    return handler
+
+
+class StandIn:
+    def __init__(self):
+        self.url = None
+        self.requests = []  # path (with query) of every request received
+
+    def record(self, handler):
+        async def recorded(request):
+            self.requests.append(request.path_qs)
+            return await handler(request)
+        return recorded
+
+
+@contextlib.asynccontextmanager
+async def stand_in_server(routes):
+    """Serve {path: handler} on a free localhost port; yields a StandIn."""
+    stand_in = StandIn()
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_route("*", path, stand_in.record(handler))
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    stand_in.url = str(server.make_url("")).rstrip("/")
+    try:
+        yield stand_in
+    finally:
+        await server.close()
+
+
+def run(coro):
+    """asyncio.run() that also closes the shared client's session for the loop."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await async_http_client.close()
+    return asyncio.run(main())
@@ -0,0 +1,30 @@
+# logic/tests/test_async_http_client.py
+import pytest
+
+from shared.async_http_client import HTTPStatusError, async_http_client
+from stand_in import reply, run, stand_in_server
+
+
+@pytest.mark.parametrize("status", [404, 500, 503])
+def test_raise_for_status_raises_http_status_error(status):
+    async def scenario():
+        async with stand_in_server({"/thing": reply(status)}) as server:
+            response = await async_http_client.get("logic", server.url + "/thing")
+            return server.url, response
+
+    url, response = run(scenario())
+    with pytest.raises(HTTPStatusError) as raised:
+        response.raise_for_status()
+    assert raised.value.status == status
+    assert raised.value.url == url + "/thing"
+    assert str(raised.value) == f"HTTP {status} for {url}/thing"
+
+
+def test_raise_for_status_passes_on_success():
+    async def scenario():
+        async with stand_in_server({"/thing": reply(200, {"ok": True})}) as server:
+            return await async_http_client.get("logic", server.url + "/thing")
+
+    response = run(scenario())
+    response.raise_for_status()
+    assert response.json() == {"ok": True}
@@ -0,0 +1,125 @@
+# logic/tests/test_job_manager.py
+import threading
+import time
+
+import pytest
+
+from services.job_manager import (CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobManager, check_cancelled,
+                                  current_job)
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(lane_workers={"default": 2, "keyboard": 1}, history=3)
+    yield manager
+    manager.shutdown()
+
+
+def wait_for(job):
+    assert job.done_event.wait(5)
+    return job
+
+
+def test_empty_input_is_answered_directly(manager):
+    assert manager.run("type", lambda data: {"text": "What should I type?"}, "", "Typing.") == \
+        {"text": "What should I type?"}
+    assert manager.list() == []
+
+
+def test_quick_job_returns_its_own_response(manager):
+    response = manager.run("open", lambda data: {"text": f"Opened {data}."}, "firefox", "Opening.", wait=2)
+    assert response["text"] == "Opened firefox."
+    assert manager.get(response["job_id"])["status"] == DONE
+
+
+def test_slow_job_returns_the_acknowledgement(manager):
+    release = threading.Event()
+
+    def slow(data):
+        release.wait(5)
+        return {"text": "Typed."}
+
+    response = manager.run("type", slow, "hello", "Typing.", wait=0.05)
+    assert response == {"text": "Typing.", "continue": False, "job_id": response["job_id"]}
+    assert manager.get(response["job_id"])["status"] in (QUEUED, RUNNING)
+    release.set()
+
+
+def test_failures_are_recorded(manager):
+    def broken(data):
+        raise RuntimeError("no such app")
+
+    response = manager.run("open", broken, "nope", "Opening.", wait=2)
+    assert response["text"] == "Opening."
+    job = manager.get(response["job_id"])
+    assert job["status"] == FAILED
+    assert job["error"] == "no such app"
+
+
+def test_keyboard_jobs_run_one_at_a_time(manager):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def typing(data):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return data
+
+    jobs = [manager.submit("type", typing, i, lane="keyboard") for i in range(3)]
+    assert [wait_for(job).result for job in jobs] == [0, 1, 2]
+    assert peak[0] == 1
+
+
+def test_default_lane_runs_jobs_side_by_side(manager):
+    barrier = threading.Barrier(2, timeout=5)
+    jobs = [manager.submit("open", lambda data: barrier.wait(), i) for i in range(2)]
+    assert all(wait_for(job).status == DONE for job in jobs)
+
+
+def test_running_job_stops_at_its_next_check(manager):
+    started, steps = threading.Event(), []
+
+    def steps_job(data):
+        assert current_job().data == data
+        started.set()
+        for step in range(100):
+            check_cancelled()
+            steps.append(step)
+            time.sleep(0.01)
+
+    job = manager.submit("type", steps_job, "hello")
+    assert started.wait(5)
+    assert manager.cancel(job.id)["cancel_requested"] is True
+    assert wait_for(job).status == CANCELLED
+    assert len(steps) < 100
+    assert current_job() is None
+
+
+def test_queued_job_never_starts(manager):
+    release, ran = threading.Event(), []
+    blocker = manager.submit("type", lambda data: release.wait(5), "first", lane="keyboard")
+    queued = manager.submit("type", ran.append, "second", lane="keyboard")
+    assert queued.status == QUEUED
+
+    assert manager.cancel(queued.id)["status"] == CANCELLED
+    release.set()
+    wait_for(blocker)
+    assert ran == []
+
+
+def test_cancel_unknown_or_finished(manager):
+    assert manager.cancel("missing") is None
+    job = wait_for(manager.submit("open", lambda data: {"text": "ok"}, "x"))
+    assert manager.cancel(job.id)["status"] == DONE
+
+
+def test_list_is_newest_first_and_history_is_bounded(manager):
+    jobs = [wait_for(manager.submit("open", lambda data: data, i)) for i in range(5)]
+    listed = manager.list()
+    assert [job["id"] for job in listed] == [job.id for job in reversed(jobs[-3:])]
+    assert manager.get(jobs[0].id) is None
+    assert manager.get(jobs[-1].id)["result"] == 4
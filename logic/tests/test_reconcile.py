@@ -0,0 +1,117 @@
+# logic/tests/test_reconcile.py
+import sys
+import types
+from datetime import datetime
+
+import pytest
+
+from scheduler import reminder_timer, scheduler_core
+from scheduler.reminder_timer import ReminderTimer
+from services import reminder_store as reminder_store_module
+from services.reminder_store import LOCAL_TZ, ReminderStore
+
+NOW = 1_900_000_000.0
+OFFSETS = (600, 0)
+
+
+def iso_at(epoch):
+    return datetime.fromtimestamp(epoch, LOCAL_TZ).isoformat()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ReminderStore(db_path=str(tmp_path / "reminders.sqlite"), legacy_json=str(tmp_path / "reminders.json"))
+    monkeypatch.setattr(reminder_store_module, "reminder_store", store)
+    # reconcile() only needs the offsets from reminder_manager, which plays audio on import
+    manager = types.ModuleType("services.reminder_manager")
+    manager.REMINDER_OFFSETS = OFFSETS
+    monkeypatch.setitem(sys.modules, "services.reminder_manager", manager)
+    return store
+
+
+@pytest.fixture
+def timer(tmp_path, monkeypatch):
+    monkeypatch.setattr(reminder_timer, "time", FakeClock(NOW))
+    timer = ReminderTimer(db_path=str(tmp_path / "timers.sqlite"))
+    timer.executing = True
+    monkeypatch.setattr(scheduler_core, "scheduler", timer)
+    return timer
+
+
+def test_in_sync_needs_no_repairs(store, timer):
+    store.upsert("tea", iso_at(NOW + 3600))
+    timer.schedule("tea", NOW + 3600, offsets=OFFSETS)
+    assert scheduler_core.reconcile(now=NOW) == {"orphans": 0, "scheduled": 0, "stale": 0, "missed": 0}
+
+
+def test_orphan_timers_are_cancelled(store, timer):
+    timer.schedule("deleted elsewhere", NOW + 3600)
+    assert scheduler_core.reconcile(now=NOW)["orphans"] == 1
+    assert timer.get("deleted elsewhere") is None
+
+
+def test_missing_and_moved_timers_are_rescheduled(store, timer):
+    store.upsert("no timer", iso_at(NOW + 3600))
+    store.upsert("moved", iso_at(NOW + 7200))
+    timer.schedule("moved", NOW + 1800)
+
+    assert scheduler_core.reconcile(now=NOW)["scheduled"] == 2
+    assert timer.get("no timer") == {"task": "no timer", "run_at": NOW + 3600, "offsets": [600.0, 0.0],
+                                     "next_fire_at": NOW + 3000}
+    assert timer.get("moved")["run_at"] == NOW + 7200
+
+
+def test_past_reminders_after_the_timer_was_alive_are_missed(store, timer):
+    timer.set_meta("alive_at", NOW - 1000)
+    store.upsert("while down", iso_at(NOW - 500))
+    store.upsert("before", iso_at(NOW - 2000))
+
+    repairs = scheduler_core.reconcile(now=NOW)
+    assert repairs["missed"] == 1
+    assert timer._missed == [("while down", NOW - 500)]
+
+
+def test_a_past_reminder_with_a_stale_timer_is_cancelled_and_missed(store, timer):
+    timer.set_meta("alive_at", NOW - 1000)
+    store.upsert("tea", iso_at(NOW - 500))
+    timer._entries["tea"] = reminder_timer.TimerEntry("tea", NOW + 100, OFFSETS)  # out of date
+
+    repairs = scheduler_core.reconcile(now=NOW)
+    assert repairs["stale"] == 1 and repairs["missed"] == 1
+    assert timer.get("tea") is None
+
+
+def test_first_start_reports_nothing_missed(store, timer):
+    store.upsert("tea", iso_at(NOW - 500))
+    assert timer.alive_at() is None
+    assert scheduler_core.reconcile(now=NOW)["missed"] == 0
+
+
+def test_a_reminder_reported_twice_is_notified_once(store, timer):
+    # The timer's load() and reconcile() can both report the same reminder
+    timer.set_meta("alive_at", NOW - 1000)
+    store.upsert("tea", iso_at(NOW - 500))
+    timer.add_missed([("tea", NOW - 500)])
+    scheduler_core.reconcile(now=NOW)
+
+    batches = []
+    timer.on_missed = batches.append
+    missed, timer._missed = timer._missed, []
+    timer._fire_missed(missed)
+    assert batches == [[("tea", NOW - 500)]]
+
+
+def test_reconcile_is_idempotent(store, timer):
+    timer.set_meta("alive_at", NOW - 1000)
+    store.upsert("tea", iso_at(NOW + 3600))
+    timer.schedule("orphan", NOW + 100)
+    scheduler_core.reconcile(now=NOW)
+    assert scheduler_core.reconcile(now=NOW) == {"orphans": 0, "scheduled": 0, "stale": 0, "missed": 0}
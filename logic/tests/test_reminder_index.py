@@ -0,0 +1,118 @@
+# logic/tests/test_reminder_index.py
+from datetime import datetime
+
+import pytest
+
+from services.reminder_index import ReminderIndex
+from services.reminder_store import LOCAL_TZ, ReminderStore
+
+NOW = 1_900_000_000.0
+
+
+def put(index, task, fire_at):
+    index.put(task, fire_at, datetime.fromtimestamp(fire_at, LOCAL_TZ), f"iso:{task}")
+
+
+def tasks(entries):
+    return [task for task, _, _ in entries]
+
+
+@pytest.fixture
+def index():
+    index = ReminderIndex()
+    put(index, "c", NOW + 30)
+    put(index, "a", NOW + 10)
+    put(index, "b", NOW + 20)
+    return index
+
+
+def test_kept_in_fire_time_order(index):
+    assert index.tasks() == ["a", "b", "c"]
+    assert index.next_fire_at() == NOW + 10
+
+
+def test_equal_times_are_ordered_by_name():
+    index = ReminderIndex()
+    for task in ["zebra", "apple", "mango"]:
+        put(index, task, NOW)
+    assert index.tasks() == ["apple", "mango", "zebra"]
+
+
+def test_put_replaces_an_existing_task(index):
+    put(index, "c", NOW + 5)
+    assert index.tasks() == ["c", "a", "b"]
+    assert len(index) == 3
+
+
+def test_remove(index):
+    assert index.remove("b") is True
+    assert index.remove("b") is False
+    assert index.tasks() == ["a", "c"]
+    assert index.names.get_close_matches("b") == []
+
+
+def test_upcoming_is_strictly_after_now(index):
+    assert tasks(index.upcoming(NOW + 10)) == ["b", "c"]
+    assert tasks(index.upcoming(NOW, limit=2)) == ["a", "b"]
+    assert index.upcoming(NOW + 30) == []
+
+
+def test_between_is_half_open(index):
+    assert tasks(index.between(NOW + 10, NOW + 30)) == ["a", "b"]
+    assert tasks(index.between(NOW + 10, NOW + 30, limit=1)) == ["a"]
+    assert index.between(NOW + 31, NOW + 100) == []
+
+
+def test_pop_expired_includes_now(index):
+    assert index.pop_expired(NOW + 20) == ["a", "b"]
+    assert index.tasks() == ["c"]
+    assert index.get("a") is None
+    assert index.pop_expired(NOW + 20) == []
+
+
+def test_entries_carry_time_and_iso(index):
+    task, reminder_time, iso = index.upcoming(NOW)[0]
+    assert (task, reminder_time.timestamp(), iso) == ("a", NOW + 10, "iso:a")
+
+
+# === STORE <-> INDEX SYNC ===
+@pytest.fixture
+def stores(tmp_path):
+    """Two stores on one database, like the logic service and the action server."""
+    db_path, legacy = str(tmp_path / "reminders.sqlite"), str(tmp_path / "missing.json")
+    return ReminderStore(db_path, legacy), ReminderStore(db_path, legacy)
+
+
+def iso_at(epoch):
+    return datetime.fromtimestamp(epoch, LOCAL_TZ).isoformat()
+
+
+def test_writes_from_another_store_are_seen(stores):
+    first, second = stores
+    first.upsert("tea", iso_at(NOW + 100))
+    assert second.all() == {"tea": iso_at(NOW + 100)}
+
+    second.upsert("coffee", iso_at(NOW + 50))
+    second.delete("tea")
+    assert first.all() == {"coffee": iso_at(NOW + 50)}
+
+
+def test_own_writes_update_the_index_without_reloading(stores, monkeypatch):
+    first, _ = stores
+    first.upsert("tea", iso_at(NOW + 100))
+    first.all()  # loaded
+
+    reloads = []
+    monkeypatch.setattr(first.index, "clear", lambda: reloads.append(True))
+    first.upsert("coffee", iso_at(NOW + 50))
+    assert list(first.all()) == ["coffee", "tea"]
+    assert reloads == []
+
+
+def test_interleaved_writes_force_a_reload(stores):
+    first, second = stores
+    first.upsert("tea", iso_at(NOW + 100))
+    first.all()
+    second.upsert("coffee", iso_at(NOW + 50))
+    first.upsert("juice", iso_at(NOW + 10))  # first's index missed "coffee"
+    assert list(first.all()) == ["juice", "coffee", "tea"]
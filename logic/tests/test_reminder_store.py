@@ -0,0 +1,116 @@
+# logic/tests/test_reminder_store.py
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+import pytest
+
+from services.reminder_store import LOCAL_TZ, ReminderStore, parse_time
+
+NOW = 1_900_000_000.0  # 2030-03-17 (UTC), well after every fixed time below
+
+
+def iso_at(epoch):
+    return datetime.fromtimestamp(epoch, LOCAL_TZ).isoformat()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReminderStore(db_path=str(tmp_path / "reminders.sqlite"), legacy_json=str(tmp_path / "reminders.json"))
+
+
+def test_imports_legacy_json_once(tmp_path):
+    legacy = tmp_path / "reminders.json"
+    legacy.write_text(json.dumps({"tea": "2030-06-01T18:45:00+05:30", "bad": "not a time"}))
+    db_path = str(tmp_path / "reminders.sqlite")
+
+    store = ReminderStore(db_path=db_path, legacy_json=str(legacy))
+    assert store.all() == {"tea": "2030-06-01T18:45:00+05:30"}
+
+    # Later edits to the JSON file are not imported again
+    legacy.write_text(json.dumps({"coffee": "2030-06-02T08:00:00+05:30"}))
+    store.delete("tea")
+    assert ReminderStore(db_path=db_path, legacy_json=str(legacy)).all() == {}
+
+
+def test_upsert_get_and_update(store):
+    store.upsert("tea", "2030-06-01T18:45:00+05:30")
+    assert store.get("tea") == "2030-06-01T18:45:00+05:30"
+    store.upsert("tea", "2030-06-02T09:00:00+05:30")
+    assert store.get("tea") == "2030-06-02T09:00:00+05:30"
+    assert store.count() == 1
+    assert store.get("coffee") is None
+
+
+def test_naive_times_are_local():
+    assert parse_time("2030-06-01T18:45:00").utcoffset() == parse_time("2030-06-01T18:45:00+05:30").utcoffset()
+
+
+def test_invalid_time_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.upsert("tea", "at half past")
+    assert store.count() == 0
+
+
+def test_reads_are_soonest_first(store):
+    store.upsert("late", iso_at(NOW + 300))
+    store.upsert("early", iso_at(NOW + 100))
+    store.upsert("middle", iso_at(NOW + 200))
+    assert list(store.all()) == ["early", "middle", "late"]
+    store.upsert("late", iso_at(NOW + 50))  # moved to the front
+    assert list(store.all()) == ["late", "early", "middle"]
+
+
+def test_delete(store):
+    store.upsert("tea", iso_at(NOW + 100))
+    assert store.delete("tea") is True
+    assert store.delete("tea") is False
+    assert store.all() == {}
+
+
+def test_purge_expired(store):
+    store.upsert("past", iso_at(NOW - 10))
+    store.upsert("now", iso_at(NOW))
+    store.upsert("future", iso_at(NOW + 10))
+    assert store.purge_expired(now=NOW) == 2
+    assert list(store.all()) == ["future"]
+
+
+def test_purge_without_expired_reminders_does_not_write(store):
+    store.upsert("future", iso_at(NOW + 10))
+    conn = sqlite3.connect(store.db_path)
+    generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    assert store.purge_expired(now=NOW) == 0
+    assert conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone() == generation
+
+
+def test_upcoming_and_between(store):
+    for i, task in enumerate(["a", "b", "c", "d"]):
+        store.upsert(task, iso_at(NOW + 100 * i))
+    assert list(store.upcoming(now=NOW)) == ["b", "c", "d"]  # strictly after now
+    assert list(store.upcoming(now=NOW, limit=2)) == ["b", "c"]
+    start = parse_time(iso_at(NOW + 100))
+    end = parse_time(iso_at(NOW + 300))
+    assert [task for task, _, _ in store.between(start, end)] == ["b", "c"]  # end is exclusive
+
+
+def test_replace_all(store):
+    store.upsert("old", iso_at(NOW + 100))
+    store.replace_all({"x": iso_at(NOW + 200), "y": iso_at(NOW + 50)})
+    assert list(store.all()) == ["y", "x"]
+
+
+def test_rows_survive_reopening(store):
+    store.upsert("tea", iso_at(NOW + 100))
+    reopened = ReminderStore(db_path=store.db_path, legacy_json=store.legacy_json)
+    assert reopened.all() == store.all()
+    row = sqlite3.connect(store.db_path).execute("SELECT fire_at FROM reminders WHERE task = 'tea'").fetchone()
+    assert row == (NOW + 100,)
+
+
+def test_close_matches(store):
+    store.upsert("call mom", iso_at(time.time() + 100))
+    store.upsert("pay rent", iso_at(time.time() + 200))
+    assert store.close_matches("cal mum") == ["call mom"]
+    assert store.close_matches("feed the cat") == []
@@ -0,0 +1,189 @@
+# logic/tests/test_reminder_timer.py
+import threading
+import time
+
+import pytest
+
+from scheduler import reminder_timer
+from scheduler.reminder_timer import LATE_GRACE, ReminderTimer
+
+NOW = 1_900_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(NOW)
+    monkeypatch.setattr(reminder_timer, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "timers.sqlite")
+
+
+@pytest.fixture
+def timer(db_path):
+    # Not started: the tests drive _pop_due() and flush() themselves
+    timer = ReminderTimer(db_path=db_path)
+    timer.executing = True
+    return timer
+
+
+def test_one_entry_fires_at_every_offset(clock, timer):
+    timer.schedule("tea", NOW + 3600, offsets=(0, 600))
+    assert timer.get("tea")["next_fire_at"] == NOW + 3000
+    assert len(timer._heap) == 1
+
+    assert timer._pop_due(NOW + 2999) == []
+    assert timer._pop_due(NOW + 3000) == [("tea", 600)]
+    assert timer.get("tea")["next_fire_at"] == NOW + 3600
+    assert timer._pop_due(NOW + 3600) == [("tea", 0)]
+    assert timer.get("tea") is None
+
+
+def test_reschedule_skips_the_old_fire_time(clock, timer):
+    timer.schedule("tea", NOW + 100)
+    timer.schedule("tea", NOW + 500)
+    assert timer._pop_due(NOW + 100) == []
+    assert timer._pop_due(NOW + 500) == [("tea", 0)]
+
+
+def test_cancel(clock, timer):
+    timer.schedule("tea", NOW + 100)
+    assert timer.cancel("tea") is True
+    assert timer.cancel("tea") is False
+    assert timer._pop_due(NOW + 100) == []
+    assert len(timer) == 0
+
+
+def test_offsets_already_past_are_skipped_when_scheduling(clock, timer):
+    # The 10-minute warning is already past; only the on-time fire is left
+    timer.schedule("tea", NOW + 300, offsets=(600, 0))
+    assert timer.get("tea")["next_fire_at"] == NOW + 300
+    # Nothing left to fire at all
+    assert timer.schedule("coffee", NOW - 10) is None
+    assert timer.get("coffee") is None
+
+
+def test_schedule_many_and_cancel_many(clock, timer):
+    count = timer.schedule_many([("a", NOW + 300), ("b", NOW + 100), ("gone", NOW - 10)])
+    assert count == 2
+    assert timer._pop_due(NOW + 100) == [("b", 0)]
+    assert timer.cancel_many(["a", "missing"]) == 1
+    assert timer._pop_due(NOW + 300) == []
+
+
+def test_late_fires_are_coalesced_into_one_missed_reminder(clock, timer):
+    timer.schedule("tea", NOW + 3600, offsets=(600, 0))
+    # Woke up long after both fires (e.g. after a suspend)
+    late = NOW + 3600 + LATE_GRACE + 1
+    assert timer._pop_due(late) == []
+    assert timer._missed == [("tea", NOW + 3600)]
+    assert timer.get("tea") is None
+
+
+def test_a_fire_within_the_late_grace_still_plays(clock, timer):
+    timer.schedule("tea", NOW + 100)
+    assert timer._pop_due(NOW + 100 + LATE_GRACE - 1) == [("tea", 0)]
+    assert timer._missed == []
+
+
+def test_changes_are_written_behind(clock, timer, db_path):
+    timer.schedule("tea", NOW + 3600, offsets=(600, 0))
+    timer.schedule("coffee", NOW + 100)
+    timer.cancel("coffee")
+    assert ReminderTimer(db_path=db_path).load() == 0
+
+    assert timer.flush() == 2
+    assert timer.flush() == 0
+    other = ReminderTimer(db_path=db_path)
+    assert other.load() == 1
+    assert other.get("tea") == timer.get("tea")
+
+    # Fired offsets are persisted too
+    timer._pop_due(NOW + 3000)
+    timer.flush()
+    other.load()
+    assert other.get("tea")["next_fire_at"] == NOW + 3600
+
+
+def test_load_keeps_changes_made_after_the_flush(clock, timer, db_path):
+    timer.schedule("tea", NOW + 100)
+    timer.flush()
+    timer.schedule("tea", NOW + 200)
+    timer.flush = lambda: 0  # the pending change has not been written yet
+    timer.load()
+    assert timer.get("tea")["run_at"] == NOW + 200
+
+
+def test_load_reports_reminders_missed_while_down(clock, timer, db_path):
+    timer.schedule("tea", NOW + 100, offsets=(600, 0))
+    timer.schedule("coffee", NOW + 7200)
+    timer.flush()
+
+    clock.now = NOW + 100 + LATE_GRACE + 1
+    restarted = ReminderTimer(db_path=db_path)
+    restarted.executing = True
+    assert restarted.load() == 1
+    assert restarted._missed == [("tea", NOW + 100)]
+    assert restarted.get("coffee") is not None
+
+
+def test_a_paused_timer_does_not_decide_what_was_missed(clock, timer, db_path):
+    timer.schedule("tea", NOW + 100)
+    timer.flush()
+    clock.now = NOW + 100 + LATE_GRACE + 1
+    paused = ReminderTimer(db_path=db_path)
+    paused.load()
+    assert paused._missed == []
+
+
+def test_missed_batch_is_deduplicated_sorted_and_windowed(clock, timer):
+    batches = []
+    timer.on_missed = batches.append
+    old = NOW - reminder_timer.CATCH_UP_WINDOW - 1
+    timer._fire_missed([("tea", NOW - 100), ("coffee", NOW - 300), ("tea", NOW - 50), ("ancient", old)])
+    assert batches == [[("coffee", NOW - 300), ("tea", NOW - 50)]]
+
+    timer._fire_missed([("ancient", old)])
+    assert len(batches) == 1
+
+
+def test_meta_round_trip(clock, timer):
+    assert timer.alive_at() is None
+    timer._touch_alive()
+    assert timer.alive_at() == NOW
+
+
+def test_timer_thread_fires_and_flushes_on_shutdown(db_path):
+    fired = threading.Event()
+    calls = []
+
+    def callback(task, offset):
+        calls.append((task, offset))
+        fired.set()
+
+    timer = ReminderTimer(db_path=db_path, callback=callback, poll_interval=60, flush_delay=60)
+    timer.start()
+    try:
+        timer.schedule("tea", time.time() + 0.2)
+        timer.schedule("coffee", time.time() + 600)
+        assert fired.wait(5)
+    finally:
+        timer.shutdown()
+    assert calls == [("tea", 0)]
+
+    # The flush delay never passed; shutdown() wrote the pending changes
+    restarted = ReminderTimer(db_path=db_path)
+    assert restarted.load() == 1
+    assert restarted.get("coffee") is not None
+    assert restarted.alive_at() is not None
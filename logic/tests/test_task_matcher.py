@@ -0,0 +1,73 @@
+# logic/tests/test_task_matcher.py
+import difflib
+import json
+import os
+import random
+
+import pytest
+
+from benchmarks.bench_task_match import generate_queries, generate_tasks
+from services import task_matcher
+from services.task_matcher import TrigramIndex
+
+REMINDERS_JSON = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "src", "data", "reminders", "reminders.json")
+
+
+def index_of(names):
+    index = TrigramIndex()
+    for name in names:
+        index.add(name)
+    return index
+
+
+def test_matches_difflib_on_saved_reminders():
+    with open(REMINDERS_JSON) as f:
+        names = list(json.load(f))
+    index = index_of(names)
+    for query in ["call akash", "cal Akash", "meeting", "meting", "tea", "the tea", "coffee", "xyz"]:
+        assert index.get_close_matches(query, n=1, cutoff=0.5) == \
+            difflib.get_close_matches(query, names, n=1, cutoff=0.5), query
+
+
+@pytest.mark.parametrize("count", [200, 2000])
+def test_matches_difflib_on_generated_reminders(count):
+    # Same fixture as benchmarks/bench_task_match.py: typos, dropped words, unknown names
+    rng = random.Random(count)
+    names = generate_tasks(count, rng)
+    queries = generate_queries(names, 50, rng)
+    index = index_of(names)
+    for query in queries:
+        assert index.get_close_matches(query, n=1, cutoff=0.5) == \
+            difflib.get_close_matches(query, names, n=1, cutoff=0.5), query
+
+
+def test_every_result_passes_the_cutoff():
+    rng = random.Random(1)
+    names = generate_tasks(300, rng)
+    index = index_of(names)
+    for query in generate_queries(names, 50, rng):
+        for name in index.get_close_matches(query, n=3, cutoff=0.6):
+            # Same argument order as difflib.get_close_matches (ratio() is not symmetric)
+            assert difflib.SequenceMatcher(None, name, query).ratio() >= 0.6
+
+
+def test_small_index_falls_back_to_difflib_scan():
+    # "ab" and "ba" share no trigram, but difflib scores them 0.5
+    index = index_of(["ba", "call mom"])
+    assert index.candidates("ab") == []
+    assert index.get_close_matches("ab", n=1, cutoff=0.5) == ["ba"]
+
+
+def test_large_index_skips_the_difflib_scan(monkeypatch):
+    monkeypatch.setattr(task_matcher, "EXACT_SCAN_LIMIT", 1)
+    index = index_of(["ba", "call mom"])
+    assert difflib.get_close_matches("ab", ["ba", "call mom"], n=1, cutoff=0.5) == ["ba"]
+    assert index.get_close_matches("ab", n=1, cutoff=0.5) == []
+
+
+def test_removed_names_are_not_matched():
+    index = index_of(["call mom", "call dad"])
+    index.remove("call mom")
+    assert "call mom" not in index
+    assert index.get_close_matches("cal mom", n=2, cutoff=0.5) == ["call dad"]
@@ -0,0 +1,85 @@
+# logic/tests/test_weather_info.py
+import pytest
+
+from services import weather_info
+from shared.async_http_client import async_http_client
+from shared.http_client import EndpointPolicy
+from stand_in import reply, run, stand_in_server
+
+WEATHER = {"main": {"temp": 21.5}, "weather": [{"description": "light rain"}]}
+
+
+@pytest.fixture(autouse=True)
+def fast_policies(monkeypatch):
+    # Short read timeout and backoff so timeouts and retries are quick
+    for endpoint in ("openweathermap", "ipinfo"):
+        monkeypatch.setitem(async_http_client.endpoints, endpoint, EndpointPolicy(
+            connect_timeout=1, read_timeout=0.3, retries=2, idempotent=True, backoff=0.01))
+
+
+def fetch_weather(monkeypatch, handler, location="Pune"):
+    async def scenario():
+        async with stand_in_server({"/weather": handler}) as server:
+            monkeypatch.setattr(weather_info, "OPENWEATHER_URL", server.url + "/weather")
+            return await weather_info.fetch_weather(location), server.requests
+    return run(scenario())
+
+
+def get_user_location(monkeypatch, handler):
+    async def scenario():
+        async with stand_in_server({"/json": handler}) as server:
+            monkeypatch.setattr(weather_info, "IPINFO_URL", server.url + "/json")
+            return await weather_info.get_user_location(), server.requests
+    return run(scenario())
+
+
+def test_weather_ok(monkeypatch):
+    data, requests = fetch_weather(monkeypatch, reply(200, WEATHER))
+    assert data == WEATHER
+    assert len(requests) == 1
+    assert "q=Pune" in requests[0] and "units=metric" in requests[0]
+
+
+def test_weather_unknown_city(monkeypatch):
+    data, requests = fetch_weather(monkeypatch, reply(404, {"cod": "404", "message": "city not found"}))
+    assert data is None
+    assert len(requests) == 1
+
+
+def test_weather_rate_limited(monkeypatch):
+    data, requests = fetch_weather(monkeypatch, reply(429))
+    assert data is None
+    assert len(requests) == 1  # 429 is not retried
+
+
+def test_weather_server_error_is_retried(monkeypatch):
+    data, requests = fetch_weather(monkeypatch, reply(503))
+    assert data is None
+    assert len(requests) == 3  # idempotent: two retries
+
+
+def test_weather_timeout(monkeypatch):
+    data, requests = fetch_weather(monkeypatch, reply(200, WEATHER, delay=1.0))
+    assert data is None
+    assert len(requests) == 3
+
+
+def test_location_ok(monkeypatch):
+    city, _ = get_user_location(monkeypatch, reply(200, {"city": "Pune", "country": "IN"}))
+    assert city == "Pune"
+
+
+def test_location_without_city(monkeypatch):
+    city, _ = get_user_location(monkeypatch, reply(200, {"country": "IN"}))
+    assert city == "Unknown"
+
+
+@pytest.mark.parametrize("status", [404, 429, 500])
+def test_location_errors(monkeypatch, status):
+    city, _ = get_user_location(monkeypatch, reply(status))
+    assert city is None
+
+
+def test_location_timeout(monkeypatch):
+    city, _ = get_user_location(monkeypatch, reply(200, {"city": "Pune"}, delay=1.0))
+    assert city is None
@@ -0,0 +1,101 @@
+# logic/tests/test_wikipedia_info.py
+import asyncio
+
+import pytest
+
+from services import wikipedia_info
+from services.wikipedia_info import DisambiguationError, PageNotFound
+from shared.async_http_client import HTTPStatusError, async_http_client
+from shared.http_client import EndpointPolicy
+from stand_in import reply, run, stand_in_server
+
+SUMMARY = "/api/rest_v1/page/summary/{}"
+SEARCH = "/w/api.php"
+
+
+def page(extract, kind="standard"):
+    return {"type": kind, "extract": extract}
+
+
+@pytest.fixture(autouse=True)
+def fast_policy(monkeypatch):
+    monkeypatch.setitem(async_http_client.endpoints, "wikipedia", EndpointPolicy(
+        connect_timeout=1, read_timeout=0.3, retries=2, idempotent=True, backoff=0.01))
+
+
+def fetch_summary(monkeypatch, routes, term):
+    async def scenario():
+        async with stand_in_server(routes) as server:
+            monkeypatch.setattr(wikipedia_info, "WIKIPEDIA_URL", server.url)
+            try:
+                return await wikipedia_info.fetch_summary(term), server.requests
+            except Exception as e:
+                return e, server.requests
+    return run(scenario())
+
+
+def test_summary_first_sentence(monkeypatch):
+    routes = {SUMMARY.format("Python_(programming_language)"):
+              reply(200, page("Python is a programming language. It was created by Guido."))}
+    result, requests = fetch_summary(monkeypatch, routes, "Python (programming language)")
+    assert result == "Python is a programming language."
+    assert len(requests) == 1
+
+
+def test_summary_falls_back_to_search(monkeypatch):
+    routes = {
+        SUMMARY.format("photosynthesys"): reply(404),
+        SEARCH: reply(200, ["photosynthesys", ["Photosynthesis"], [""], [""]]),
+        SUMMARY.format("Photosynthesis"): reply(200, page("Photosynthesis turns light into energy. More.")),
+    }
+    result, requests = fetch_summary(monkeypatch, routes, "photosynthesys")
+    assert result == "Photosynthesis turns light into energy."
+    assert len(requests) == 3
+
+
+def test_summary_not_found(monkeypatch):
+    routes = {SUMMARY.format("qwzx"): reply(404), SEARCH: reply(200, ["qwzx", [], [], []])}
+    result, _ = fetch_summary(monkeypatch, routes, "qwzx")
+    assert isinstance(result, PageNotFound)
+
+
+def test_summary_disambiguation(monkeypatch):
+    routes = {SUMMARY.format("Mercury"): reply(200, page("Mercury may refer to:", kind="disambiguation"))}
+    result, _ = fetch_summary(monkeypatch, routes, "Mercury")
+    assert isinstance(result, DisambiguationError)
+
+
+def test_summary_rate_limited(monkeypatch):
+    result, requests = fetch_summary(monkeypatch, {SUMMARY.format("Mercury"): reply(429)}, "Mercury")
+    assert isinstance(result, HTTPStatusError)
+    assert result.status == 429
+    assert "HTTP 429" in str(result)
+    assert len(requests) == 1
+
+
+def test_summary_server_error_is_retried(monkeypatch):
+    result, requests = fetch_summary(monkeypatch, {SUMMARY.format("Mercury"): reply(503)}, "Mercury")
+    assert isinstance(result, HTTPStatusError)
+    assert result.status == 503
+    assert len(requests) == 3
+
+
+def test_summary_timeout(monkeypatch):
+    routes = {SUMMARY.format("Mercury"): reply(200, page("Mercury is a planet."), delay=1.0)}
+    result, requests = fetch_summary(monkeypatch, routes, "Mercury")
+    assert isinstance(result, asyncio.TimeoutError)
+    assert len(requests) == 3
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_meaning_of_answers_when_wikipedia_fails(monkeypatch, status):
+    pytest.importorskip("pynput")
+    from routes.logic import meaning_of
+
+    async def scenario():
+        async with stand_in_server({SUMMARY.format("Mercury"): reply(status)}) as server:
+            monkeypatch.setattr(wikipedia_info, "WIKIPEDIA_URL", server.url)
+            return await meaning_of("Mercury")
+
+    assert run(scenario()) == {"text": "I couldn't reach Wikipedia right now. Please try again later.",
+                               "continue": False}
@@ -2,20 +2,20 @@
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet
-from .logic_integration import process
+from .logic_integration import process_async
 from typing import Any, Text, Dict, List
 
 class ActionOpenApp(Action):
     def name(self) -> str:
         return "action_open_app"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
         app_name = tracker.get_slot("app_name")
         
         if not app_name:
             app_name = ""
 
-        response = process("OPEN_APP", app_name)
+        response = await process_async("OPEN_APP", app_name)
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -24,7 +24,7 @@ class ActionSearchFirefox(Action):
     def name(self) -> str:
         return "action_search_firefox"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
         query = tracker.get_slot("query")
 
         # Collect all query entities into a single query
@@ -40,7 +40,7 @@ class ActionSearchFirefox(Action):
         if not query:
             query = ""
         
-        response = process("SEARCH_BROWSER", query)
+        response = await process_async("SEARCH_BROWSER", query)
         dispatcher.utter_message(json_message=response)
         
         return []
@@ -49,7 +49,7 @@ class ActionTypeWhatISay(Action):
     def name(self) -> Text:
         return "action_type_what_i_say"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         text_to_type = next(tracker.get_latest_entity_values("text"), None)
 
         # Collect all text entities into a single text
@@ -65,7 +65,7 @@ class ActionTypeWhatISay(Action):
         if not text_to_type:
             text_to_type = ""
 
-        response = process("TYPE_TEXT", text_to_type)
+        response = await process_async("TYPE_TEXT", text_to_type)
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -74,9 +74,9 @@ class ActionCurrentDateTime(Action):
     def name(self) -> str:
         return "action_current_date_time"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
 
-        response = process("GET_CURRENT_TIME", "")
+        response = await process_async("GET_CURRENT_TIME", "")
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -85,13 +85,13 @@ class ActionMeaningOf(Action):
     def name(self) -> str:
         return "action_meaning_of"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict) -> list:
         word = tracker.get_slot("words")
 
         if not word:
             word = ""
 
-        response = process("GET_MEANING", word)
+        response = await process_async("GET_MEANING", word)
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -100,13 +100,13 @@ class ActionOpenBrowser(Action):
     def name(self) -> str:
         return "action_open_browser"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict):
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict):
         term = tracker.get_slot("words") # TODO may need to change to last_word
 
         if not term:
             term = ""
 
-        response = process("OPEN_BROWSER", term)
+        response = await process_async("OPEN_BROWSER", term)
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -115,7 +115,7 @@ class ActionWeatherUpdate(Action):
     def name(self) -> Text:
         return "action_weather_update"
 
-    def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: Dict[Text, Any]):
         # Extract location entity from user input
         location = None
         for entity in tracker.latest_message.get("entities", []):
@@ -127,7 +127,7 @@ class ActionWeatherUpdate(Action):
         if not location:
             location = ""
 
-        response = process("GET_WEATHER", location)
+        response = await process_async("GET_WEATHER", location)
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -136,7 +136,7 @@ class ActionSetReminder(Action):
     def name(self) -> Text:
         return "action_set_reminder"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
@@ -145,9 +145,9 @@ class ActionSetReminder(Action):
 
         if not task or not time_value:
             task = time_value = ""
-            response = process("SET_REMINDER", "")
+            response = await process_async("SET_REMINDER", "")
         else:
-            response = process("SET_REMINDER", f"{task}||{time_value}")
+            response = await process_async("SET_REMINDER", f"{task}||{time_value}")
 
         dispatcher.utter_message(json_message=response)
 
@@ -157,11 +157,11 @@ class ActionListReminders(Action):
     def name(self) -> Text:
         return "action_list_reminders"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        response = process("LIST_REMINDERS", "")
+        response = await process_async("LIST_REMINDERS", "")
         dispatcher.utter_message(json_message=response)
 
         return []
@@ -170,7 +170,7 @@ class ActionRemoveReminder(Action):
     def name(self) -> Text:
         return "action_remove_reminder"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
@@ -179,7 +179,7 @@ class ActionRemoveReminder(Action):
         if not task:
             task = ""
         
-        response = process("REMOVE_REMINDER", task)
+        response = await process_async("REMOVE_REMINDER", task)
         dispatcher.utter_message(json_message=response)
         
         return []
@@ -188,7 +188,7 @@ class ActionUpdateReminder(Action):
     def name(self) -> Text:
         return "action_update_reminder"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
@@ -198,11 +198,11 @@ class ActionUpdateReminder(Action):
 
         if not task or not new_time:
             task = new_time = ""
-            response = process("UPDATE_REMINDER", "")
+            response = await process_async("UPDATE_REMINDER", "")
             dispatcher.utter_message(text="Please specify both the task and the new time.")
             return []
         else: 
-            response = process("UPDATE_REMINDER", f"{task}||{new_time}")
+            response = await process_async("UPDATE_REMINDER", f"{task}||{new_time}")
             
         dispatcher.utter_message(json_message=response)
 
@@ -1,6 +1,164 @@
+import asyncio
+import os
+import sys
+import threading
+
+import aiohttp
 import requests
 
+# Add project root to path for imports
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+from shared.http_client import http_client
+from shared.async_http_client import async_http_client
+
+ASYNC_HTTP_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
 LOGIC_URL = "http://localhost:8021/process"
+LOGIC_SRC = os.path.join(PROJECT_ROOT, "logic", "src")
+
+# http: POST to the logic service on :8021 (pooled keep-alive connections)
+# inprocess: import logic/src/routes/logic.py and call process() directly
+# (action server and logic layer on the same host)
+LOGIC_TRANSPORT = os.environ.get("ELISA_LOGIC_TRANSPORT", "http").lower()
+
+# === CONCURRENCY LIMITS ===
+# Maximum concurrent logic calls per action; calls over the limit wait their turn
+# (for at most ACTION_QUEUE_TIMEOUT seconds) without blocking other actions.
+# TYPE_TEXT drives the one keyboard, so typing requests are serialized.
+ACTION_CONCURRENCY = {
+    "TYPE_TEXT": 1,
+    "OPEN_APP": 2,
+    "OPEN_BROWSER": 2,
+    "SEARCH_BROWSER": 2,
+    "GET_MEANING": 4,
+    "GET_WEATHER": 4,
+}
+DEFAULT_CONCURRENCY = int(os.environ.get("ELISA_ACTION_CONCURRENCY", "8"))
+ACTION_QUEUE_TIMEOUT = float(os.environ.get("ELISA_ACTION_QUEUE_TIMEOUT", "10"))
+
+
+def parse_limits(spec):
+    """Parse "TYPE_TEXT=1,GET_MEANING=2" (ELISA_ACTION_LIMITS) into a dict."""
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            action, _, value = item.partition("=")
+            try:
+                limits[action.strip().upper()] = max(1, int(value))
+            except ValueError:
+                print(f"Ignoring invalid action limit: {item.strip()}")
+    return limits
+
+
+ACTION_CONCURRENCY.update(parse_limits(os.environ.get("ELISA_ACTION_LIMITS", "")))
+
+
+class HttpTransport:
+    name = "http"
+
+    def __init__(self, url=LOGIC_URL):
+        self.url = url
+
+    def call(self, action, data):
+        response = http_client.post("logic", self.url, json={"action": action, "data": data})
+        response.raise_for_status()
+        return response.json()
+
+    async def call_async(self, action, data):
+        response = await async_http_client.post("logic", self.url, json={"action": action, "data": data})
+        response.raise_for_status()
+        return response.json()
+
+
+class InProcessTransport:
+    """
+    Calls the logic layer's process() in this process.
+
+    Importing the logic layer has no side effects: its reminder scheduler only
+    starts on first use, and only the process holding the scheduler lock
+    executes reminders (see logic/src/scheduler/scheduler_core.py).
+
+    The logic layer's process() is a coroutine: async actions await it on the
+    action server's event loop, sync callers use process_blocking().
+    """
+
+    name = "inprocess"
+
+    def __init__(self, logic_src=LOGIC_SRC):
+        self.logic_src = logic_src
+        self._process = None
+        self._process_blocking = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self._process is None:
+                if self.logic_src not in sys.path:
+                    sys.path.insert(0, self.logic_src)
+                from routes.logic import process as logic_process, process_blocking
+                self._process, self._process_blocking = logic_process, process_blocking
+        return self._process
+
+    def call(self, action, data):
+        self.load()
+        return self._process_blocking(action, data)
+
+    async def call_async(self, action, data):
+        return await self.load()(action, data)
+
+
+def create_transport(name=LOGIC_TRANSPORT):
+    if name == "inprocess":
+        transport = InProcessTransport()
+        try:
+            transport.load()
+            return transport
+        except Exception as e:
+            # e.g. a logic dependency missing from the action server's environment
+            print(f"In-process logic transport unavailable ({e}), using HTTP")
+    return HttpTransport()
+
+
+transport = create_transport()
+
+
+class ActionLimiter:
+    """One asyncio semaphore per logic action, created on the running loop."""
+
+    def __init__(self, limits=ACTION_CONCURRENCY, default=DEFAULT_CONCURRENCY):
+        self.limits = limits
+        self.default = default
+        self._semaphores = {}
+        self._loop = None
+
+    def limit(self, action):
+        return self.limits.get(action, self.default)
+
+    def semaphore(self, action):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphores = {}
+            self._loop = loop
+        if action not in self._semaphores:
+            self._semaphores[action] = asyncio.Semaphore(self.limit(action))
+        return self._semaphores[action]
+
+
+limiter = ActionLimiter()
+
+
+def format_response(action, response_data):
+    if response_data:
+        print(f"[logic:{transport.name}] {action} -> {response_data}")
+
+        text = [response_data.get("text", "")]
+        continue_conversation = response_data.get("continue", False)
+
+        return {"text": text, "continue": continue_conversation}
+    else:
+        return {"text": "No response from logic layer.", "continue": False}
+
 
 def process(action, data=""):
     """
@@ -10,24 +168,45 @@ def process(action, data=""):
     :param data: data associated with the command.
     :return: response from LOGIC layer.
     """
-    payload = {"action": action, "data": data}
-
     try:
-        response = requests.post(LOGIC_URL, json=payload)
-        response_data = response.json()
+        response_data = transport.call(action, data)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error sending request to LOGIC layer: {e}")
+        return {"text": "I'm having trouble connecting to the LOGIC layer.", "continue": False}
+    except Exception as e:
+        print(f"LOGIC layer failed on {action}: {e}")
+        return {"text": "Something went wrong while handling that.", "continue": False}
 
-        if response_data:
-            print("======================= response data =======================")
-            print(response_data)
+    return format_response(action, response_data)
 
-            text = [response_data.get("text", "")]
-            continue_conversation = response_data.get("continue", False)
 
-            return {"text": text, "continue": continue_conversation}
-        else:
-            return {"text": "No response from logic layer.", "continue": False}
+async def process_async(action, data=""):
+    """
+    Non-blocking process() for async actions.
+
+    Waits for a free slot of the action's concurrency limit, then calls the
+    LOGIC layer without blocking the action server's event loop.
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error sending request to Rasa: {e}")
+    :param action: User's voice command.
+    :param data: data associated with the command.
+    :return: response from LOGIC layer.
+    """
+    semaphore = limiter.semaphore(action)
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=ACTION_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"{action}: {limiter.limit(action)} call(s) already running, gave up after {ACTION_QUEUE_TIMEOUT}s")
+        return {"text": "I'm still busy with your last request. Please try again in a moment.", "continue": False}
+
+    try:
+        response_data = await transport.call_async(action, data)
+    except (requests.exceptions.RequestException, ValueError) + ASYNC_HTTP_ERRORS as e:
+        print(f"Error sending request to LOGIC layer: {e}")
         return {"text": "I'm having trouble connecting to the LOGIC layer.", "continue": False}
+    except Exception as e:
+        print(f"LOGIC layer failed on {action}: {e}")
+        return {"text": "Something went wrong while handling that.", "continue": False}
+    finally:
+        semaphore.release()
 
+    return format_response(action, response_data)
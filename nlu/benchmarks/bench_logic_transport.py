@@ -0,0 +1,77 @@
+# benchmarks/bench_logic_transport.py
+#
+# Latency of one action -> logic call over each transport.
+#
+#   cd nlu
+#   python -m benchmarks.bench_logic_transport --calls 200
+#
+# The HTTP transport needs the logic service on :8021 and is skipped if it is
+# not reachable. The in-process transport needs the logic layer's requirements
+# in this environment. GET_CURRENT_TIME is the default action because it has
+# no side effects.
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add nlu/ to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from actions.logic_integration import HttpTransport, InProcessTransport
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def bench(transport, action, data, calls, warmup):
+    for _ in range(warmup):
+        transport.call(action, data)
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        transport.call(action, data)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, timings):
+    ms = [t * 1000 for t in timings]
+    print(f"{name:<10} n={len(ms):<5} mean={statistics.mean(ms):8.3f} ms  p50={percentile(ms, 50):8.3f} ms  "
+          f"p95={percentile(ms, 95):8.3f} ms  max={max(ms):8.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the action -> logic transports.")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--action", default="GET_CURRENT_TIME")
+    parser.add_argument("--data", default="")
+    parser.add_argument("--transport", choices=["all", "http", "inprocess"], default="all")
+    args = parser.parse_args(argv)
+
+    transports = []
+    if args.transport in ("all", "inprocess"):
+        transports.append(InProcessTransport())
+    if args.transport in ("all", "http"):
+        transports.append(HttpTransport())
+
+    results = {}
+    for transport in transports:
+        try:
+            results[transport.name] = bench(transport, args.action, args.data, args.calls, args.warmup)
+        except Exception as e:
+            print(f"{transport.name:<10} skipped: {e}")
+
+    print(f"=== {args.action} ({args.calls} calls) ===")
+    for name, timings in results.items():
+        report(name, timings)
+    if "http" in results and "inprocess" in results:
+        saved = statistics.median(results["http"]) - statistics.median(results["inprocess"])
+        print(f"In-process saves {saved * 1000:.3f} ms per call (p50)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+# benchmarks/bench_pipeline.py
+#
+# Trains NLU pipeline configs on the same split of data/nlu.yml and compares
+# them side by side: intent and entity F1, model load time, memory, and
+# end-to-end and per-component parse latency.
+#
+#   cd nlu
+#   python -m benchmarks.bench_pipeline                      # config.yml + benchmarks/configs/*.yml
+#   python -m benchmarks.bench_pipeline --configs config.yml benchmarks/configs/light.yml --repeat 5
+#
+# Each model is loaded and timed in a fresh worker process, so load time and
+# memory of one config do not leak into the next. Duckling extractors are removed
+# from the configs unless --with-duckling is given: Duckling is a separate
+# service and would dominate the latency numbers.
+import argparse
+import asyncio
+import collections
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+NLU_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATA = os.path.join(NLU_DIR, "data", "nlu.yml")
+DEFAULT_DOMAIN = os.path.join(NLU_DIR, "domain.yml")
+# Custom pipeline components (nlu/components) are imported relative to nlu/
+sys.path.insert(0, NLU_DIR)
+
+DEFAULT_CONFIGS = [os.path.join(NLU_DIR, "config.yml")] + sorted(
+    glob.glob(os.path.join(NLU_DIR, "benchmarks", "configs", "*.yml"))
+)
+
+
+# === METRICS ===
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def prf(tp, fp, fn):
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def intent_f1(gold, predicted):
+    """Support-weighted F1 over intents (what `rasa test nlu` reports)."""
+    support = collections.Counter(gold)
+    total = 0.0
+    for intent, count in support.items():
+        tp = sum(1 for g, p in zip(gold, predicted) if g == intent and p == intent)
+        fp = sum(1 for g, p in zip(gold, predicted) if g != intent and p == intent)
+        fn = count - tp
+        total += prf(tp, fp, fn)[2] * count
+    return total / len(gold) if gold else 0.0
+
+
+def entity_f1(gold, predicted, entity_types):
+    """Micro F1 over exact (type, start, end) spans of the annotated entity types."""
+    tp = fp = fn = 0
+    for gold_entities, predicted_entities in zip(gold, predicted):
+        g = {(e["entity"], e["start"], e["end"]) for e in gold_entities}
+        p = {(e["entity"], e["start"], e["end"]) for e in predicted_entities if e["entity"] in entity_types}
+        tp += len(g & p)
+        fp += len(p - g)
+        fn += len(g - p)
+    return prf(tp, fp, fn)[2]
+
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3  # peak, KB on Linux
+
+
+# === TRAINING ===
+def prepare_config(path, out_dir, with_duckling):
+    with open(path) as f:
+        config = yaml.safe_load(f)
+    if not with_duckling:
+        config["pipeline"] = [c for c in config.get("pipeline", []) if "Duckling" not in c.get("name", "")]
+    name = os.path.splitext(os.path.basename(path))[0]
+    prepared = os.path.join(out_dir, f"{name}.config.yml")
+    with open(prepared, "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return name, prepared
+
+
+def split_data(data_path, out_dir, train_frac, seed):
+    from rasa.shared.nlu.training_data.loading import load_data
+
+    train, test = load_data(data_path).train_test_split(train_frac=train_frac, random_seed=seed)
+    paths = []
+    for name, data in (("train", train), ("test", test)):
+        path = os.path.join(out_dir, f"{name}.yml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data.nlu_as_yaml())
+        paths.append(path)
+    return paths
+
+
+def train(name, config_path, train_path, domain_path, out_dir):
+    from rasa.model_training import train_nlu
+
+    started = time.perf_counter()
+    model_path = train_nlu(config=config_path, nlu_data=train_path, output=out_dir,
+                           fixed_model_name=name, domain=domain_path)
+    return model_path, time.perf_counter() - started
+
+
+# === WORKER (one per model) ===
+def time_graph_nodes(node_times):
+    """Record the run time of every graph node (= pipeline component) of a parse."""
+    from rasa.engine.graph import GraphNode
+
+    original_call = GraphNode.__call__
+
+    def timed_call(self, *inputs):
+        started = time.perf_counter()
+        try:
+            return original_call(self, *inputs)
+        finally:
+            node_times[self._node_name] += time.perf_counter() - started
+
+    GraphNode.__call__ = timed_call
+
+
+def run_worker(model_path, test_path, repeat, warmup, result_path):
+    from rasa.core.agent import Agent
+    from rasa.shared.nlu.training_data.loading import load_data
+
+    examples = [m for m in load_data(test_path).intent_examples if m.get("text")]
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    agent = Agent.load(model_path)
+    load_seconds = time.perf_counter() - started
+    rss_loaded = rss_mb()
+
+    node_times = collections.defaultdict(float)
+    time_graph_nodes(node_times)
+
+    async def parse_all():
+        for example in examples[:warmup]:
+            await agent.parse_message(example.get("text"))
+        node_times.clear()
+
+        latencies, predictions = [], []
+        for run in range(repeat):
+            for example in examples:
+                t0 = time.perf_counter()
+                result = await agent.parse_message(example.get("text"))
+                latencies.append(time.perf_counter() - t0)
+                if run == 0:
+                    predictions.append(result)
+        return latencies, predictions
+
+    latencies, predictions = asyncio.run(parse_all())
+    gold_entities = [m.get("entities") or [] for m in examples]
+    entity_types = {e["entity"] for entities in gold_entities for e in entities}
+    parses = len(latencies)
+
+    result = {
+        "model_mb": os.path.getsize(model_path) / 1e6,
+        "load_s": load_seconds,
+        "rss_mb": rss_loaded,
+        "model_rss_mb": rss_loaded - rss_before,
+        "rss_after_parse_mb": rss_mb(),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "intent_f1": intent_f1([m.get("intent") for m in examples],
+                               [(p.get("intent") or {}).get("name") for p in predictions]),
+        "entity_f1": entity_f1(gold_entities, [p.get("entities", []) for p in predictions], entity_types),
+        "components_ms": {node: total / parses * 1000 for node, total in node_times.items()},
+        "test_examples": len(examples),
+    }
+    with open(result_path, "w") as f:
+        json.dump(result, f)
+
+
+def measure(model_path, test_path, repeat, warmup, out_dir, name):
+    """Run the worker for one model in a fresh interpreter."""
+    result_path = os.path.join(out_dir, f"{name}.result.json")
+    command = [sys.executable, "-m", "benchmarks.bench_pipeline", "--worker", model_path,
+               "--test-data", test_path, "--repeat", str(repeat), "--warmup", str(warmup),
+               "--result", result_path]
+    completed = subprocess.run(command, cwd=NLU_DIR)
+    if completed.returncode != 0 or not os.path.exists(result_path):
+        print(f"[{name}] worker failed (exit code {completed.returncode})")
+        return None
+    with open(result_path) as f:
+        return json.load(f)
+
+
+# === REPORT ===
+def short_node_name(node):
+    # "run_DIETClassifier5" -> "DIETClassifier5"
+    return node[len("run_"):] if node.startswith("run_") else node
+
+
+def print_report(results):
+    names = list(results)
+    print("\n=== NLU pipelines ===")
+    header = f"{'metric':<18}" + "".join(f"{n:>18}" for n in names)
+    print(header)
+    print("-" * len(header))
+    rows = [
+        ("intent F1", "intent_f1", "{:.3f}"),
+        ("entity F1", "entity_f1", "{:.3f}"),
+        ("parse p50 (ms)", "p50_ms", "{:.1f}"),
+        ("parse p95 (ms)", "p95_ms", "{:.1f}"),
+        ("load time (s)", "load_s", "{:.2f}"),
+        ("RSS loaded (MB)", "rss_mb", "{:.0f}"),
+        ("model RSS (MB)", "model_rss_mb", "{:.0f}"),
+        ("model file (MB)", "model_mb", "{:.1f}"),
+        ("train time (s)", "train_s", "{:.0f}"),
+    ]
+    for label, key, fmt in rows:
+        print(f"{label:<18}" + "".join(f"{fmt.format(results[n][key]):>18}" for n in names))
+
+    for name in names:
+        components = results[name]["components_ms"]
+        print(f"\n--- {name}: mean ms per parse and component ---")
+        for node, ms in sorted(components.items(), key=lambda item: -item[1]):
+            if ms >= 0.01:
+                print(f"  {short_node_name(node):<40} {ms:8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NLU pipeline configs.")
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS)
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--domain", default=DEFAULT_DOMAIN)
+    parser.add_argument("--train-frac", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the test set")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--out-dir", help="models and results (default: a temporary directory)")
+    parser.add_argument("--with-duckling", action="store_true")
+    parser.add_argument("--json", help="also write all results to this file")
+    # internal: measure one trained model
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--test-data", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.test_data, args.repeat, args.warmup, args.result)
+        return None
+
+    out_dir = args.out_dir or tempfile.mkdtemp(prefix="elisa_nlu_bench_")
+    os.makedirs(out_dir, exist_ok=True)
+    print(f"Models and results: {out_dir}")
+    train_path, test_path = split_data(args.data, out_dir, args.train_frac, args.seed)
+
+    results = {}
+    for config in args.configs:
+        name, config_path = prepare_config(config, out_dir, args.with_duckling)
+        print(f"\n[{name}] training...")
+        model_path, train_seconds = train(name, config_path, train_path, args.domain, out_dir)
+        if not model_path:
+            print(f"[{name}] training failed")
+            continue
+        print(f"[{name}] measuring...")
+        result = measure(model_path, test_path, args.repeat, args.warmup, out_dir, name)
+        if result is not None:
+            result["train_s"] = train_seconds
+            results[name] = result
+
+    if results:
+        print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# components/duckling_cache.py
+#
+# Drop-in replacement for DucklingEntityExtractor (see config.yml):
+#
+#   - name: components.duckling_cache.CachedDucklingEntityExtractor
+#     url: http://localhost:8022
+#     dimensions: ["time", "duration"]
+#
+# Messages without any time-like words never reach Duckling. Common reminder
+# phrases ("in 10 minutes", "tomorrow at 5pm") are resolved locally, and the
+# remaining Duckling calls go through a TTL cache and the shared HTTP client.
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Text
+
+import requests
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.nlu.extractors.duckling_entity_extractor import (
+    DucklingEntityExtractor,
+    convert_duckling_format_to_rasa,
+)
+from rasa.shared.nlu.constants import ENTITIES, TEXT
+from rasa.shared.nlu.training_data.message import Message
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from shared.http_client import http_client
+from .time_expressions import (
+    DucklingCache,
+    TimeExpressionResolver,
+    mask_spans,
+    might_contain_time,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@DefaultV1Recipe.register(DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR, is_trainable=False)
+class CachedDucklingEntityExtractor(DucklingEntityExtractor):
+    """DucklingEntityExtractor with a temporal gate, a local resolver and a TTL cache."""
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            **DucklingEntityExtractor.get_default_config(),
+            # resolve "in 10 minutes", "at 5pm", ... without Duckling
+            "local_patterns": True,
+            "cache_size": 512,
+            # seconds a cached Duckling result is kept
+            "cache_ttl": 300,
+            # reference times within the same bucket (seconds) share cache entries
+            "cache_resolution": 60,
+        }
+
+    def __init__(self, config: Dict[Text, Any]) -> None:
+        super().__init__(config)
+        self.resolver = TimeExpressionResolver(config.get("timezone"))
+        self.cache = DucklingCache(
+            max_size=config["cache_size"],
+            ttl=config["cache_ttl"],
+            resolution=config["cache_resolution"],
+        )
+        self.stats = {"skipped": 0, "local": 0, "cached": 0, "duckling": 0}
+
+    def _parse_remote(self, text: Text, reference_time: int) -> List[Dict[Text, Any]]:
+        key = self.cache.key(text, reference_time, self._locale(), self.component_config.get("timezone"),
+                             tuple(self.component_config.get("dimensions") or ()))
+        matches = self.cache.get(key)
+        if matches is not None:
+            self.stats["cached"] += 1
+            return matches
+
+        self.stats["duckling"] += 1
+        try:
+            response = http_client.post(
+                "duckling", self._url() + "/parse",
+                data=self._payload(text, reference_time),
+                headers={"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"},
+                timeout=(2, self.component_config.get("timeout")),
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to connect to duckling http server at '{self._url()}'. Error: {e}")
+            return []
+        if response.status_code != 200:
+            logger.error(f"Failed to get a proper response from remote duckling at '{self._url()}/parse'. "
+                         f"Status Code: {response.status_code}. Response: {response.text}")
+            return []
+        matches = response.json()
+        self.cache.put(key, matches)
+        return matches
+
+    def _extract(self, message: Message) -> List[Dict[Text, Any]]:
+        text = message.get(TEXT) or ""
+        if not might_contain_time(text):
+            self.stats["skipped"] += 1
+            return []
+
+        reference_time = self._reference_time_from_message(message)
+        if self.component_config["local_patterns"]:
+            matches, spans = self.resolver.resolve(text, reference_time)
+            # Anything time-like left over may modify a resolved span ("next friday
+            # at 5pm"), so the message is resolved locally only if nothing is left
+            if matches and not might_contain_time(mask_spans(text, spans)):
+                self.stats["local"] += 1
+                return matches
+
+        matches = self._parse_remote(text, reference_time)
+        # Cached results may come from a message with different casing
+        return [dict(match, body=text[match["start"]:match["end"]]) for match in matches]
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            if self._url() is None:
+                # Same behaviour as the stock extractor without a url
+                super().process([message])
+                continue
+
+            extracted = convert_duckling_format_to_rasa(self._extract(message))
+            extracted = self.filter_irrelevant_entities(extracted, self.component_config["dimensions"])
+            extracted = self.add_extractor_name(extracted)
+            message.set(ENTITIES, message.get(ENTITIES, []) + extracted, add_to_output=True)
+
+        logger.debug(f"Duckling: {self.stats}, cache: {self.cache.stats}")
+        return messages
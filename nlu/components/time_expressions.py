@@ -0,0 +1,243 @@
+# components/time_expressions.py
+#
+# Cheap, dependency-free handling of time expressions for the NLU pipeline:
+#   - might_contain_time(): does a message need Duckling at all?
+#   - TimeExpressionResolver: resolves the most common reminder phrases
+#     ("in 10 minutes", "at 5pm", "tomorrow at 7:30 am") without Duckling
+#   - DucklingCache: TTL cache of Duckling results
+#
+# Resolved expressions use Duckling's JSON format, so they go through the same
+# conversion as real Duckling matches and the logic layer sees no difference.
+import collections
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+    try:
+        import pytz
+    except ImportError:
+        pytz = None
+
+# === TEMPORAL CONTENT GATE ===
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "fifteen": 15, "twenty": 20, "thirty": 30, "forty": 40, "forty five": 45,
+    "forty-five": 45, "fifty": 50, "sixty": 60, "ninety": 90,
+}
+
+TEMPORAL_HINT = re.compile(
+    r"\d"
+    r"|\b(?:sec(?:ond)?s?|min(?:ute)?s?|hours?|hrs?|days?|weeks?|months?|years?|fortnight)\b"
+    r"|\b(?:now|today|tonight|tomorrow|yesterday|later|ago|noon|midnight|morning|afternoon"
+    r"|evening|night|weekend|o'?clock|am|pm|a\.m\.|p\.m\.)\b"
+    r"|\b(?:mon|tues|wednes|thurs|fri|satur|sun)day\b"
+    r"|\b(?:january|february|march|april|may|june|july|august|september|october|november|december)\b"
+    r"|\bat (?:one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve)\b",
+    re.IGNORECASE,
+)
+
+
+def might_contain_time(text):
+    """False only if the text certainly has no time or duration for Duckling."""
+    return bool(text) and TEMPORAL_HINT.search(text) is not None
+
+
+# === LOCAL RESOLVER ===
+_AMOUNT = r"(\d{1,3}|" + "|".join(sorted((re.escape(w) for w in NUMBER_WORDS), key=len, reverse=True)) + r")"
+
+RELATIVE = re.compile(
+    r"\bin\s+(?:(half\s+an?\s+hour)|" + _AMOUNT + r"\s+(seconds?|secs?|minutes?|mins?|hours?|hrs?|days?|weeks?))\b",
+    re.IGNORECASE,
+)
+CLOCK = re.compile(
+    r"\b(?:(today|tomorrow)\s+)?(?:at\s+)?"
+    r"(?:(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)(?!\w)|(noon|midnight))"
+    r"(?:\s+(today|tomorrow)\b)?",
+    re.IGNORECASE,
+)
+CLOCK_24H = re.compile(r"\b(?:(today|tomorrow)\s+)?at\s+([01]?\d|2[0-3]):([0-5]\d)\b(?:\s+(today|tomorrow)\b)?",
+                       re.IGNORECASE)
+DAY = re.compile(r"\b(today|tomorrow)\b", re.IGNORECASE)
+
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def get_timezone(name):
+    if not name:
+        return None
+    if ZoneInfo is not None:
+        return ZoneInfo(name)
+    return pytz.timezone(name) if pytz is not None else None
+
+
+def duckling_time(body, start, end, dt, grain):
+    value = dt.isoformat(timespec="milliseconds")
+    single = {"value": value, "grain": grain, "type": "value"}
+    return {
+        "body": body, "start": start, "end": end, "dim": "time", "latent": False,
+        "value": {"values": [single], **single},
+    }
+
+
+class TimeExpressionResolver:
+    """
+    Resolves common time expressions the way Duckling does (future times,
+    Duckling's grains and value format). Anything it does not recognise is left
+    for Duckling.
+    """
+
+    def __init__(self, timezone=None):
+        self.tz = get_timezone(timezone)
+
+    def _now(self, reference_ms):
+        return datetime.fromtimestamp(reference_ms / 1000.0, self.tz).replace(microsecond=0)
+
+    def _relative(self, match, now):
+        if match.group(1):
+            seconds, grain = 1800, "second"
+        else:
+            amount = match.group(2).lower()
+            amount = int(amount) if amount.isdigit() else NUMBER_WORDS[amount]
+            unit = match.group(3)[0].lower()
+            seconds = amount * UNIT_SECONDS[unit]
+            grain = "day" if unit in "dw" else "second"
+        if grain == "day":
+            dt = (now + timedelta(seconds=seconds)).replace(hour=0, minute=0, second=0)
+        else:
+            dt = datetime.fromtimestamp(now.timestamp() + seconds, self.tz)
+        return dt, grain
+
+    def _clock(self, now, day_word, hour, minute, grain):
+        dt = now.replace(hour=hour, minute=minute, second=0)
+        if day_word == "tomorrow":
+            dt += timedelta(days=1)
+        elif day_word is None:
+            # Duckling picks the next occurrence unless the time is still running
+            span = timedelta(hours=1) if grain == "hour" else timedelta(minutes=1)
+            if dt + span <= now:
+                dt += timedelta(days=1)
+        return dt
+
+    def resolve(self, text, reference_ms):
+        """
+        Return (matches, spans): Duckling-format matches for the expressions
+        resolved locally, and their (start, end) character spans.
+        """
+        now = self._now(reference_ms)
+        matches = []
+        taken = []
+
+        def free(start, end):
+            return all(end <= s or start >= e for s, e in taken)
+
+        def add(match, dt, grain):
+            start, end = match.span()
+            matches.append(duckling_time(text[start:end], start, end, dt, grain))
+            taken.append((start, end))
+
+        for match in RELATIVE.finditer(text):
+            if free(*match.span()):
+                add(match, *self._relative(match, now))
+
+        for match in CLOCK.finditer(text):
+            if not free(*match.span()) or (match.group(1) and match.group(6)):
+                continue  # "today at 5pm tomorrow": leave it to Duckling
+            day_word = (match.group(1) or match.group(6) or "").lower() or None
+            if match.group(5):
+                hour, minute, grain = (12 if match.group(5).lower() == "noon" else 0), 0, "hour"
+            else:
+                hour, minute = int(match.group(2)), int(match.group(3) or 0)
+                if not 1 <= hour <= 12 or minute > 59:
+                    continue
+                hour = hour % 12 + (12 if match.group(4).lower().startswith("p") else 0)
+                grain = "minute" if match.group(3) else "hour"
+            add(match, self._clock(now, day_word, hour, minute, grain), grain)
+
+        for match in CLOCK_24H.finditer(text):
+            if not free(*match.span()) or (match.group(1) and match.group(4)):
+                continue
+            day_word = (match.group(1) or match.group(4) or "").lower() or None
+            add(match, self._clock(now, day_word, int(match.group(2)), int(match.group(3)), "minute"), "minute")
+
+        for match in DAY.finditer(text):
+            if free(*match.span()):
+                dt = now.replace(hour=0, minute=0, second=0)
+                if match.group(1).lower() == "tomorrow":
+                    dt = (dt + timedelta(days=1)).replace(hour=0, minute=0, second=0)
+                add(match, dt, "day")
+
+        matches.sort(key=lambda m: m["start"])
+        return matches, sorted(taken)
+
+
+def mask_spans(text, spans):
+    """Blank out resolved spans, keeping character offsets of the rest intact."""
+    chars = list(text)
+    for start, end in spans:
+        chars[start:end] = " " * (end - start)
+    return "".join(chars)
+
+
+def overlaps(match, spans):
+    return any(match["start"] < end and match["end"] > start for start, end in spans)
+
+
+# === DUCKLING RESULT CACHE ===
+class DucklingCache:
+    """
+    LRU cache of Duckling matches keyed by text and reference time.
+
+    Keys are lowercased but not otherwise normalized: cached matches carry
+    character offsets, which must stay valid for the text they are reused for.
+
+    The reference time is bucketed to `resolution` seconds. Results that contain
+    second-grain times ("in 90 seconds") depend on the exact reference time and
+    are not cached.
+    """
+
+    def __init__(self, max_size=512, ttl=300.0, resolution=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.resolution = resolution
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def key(self, text, reference_ms, *options):
+        return (text.lower(), int(reference_ms // 1000 // self.resolution)) + tuple(options)
+
+    @staticmethod
+    def cacheable(matches):
+        for match in matches:
+            value = match.get("value", {})
+            grains = [value.get("grain")] + [v.get("grain") for v in value.values() if isinstance(v, dict)]
+            if "second" in grains:
+                return False
+        return True
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key, matches):
+        if not self.cacheable(matches):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), matches)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,9 @@
+# nlu/tests/conftest.py
+#
+# Run from nlu/:  python -m pytest tests
+import os
+import sys
+
+# Add the project root to path for imports (actions are imported as nlu.actions)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
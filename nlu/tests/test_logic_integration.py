@@ -0,0 +1,57 @@
+# nlu/tests/test_logic_integration.py
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from nlu.actions import logic_integration
+from shared.async_http_client import async_http_client
+
+
+def run_against(handler, action, data=""):
+    """process_async() over HTTP against a local logic layer stand-in; returns (reply, request count)."""
+    requests = []
+
+    async def process(request):
+        requests.append(await request.json())
+        return await handler(request)
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_post("/process", process)
+        server = TestServer(app, host="127.0.0.1")
+        await server.start_server()
+        logic_integration.transport = logic_integration.HttpTransport(str(server.make_url("/process")))
+        try:
+            return await logic_integration.process_async(action, data)
+        finally:
+            await async_http_client.close()
+            await server.close()
+
+    return asyncio.run(scenario()), len(requests)
+
+
+@pytest.fixture(autouse=True)
+def restore_transport():
+    transport = logic_integration.transport
+    yield
+    logic_integration.transport = transport
+
+
+def test_server_error_gets_trouble_connecting_reply():
+    async def fail(request):
+        return web.Response(status=500, text="boom")
+
+    reply, calls = run_against(fail, "SET_REMINDER", "tea||18:00")
+    assert reply == {"text": "I'm having trouble connecting to the LOGIC layer.", "continue": False}
+    assert calls == 1  # "logic" is not idempotent: a 5xx is never replayed
+
+
+def test_logic_reply_is_formatted():
+    async def answer(request):
+        return web.json_response({"text": "It's noon.", "continue": False})
+
+    reply, calls = run_against(answer, "GET_CURRENT_TIME")
+    assert reply == {"text": ["It's noon."], "continue": False}
+    assert calls == 1
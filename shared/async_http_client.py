@@ -0,0 +1,183 @@
+# shared/async_http_client.py
+#
+# asyncio counterpart of shared/http_client.py for services that run on an event
+# loop (the Rasa action server, the logic service). Same endpoint names, policies
+# and metrics, plus per-endpoint concurrency limits (EndpointPolicy.max_concurrency):
+#
+#   sys.path.insert(0, PROJECT_ROOT)
+#   from shared.async_http_client import async_http_client
+#   res = await async_http_client.post("logic", LOGIC_URL, json=payload)
+#   res.raise_for_status()
+#   data = res.json()
+#
+# Requires aiohttp (a Rasa dependency; listed in logic/ and nlu/requirements.txt).
+import asyncio
+import collections
+import json
+import weakref
+
+import aiohttp
+
+from shared.http_client import DEFAULT_POLICY, ENDPOINTS, POOL_SIZE, RETRY_STATUSES, EndpointMetrics
+
+# Failures before the request was sent, safe to retry for any endpoint
+# (aiohttp >= 3.10 raises ConnectionTimeoutError for connect timeouts)
+CONNECT_ERRORS = (aiohttp.ClientConnectorError,) + (
+    (aiohttp.ConnectionTimeoutError,) if hasattr(aiohttp, "ConnectionTimeoutError") else ()
+)
+
+
+class HTTPStatusError(aiohttp.ClientError):
+    """Raised by AsyncResponse.raise_for_status() for 4xx/5xx responses."""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+
+class AsyncResponse:
+    """Fully read response (the connection is back in the pool)."""
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(self.status_code, self.url)
+
+
+class AsyncHttpClient:
+    def __init__(self, pool_size=POOL_SIZE, endpoints=None):
+        self.pool_size = pool_size
+        self.endpoints = dict(ENDPOINTS if endpoints is None else endpoints)
+        self._metrics = collections.defaultdict(EndpointMetrics)
+        # aiohttp sessions and asyncio semaphores are bound to the loop they were
+        # created on, so each event loop gets its own
+        self._sessions = weakref.WeakKeyDictionary()
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def register(self, name, policy):
+        """Add or override the policy of an endpoint."""
+        self.endpoints[name] = policy
+
+    def policy(self, name):
+        return self.endpoints.get(name, DEFAULT_POLICY)
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            session = self._sessions[loop] = aiohttp.ClientSession(connector=connector)
+        return session
+
+    def _get_semaphore(self, endpoint, policy):
+        if not policy.max_concurrency:
+            return None
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if endpoint not in semaphores:
+            semaphores[endpoint] = asyncio.Semaphore(policy.max_concurrency)
+        return semaphores[endpoint]
+
+    @staticmethod
+    def _client_timeout(timeout):
+        if isinstance(timeout, (tuple, list)):
+            connect, read = timeout
+        else:
+            connect = read = timeout
+        return aiohttp.ClientTimeout(total=None, connect=connect, sock_read=read)
+
+    def _should_retry(self, policy, error=None, response=None):
+        if isinstance(error, CONNECT_ERRORS):
+            return True  # the request never reached the server
+        if not policy.idempotent:
+            # A dropped connection may have delivered the request already
+            return False
+        if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+            return True
+        return response is not None and response.status_code in RETRY_STATUSES
+
+    async def request(self, endpoint, method, url, timeout=None, **kwargs):
+        """
+        Send a request on behalf of `endpoint`; raises aiohttp.ClientError or
+        asyncio.TimeoutError (raise_for_status() raises HTTPStatusError). `timeout` overrides the endpoint's timeouts.
+
+        With `max_concurrency` set, requests over the limit wait for a free slot
+        (at most the read timeout, then asyncio.TimeoutError).
+        """
+        policy = self.policy(endpoint)
+        semaphore = self._get_semaphore(endpoint, policy)
+        if semaphore is None:
+            return await self._request(endpoint, policy, method, url, timeout, **kwargs)
+        await asyncio.wait_for(semaphore.acquire(), timeout=policy.read_timeout)
+        try:
+            return await self._request(endpoint, policy, method, url, timeout, **kwargs)
+        finally:
+            semaphore.release()
+
+    async def _request(self, endpoint, policy, method, url, timeout, **kwargs):
+        client_timeout = self._client_timeout(policy.timeout if timeout is None else timeout)
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            started = loop.time()
+            error = response = None
+            try:
+                async with self._get_session().request(method, url, timeout=client_timeout, **kwargs) as res:
+                    response = AsyncResponse(url, res.status, res.headers, await res.read())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            elapsed = loop.time() - started
+
+            retry = attempt < policy.retries and self._should_retry(policy, error, response)
+            metrics = self._metrics[endpoint]
+            metrics.latencies.append(elapsed)
+            if retry:
+                metrics.retries += 1
+            else:
+                metrics.calls += 1
+                if error is not None or response.status_code >= 500:
+                    metrics.failures += 1
+
+            if not retry:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(policy.delay(attempt))
+            attempt += 1
+
+    async def get(self, endpoint, url, **kwargs):
+        return await self.request(endpoint, "GET", url, **kwargs)
+
+    async def post(self, endpoint, url, **kwargs):
+        return await self.request(endpoint, "POST", url, **kwargs)
+
+    async def close(self):
+        """Close the session of the running event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def metrics(self):
+        return {name: m.to_dict() for name, m in self._metrics.items()}
+
+    def print_metrics(self):
+        print("=== HTTP endpoints (async) ===")
+        for name, m in sorted(self.metrics().items()):
+            print(f"{name:<15} calls={m['calls']:<5} failures={m['failures']:<4} retries={m['retries']:<4} "
+                  f"p50={m['p50_ms']}ms p95={m['p95_ms']}ms")
+
+
+# Shared client (one connection pool per process and event loop)
+async_http_client = AsyncHttpClient()
@@ -0,0 +1,192 @@
+# shared/http_client.py
+#
+# One HTTP client for every inter-service call (assistant -> Rasa/Coqui,
+# actions -> logic, logic -> Coqui/weather). Usage from any service:
+#
+#   sys.path.insert(0, PROJECT_ROOT)
+#   from shared.http_client import http_client
+#   res = http_client.post("rasa_webhook", RASA_URL, json=payload)
+#
+# Calls are grouped by endpoint name. Each endpoint has its own timeouts and
+# retry policy, and its own latency metrics. Connections are kept alive in a
+# shared pool instead of opening a new TCP connection per call.
+import collections
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+
+POOL_SIZE = int(os.environ.get("ELISA_HTTP_POOL_SIZE", "10"))
+METRICS_WINDOW = 200
+RETRY_STATUSES = (502, 503, 504)
+
+
+class EndpointPolicy:
+    """
+    Timeouts and retries for one endpoint.
+
+    `retries` always covers failures to connect (the request never reached the
+    server). Dropped connections, timeouts and 502/503/504 responses are only
+    retried for endpoints marked `idempotent`, so a "set reminder" or "type text"
+    that may have been delivered is never sent twice.
+    `max_concurrency` caps in-flight requests to the endpoint (async client only).
+    """
+
+    def __init__(self, connect_timeout=3.0, read_timeout=10.0, retries=0, idempotent=False,
+                 backoff=0.2, max_backoff=2.0, max_concurrency=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.idempotent = idempotent
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def delay(self, attempt):
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+DEFAULT_POLICY = EndpointPolicy()
+
+# Known endpoints. The read timeout is the longest a caller can be blocked.
+ENDPOINTS = {
+    "rasa_webhook": EndpointPolicy(connect_timeout=2, read_timeout=15, retries=1),
+    "rasa_api": EndpointPolicy(connect_timeout=2, read_timeout=5, retries=2, idempotent=True),
+    "rasa_actions": EndpointPolicy(connect_timeout=2, read_timeout=5, retries=1, idempotent=True),
+    "coqui_tts": EndpointPolicy(connect_timeout=2, read_timeout=15, retries=0),
+    "logic": EndpointPolicy(connect_timeout=2, read_timeout=10, retries=1),
+    "duckling": EndpointPolicy(connect_timeout=2, read_timeout=3, retries=1, idempotent=True),
+    "openweathermap": EndpointPolicy(connect_timeout=3, read_timeout=5, retries=2, idempotent=True, max_concurrency=4),
+    "ipinfo": EndpointPolicy(connect_timeout=3, read_timeout=5, retries=2, idempotent=True, max_concurrency=2),
+    "wikipedia": EndpointPolicy(connect_timeout=3, read_timeout=5, retries=2, idempotent=True, max_concurrency=4),
+}
+
+
+def is_connect_error(error):
+    """True if the request failed while connecting, i.e. before anything was sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.latencies = collections.deque(maxlen=METRICS_WINDOW)
+
+    def to_dict(self):
+        latencies = list(self.latencies)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "p50_ms": round(percentile(latencies, 50) * 1000) if latencies else None,
+            "p95_ms": round(percentile(latencies, 95) * 1000) if latencies else None,
+        }
+
+
+class HttpClient:
+    def __init__(self, pool_size=POOL_SIZE, endpoints=None):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.endpoints = dict(ENDPOINTS if endpoints is None else endpoints)
+        self._metrics = collections.defaultdict(EndpointMetrics)
+        self._lock = threading.Lock()
+
+    def register(self, name, policy):
+        """Add or override the policy of an endpoint."""
+        self.endpoints[name] = policy
+
+    def policy(self, name):
+        return self.endpoints.get(name, DEFAULT_POLICY)
+
+    def _should_retry(self, policy, error=None, response=None):
+        if is_connect_error(error):
+            return True  # the request never reached the server
+        if not policy.idempotent:
+            # "Connection aborted" may come after the request was sent
+            return False
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True  # includes stale keep-alive connections
+        return response is not None and response.status_code in RETRY_STATUSES
+
+    def request(self, endpoint, method, url, timeout=None, **kwargs):
+        """
+        Send a request on behalf of `endpoint`; raises requests exceptions like
+        `requests.request` does. `timeout` overrides the endpoint's timeouts.
+        """
+        policy = self.policy(endpoint)
+        timeout = policy.timeout if timeout is None else timeout
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            error = response = None
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                error = e
+            elapsed = time.monotonic() - started
+
+            retry = attempt < policy.retries and self._should_retry(policy, error, response)
+            with self._lock:
+                metrics = self._metrics[endpoint]
+                metrics.latencies.append(elapsed)
+                if retry:
+                    metrics.retries += 1
+                else:
+                    metrics.calls += 1
+                    if error is not None or response.status_code >= 500:
+                        metrics.failures += 1
+
+            if not retry:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+
+    def get(self, endpoint, url, **kwargs):
+        return self.request(endpoint, "GET", url, **kwargs)
+
+    def post(self, endpoint, url, **kwargs):
+        return self.request(endpoint, "POST", url, **kwargs)
+
+    def metrics(self):
+        with self._lock:
+            return {name: m.to_dict() for name, m in self._metrics.items()}
+
+    def print_metrics(self):
+        print("=== HTTP endpoints ===")
+        for name, m in sorted(self.metrics().items()):
+            print(f"{name:<15} calls={m['calls']:<5} failures={m['failures']:<4} retries={m['retries']:<4} "
+                  f"p50={m['p50_ms']}ms p95={m['p95_ms']}ms")
+
+
+# Shared client (one connection pool per process)
+http_client = HttpClient()